@@ -1,14 +1,58 @@
 # api.py
 
 import os
+import hmac
+import time
 import logging
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-from typing import Dict, Any
-
+import threading
+import concurrent.futures
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Header, Depends, Request, Query
+from fastapi.responses import JSONResponse, StreamingResponse, PlainTextResponse
+from pydantic import BaseModel, ValidationError
+from typing import Dict, Any, List, Optional
+
+from src.models.schema import TrademarkApplicationData
 from src.models.trademark import TrademarkApplication
-from src.rag.input_adapter import structured_object_to_query
-from src.rag.generate_answer import generate_rag_answer
+from src.rag.input_adapter import (
+    structured_object_to_query,
+    structured_object_to_retrieval_query,
+    structured_object_to_class_queries,
+    structured_object_to_class_retrieval_queries,
+    application_fingerprint,
+    application_identifiers,
+    application_focus_text,
+)
+from src.rag.generate_answer import (
+    generate_answer_from_chunks,
+    generate_per_class_answer,
+    stream_rag_issues,
+    get_groq_client,
+    analysis_status,
+)
+from src.rag.pipeline import analyze_application, ANALYZE_TOP_K
+from src.rag.facet_table import plan_facet_retrieval, merge_facet_hits, retrieve_with_facets
+from src.rag.risk_engine import reload_risk_rules, get_risk_rules, RISK_RULES_CHECK_SECONDS
+from src.vectorstore.weaviate_search import similarity_search_batch, preload as preload_weaviate
+from src.serialization import dumps_json
+from src.observability.metrics import (
+    REGISTRY,
+    STAGE_LATENCY,
+    REQUEST_LATENCY,
+    REQUESTS_IN_FLIGHT,
+    ERRORS,
+    ADMISSION_REJECTIONS,
+)
+from src.observability.profiling import PROFILER, ALLOCATIONS, MIN_INTERVAL
+from src.resilience.circuit_breaker import (
+    BREAKERS,
+    WEAVIATE_BREAKER,
+    LLM_BREAKER,
+    CircuitOpenError,
+)
+from src.resilience.admission import ANALYZE_ADMISSION, AdmissionRejected
+from src.jobs.store import JobStore
+from src.jobs.worker import JobWorkerPool, JOB_WORKERS
 
 
 # -------------------------------------------------
@@ -22,30 +66,231 @@ logging.basicConfig(level=logging.INFO)
 # Environment Setup
 # -------------------------------------------------
 
+# Checked at startup, not import: a missing variable is logged so
+# /health still serves and the problem is visible.
 TMEP_DOC_VERSION = os.getenv("TMEP_DOC_VERSION")
 
-if not TMEP_DOC_VERSION:
-    raise RuntimeError("TMEP_DOC_VERSION environment variable not set.")
+
+# Upper bound on concurrent Groq generations for one batch request
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "4"))
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "100"))
+
+# Admin endpoints are disabled unless a token is configured
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+# Profiling endpoints (and their middleware) are off by default
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "").lower() in ("1", "true", "yes")
+
+# "background" (default) warms up after the server starts accepting,
+# "blocking" finishes warm-up before it does, "off" skips it.
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "background").lower()
+
+# Async job API; workers run in-process unless JOB_WORKERS=0 or the
+# app runs in several processes (then run `python -m src.jobs.worker`
+# separately)
+JOBS_ENABLED = os.getenv("JOBS_ENABLED", "true").lower() in ("1", "true", "yes")
+JOBS_MAX_QUEUED = int(os.getenv("JOBS_MAX_QUEUED", "1000"))
+
+# uvicorn worker processes (read by uvicorn itself as well). Each one
+# runs lifespan() and keeps its own admission limits, circuit
+# breakers, /metrics registry, risk-rule table and profiler: limits
+# apply per process, and /metrics and /admin reach one random worker.
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+
+# -------------------------------------------------
+# Startup Warm-up
+# -------------------------------------------------
+# SDK imports and client construction are lazy so that importing this
+# module stays cheap; warm_up() pays those costs before the first
+# request has to.
+
+_warmup_done = threading.Event()
+
+# Set up in lifespan() when JOBS_ENABLED
+job_store: Optional[JobStore] = None
+job_pool: Optional[JobWorkerPool] = None
+
+
+def warm_up() -> None:
+    """
+    Import the SDKs and build the LLM client. Failures are logged,
+    never raised, so a bad dependency cannot stop the app from booting.
+    """
+
+    steps = (
+        ("groq_client", get_groq_client),
+        ("weaviate_sdk", preload_weaviate),
+    )
+
+    with STAGE_LATENCY.time(stage="warm_up"):
+        for name, step in steps:
+            try:
+                step()
+            except Exception as e:
+                ERRORS.inc(stage="warm_up", type=type(e).__name__)
+                logging.error(f"Warm-up step '{name}' failed: {str(e)}", exc_info=True)
+
+    _warmup_done.set()
+    logging.info("Warm-up complete")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+
+    if not TMEP_DOC_VERSION:
+        logging.error("TMEP_DOC_VERSION environment variable not set.")
+
+    if WARMUP_ON_STARTUP == "blocking":
+        warm_up()
+    elif WARMUP_ON_STARTUP != "off":
+        threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+
+    global job_store, job_pool
+
+    if JOBS_ENABLED:
+        try:
+            job_store = JobStore()
+            if JOB_WORKERS > 0 and WEB_CONCURRENCY > 1:
+                # One pool per web process would multiply JOB_WORKERS
+                logging.warning(
+                    f"In-process job workers disabled with WEB_CONCURRENCY={WEB_CONCURRENCY}; "
+                    "run `python -m src.jobs.worker` to process queued jobs"
+                )
+            elif JOB_WORKERS > 0:
+                job_pool = JobWorkerPool(job_store)
+                job_pool.start()
+        except Exception as e:
+            logging.error(f"Job queue unavailable: {str(e)}", exc_info=True)
+
+    yield
+
+    if job_pool is not None:
+        job_pool.stop(timeout=5)
 
 
 # -------------------------------------------------
 # FastAPI App
 # -------------------------------------------------
 
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson (stdlib fallback).
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
+
+
 app = FastAPI(
     title="TMEP Assist API",
     description="AI-powered Trademark Risk Assessment using RAG + TMEP",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan,
 )
 
 
+# -------------------------------------------------
+# Profiling Middleware (only installed when enabled)
+# -------------------------------------------------
+
+if PROFILING_ENABLED:
+
+    @app.middleware("http")
+    async def count_profiled_requests(request: Request, call_next):
+        response = await call_next(request)
+        if PROFILER.active and not request.url.path.startswith("/admin/"):
+            PROFILER.request_finished()
+        return response
+
+
 # -------------------------------------------------
 # Request Model
 # -------------------------------------------------
 
 class TrademarkRequest(BaseModel):
-    data: Dict[str, Any]
+    data: TrademarkApplicationData
     doc_version: str
+    # Analyze each goods/services class as its own concurrent unit
+    per_class: bool = False
+
+
+class BatchTrademarkRequest(BaseModel):
+    # Validated per item so one malformed item does not fail the batch
+    items: List[Dict[str, Any]]
+    max_concurrency: Optional[int] = None
+
+
+# -------------------------------------------------
+# Admission Control
+# -------------------------------------------------
+
+async def admit_analyze(
+    request: Request,
+    x_request_deadline_ms: Optional[float] = Header(None),
+):
+    """
+    Hold an analysis slot for the duration of the request (for
+    /analyze/stream, until the stream ends). Requests that cannot get
+    one before their deadline (X-Request-Deadline-Ms, capped by
+    ANALYZE_QUEUE_TIMEOUT_MS) get 503 + Retry-After instead of
+    queueing on the threadpool.
+    """
+
+    async with _admitted(request, 1, x_request_deadline_ms):
+        yield
+
+
+async def admit_analyze_batch(
+    http_request: Request,
+    request: BatchTrademarkRequest,
+    x_request_deadline_ms: Optional[float] = Header(None),
+):
+    """
+    Same as admit_analyze, holding one slot per generation the batch
+    can run at once (its items, up to its concurrency limit).
+    """
+
+    permits = min(len(request.items), _batch_max_workers(request))
+
+    async with _admitted(http_request, permits, x_request_deadline_ms):
+        yield
+
+
+@asynccontextmanager
+async def _admitted(request: Request, permits: int, x_request_deadline_ms: Optional[float]):
+    # /analyze, /analyze/stream and /analyze/batch share one controller:
+    # they compete for the same LLM capacity
+    controller = ANALYZE_ADMISSION
+
+    if not controller.enabled:
+        yield
+        return
+
+    timeout = controller.default_timeout
+    if x_request_deadline_ms is not None:
+        timeout = min(timeout, max(0.0, x_request_deadline_ms / 1000))
+
+    try:
+        permits = await controller.acquire(time.monotonic() + timeout, permits)
+    except AdmissionRejected as e:
+        logging.warning(f"Analyze shed: {e.reason}")
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": e.retry_after_header},
+        )
+
+    started = time.monotonic()
+    try:
+        # Nobody is waiting for the answer any more
+        if await request.is_disconnected():
+            ADMISSION_REJECTIONS.inc(endpoint=controller.name, reason="disconnected")
+            raise HTTPException(status_code=499, detail="Client disconnected")
+        yield
+    finally:
+        controller.release(time.monotonic() - started, permits)
 
 
 # -------------------------------------------------
@@ -56,36 +301,393 @@ def root():
     return {"status": "running"}
 
 
-@app.post("/analyze")
+@app.post("/analyze", dependencies=[Depends(admit_analyze)])
 def analyze_trademark(request: TrademarkRequest):
 
-    logging.info("Step 1: Request received")
+    with REQUESTS_IN_FLIGHT.track_inprogress(endpoint="analyze"), \
+            REQUEST_LATENCY.time(endpoint="analyze"):
+        return _analyze(request)
 
-    try:
-        app_obj = TrademarkApplication(request.data)
-        logging.info("Step 2: Structured object built")
 
-        query = structured_object_to_query(app_obj)
-        logging.info("Step 3: Query constructed")
+def _analyze(request: TrademarkRequest):
+
+    logging.info("Step 1: Request received")
 
-        result = generate_rag_answer(
-            query=query,
+    try:
+        return analyze_application(
+            request.data,
             doc_version=request.doc_version,
-            top_k=2
+            per_class=request.per_class,
         )
 
-        logging.info("Step 4: RAG completed")
-
-        return {
-            "status": "success",
-            "analysis": result
-        }
+    except CircuitOpenError as e:
+        logging.warning(f"Analyze rejected: {str(e)}")
+        ERRORS.inc(stage="analyze", type="CircuitOpenError")
+        raise _service_unavailable(e)
 
     except Exception as e:
         logging.error(f"Analyze failed: {str(e)}", exc_info=True)
+        ERRORS.inc(stage="analyze", type=type(e).__name__)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+# -------------------------------------------------
+# Streaming Analyze Endpoint
+# -------------------------------------------------
+
+@app.post("/analyze/stream", dependencies=[Depends(admit_analyze)])
+def analyze_trademark_stream(request: TrademarkRequest):
+    """
+    Stream risk-classified issues as NDJSON, one line per issue,
+    as soon as each issue block is complete in the LLM output.
+    """
+
+    # No retrieval-only fallback for streams: fail fast before the
+    # 200 status line is sent if either dependency is known down
+    try:
+        WEAVIATE_BREAKER.check()
+        LLM_BREAKER.check()
+    except CircuitOpenError as e:
+        ERRORS.inc(stage="analyze_stream", type="CircuitOpenError")
+        raise _service_unavailable(e)
+
+    try:
+        app_obj = TrademarkApplication.from_schema(request.data)
+        query = structured_object_to_query(app_obj)
+        retrieval_query = structured_object_to_retrieval_query(app_obj)
+        focus = application_focus_text(app_obj)
+    except Exception as e:
+        logging.error(f"Analyze stream failed: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    def ndjson_lines():
+        count = 0
+        REQUESTS_IN_FLIGHT.inc(endpoint="analyze_stream")
+        try:
+            # Same retrieval as /analyze (facet table when enabled)
+            chunks = retrieve_with_facets(app_obj, request.doc_version, ANALYZE_TOP_K)
+
+            for issue in stream_rag_issues(
+                query=query,
+                doc_version=request.doc_version,
+                top_k=ANALYZE_TOP_K,
+                retrieval_query=retrieval_query,
+                focus=focus,
+                retrieved_chunks=chunks,
+            ):
+                count += 1
+                yield dumps_json({"type": "issue", **issue}) + b"\n"
+
+        except CircuitOpenError as e:
+            ERRORS.inc(stage="analyze_stream", type="CircuitOpenError")
+            yield dumps_json({
+                "type": "error",
+                "error": str(e),
+                "retry_after": e.retry_after_header,
+            }) + b"\n"
+            return
+
+        except Exception as e:
+            logging.error(f"Analyze stream failed: {str(e)}", exc_info=True)
+            ERRORS.inc(stage="analyze_stream", type=type(e).__name__)
+            yield dumps_json({"type": "error", "error": "Internal server error"}) + b"\n"
+            return
+
+        finally:
+            REQUESTS_IN_FLIGHT.dec(endpoint="analyze_stream")
+
+        yield dumps_json({"type": "done", "issues": count}) + b"\n"
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
+# -------------------------------------------------
+# Batch Analyze Endpoint
+# -------------------------------------------------
+
+@app.post("/analyze/batch", dependencies=[Depends(admit_analyze_batch)])
+def analyze_trademark_batch(request: BatchTrademarkRequest):
+
+    with REQUESTS_IN_FLIGHT.track_inprogress(endpoint="analyze_batch"), \
+            REQUEST_LATENCY.time(endpoint="analyze_batch"):
+        return _analyze_batch(request)
+
+
+def _analyze_batch(request: BatchTrademarkRequest):
+    """
+    Analyze many applications in one round-trip.
+
+    Applications with the same substance (fingerprint) and
+    doc_version are analyzed once, retrieval shares one
+    Weaviate connection per doc_version,
+    and generation runs with a bounded number of workers.
+    Multi-class items with per_class run the per-class analysis
+    (their own retrieval per class) as one generation unit.
+    Shared analyses are generated without owner name and serial /
+    registration numbers (not part of the fingerprint); each result
+    carries its own item's identifiers instead.
+    Every item gets its own result or error.
+    """
+
+    if len(request.items) > BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch exceeds {BATCH_MAX_ITEMS} items."
+        )
+
+    logging.info(f"Batch request received: {len(request.items)} items")
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(request.items)
+
+    # (doc_version, fingerprint, per_class) -> indices of the items sharing it
+    unique_work: Dict[tuple, List[int]] = {}
+    # (doc_version, fingerprint, False) -> (full query, retrieval query, focus)
+    work_queries: Dict[tuple, tuple] = {}
+    # (doc_version, fingerprint, False) -> facet table sections to append
+    facet_hits: Dict[tuple, List[Dict]] = {}
+    # (doc_version, fingerprint, True) ->
+    #   ({class_id: query}, {class_id: focus}, {class_id: retrieval query})
+    class_work: Dict[tuple, tuple] = {}
+    identifiers: Dict[int, Dict[str, Any]] = {}
+
+    for idx, raw_item in enumerate(request.items):
+        try:
+            item = TrademarkRequest.model_validate(raw_item)
+        except ValidationError as e:
+            results[idx] = _batch_error(idx, _describe_validation_error(e))
+            continue
+
+        try:
+            app_obj = TrademarkApplication.from_schema(item.data)
+            per_class = item.per_class and len(app_obj.goods_map) > 1
+            key = (item.doc_version, application_fingerprint(app_obj), per_class)
+
+            if per_class:
+                if key not in class_work:
+                    class_queries = structured_object_to_class_queries(
+                        app_obj, include_identifiers=False
+                    )
+                    class_work[key] = (
+                        class_queries,
+                        {cls: application_focus_text(app_obj, classes=(cls,)) for cls in class_queries},
+                        structured_object_to_class_retrieval_queries(app_obj),
+                    )
+            elif key not in work_queries:
+                # Same retrieval as /analyze: with the facet table, only
+                # the free text is searched
+                plan = plan_facet_retrieval(app_obj, item.doc_version)
+                if plan is not None:
+                    facet_hits[key] = plan[1]
+                work_queries[key] = (
+                    structured_object_to_query(app_obj, include_identifiers=False),
+                    plan[0] if plan is not None else structured_object_to_retrieval_query(app_obj),
+                    application_focus_text(app_obj),
+                )
+            identifiers[idx] = application_identifiers(app_obj)
+        except Exception as e:
+            results[idx] = _batch_error(
+                idx, f"Invalid application data: {type(e).__name__}: {e}"
+            )
+            continue
+
+        unique_work.setdefault(key, []).append(idx)
+
+    logging.info(
+        f"Batch deduplicated to {len(unique_work)} unique applications"
+    )
+
+    # Shared retrieval: one connection per doc_version,
+    # one search per distinct retrieval query
+    retrieved: Dict[tuple, Any] = {}
+    queries_by_version: Dict[str, List[str]] = {}
+
+    for key in work_queries:
+        doc_version, retrieval_query = key[0], work_queries[key][1]
+        pending = queries_by_version.setdefault(doc_version, [])
+        if retrieval_query not in pending:
+            pending.append(retrieval_query)
+
+    for doc_version, queries in queries_by_version.items():
+        try:
+            outcomes = similarity_search_batch(
+                queries,
+                top_k=ANALYZE_TOP_K,
+                doc_version=doc_version,
+            )
+        except Exception as e:
+            logging.error(f"Batch retrieval failed: {str(e)}", exc_info=True)
+            ERRORS.inc(stage="batch_retrieval", type=type(e).__name__)
+            outcomes = [e] * len(queries)
+
+        for query, outcome in zip(queries, outcomes):
+            retrieved[(doc_version, query)] = outcome
+
+    # Bounded-concurrency generation
+    max_workers = _batch_max_workers(request)
+
+    # key -> (analysis, failed class ids) or the exception
+    generated: Dict[tuple, Any] = {}
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+
+        for key, (class_queries, class_focus, class_retrieval_queries) in class_work.items():
+            future = executor.submit(
+                generate_per_class_answer,
+                class_queries,
+                key[0],
+                ANALYZE_TOP_K,
+                class_focus,
+                class_retrieval_queries,
+            )
+            futures[future] = key
+
+        for key, (query, retrieval_query, focus) in work_queries.items():
+            chunks = retrieved[(key[0], retrieval_query)]
+
+            if key in facet_hits:
+                if isinstance(chunks, ValueError) and facet_hits[key]:
+                    # Nothing relevant for the free text; the facet sections still are
+                    chunks = []
+                if not isinstance(chunks, Exception):
+                    chunks = merge_facet_hits(chunks, facet_hits[key])
+
+            if isinstance(chunks, Exception):
+                generated[key] = chunks
+                continue
+
+            futures[executor.submit(_generate_unit, query, chunks, focus)] = key
+
+        for future in concurrent.futures.as_completed(futures):
+            key = futures[future]
+            try:
+                generated[key] = future.result()
+            except Exception as e:
+                logging.error(f"Batch generation failed: {str(e)}", exc_info=True)
+                ERRORS.inc(stage="batch_generation", type=type(e).__name__)
+                generated[key] = e
+
+    for key, indices in unique_work.items():
+        outcome = generated[key]
+
+        for idx in indices:
+            if isinstance(outcome, (ValueError, CircuitOpenError)):
+                results[idx] = _batch_error(idx, str(outcome))
+            elif isinstance(outcome, Exception):
+                results[idx] = _batch_error(idx, "Internal server error")
+            else:
+                analysis, failed_classes = outcome
+                status = analysis_status(analysis, failed_classes)
+
+                if status == "error":
+                    results[idx] = _batch_error(idx, analysis)
+                    continue
+
+                results[idx] = {
+                    "index": idx,
+                    "status": status,
+                    "fingerprint": key[1],
+                    "identifiers": identifiers[idx],
+                    "analysis": analysis,
+                }
+                if failed_classes:
+                    results[idx]["failed_classes"] = failed_classes
+
+    succeeded = sum(1 for r in results if r["status"] != "error")
+    degraded = sum(1 for r in results if r["status"] == "degraded")
+    partial = sum(1 for r in results if r["status"] == "partial")
+
+    return {
+        "status": "success",
+        "total": len(results),
+        "succeeded": succeeded,
+        "degraded": degraded,
+        "partial": partial,
+        "failed": len(results) - succeeded,
+        "results": results,
+    }
+
+
+def _batch_max_workers(request: BatchTrademarkRequest) -> int:
+    if request.max_concurrency:
+        return max(1, min(request.max_concurrency, BATCH_MAX_CONCURRENCY))
+    return BATCH_MAX_CONCURRENCY
+
+
+def _generate_unit(query: str, chunks: List[Dict], focus: str) -> tuple:
+    return generate_answer_from_chunks(query, chunks, focus=focus), []
+
+
+def _service_unavailable(e: CircuitOpenError) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail=str(e),
+        headers={"Retry-After": e.retry_after_header},
+    )
+
+
+def _batch_error(idx: int, message: str) -> Dict[str, Any]:
+    return {
+        "index": idx,
+        "status": "error",
+        "error": message,
+    }
+
+
+def _describe_validation_error(e: ValidationError) -> str:
+    problems = [
+        f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}"
+        for err in e.errors()
+    ]
+    return "Invalid application data: " + "; ".join(problems)
+
+
+# -------------------------------------------------
+# Async Job Endpoints
+# -------------------------------------------------
+
+@app.post("/jobs", status_code=202)
+def submit_job(request: TrademarkRequest):
+    """
+    Queue a full analysis and return its job ID immediately;
+    poll GET /jobs/{job_id} for the result.
+    """
+
+    if job_store is None:
+        raise HTTPException(status_code=503, detail="Job queue unavailable")
+
+    if job_store.count_queued() >= JOBS_MAX_QUEUED:
+        raise HTTPException(
+            status_code=503,
+            detail="Job queue full",
+            headers={"Retry-After": "30"},
+        )
+
+    job_id = job_store.enqueue(request.model_dump(by_alias=True))
+
+    if job_pool is not None:
+        job_pool.notify()
+
+    return {
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": f"/jobs/{job_id}",
+    }
+
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+
+    if job_store is None:
+        raise HTTPException(status_code=503, detail="Job queue unavailable")
+
+    job = job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+
+    return job
+
+
 # -------------------------------------------------
 # Health Endpoint
 # -------------------------------------------------
@@ -105,23 +707,165 @@ def health():
 @app.get("/ready")
 def ready():
     try:
-        from src.vectorstore.weaviate_client import get_client
-        client = get_client()
-        ready_status = client.is_ready()
-        client.close()
+        from src.vectorstore.weaviate_search import is_weaviate_ready
+        ready_status = is_weaviate_ready()
 
         return {
-            "weaviate_ready": ready_status
+            "weaviate_ready": ready_status,
+            "warmed_up": _warmup_done.is_set(),
+            "circuit_breakers": _breaker_status(),
+            "admission": ANALYZE_ADMISSION.status(),
         }
 
     except Exception as e:
         logging.error(f"Weaviate readiness failed: {str(e)}", exc_info=True)
         return {
             "weaviate_ready": False,
+            "warmed_up": _warmup_done.is_set(),
+            "circuit_breakers": _breaker_status(),
             "error": str(e)
         }
 
 
+def _breaker_status() -> Dict[str, Dict]:
+    return {breaker.name: breaker.status() for breaker in BREAKERS}
+
+
+
+
+# -------------------------------------------------
+# Metrics Endpoint (Prometheus text format)
+# -------------------------------------------------
+# The registry is per process: with WEB_CONCURRENCY > 1 a scrape sees
+# whichever worker answered, so run one process per scrape target
+# when the numbers matter.
+
+@app.get("/metrics")
+def metrics():
+    return PlainTextResponse(
+        REGISTRY.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+# -------------------------------------------------
+# Admin Endpoints
+# -------------------------------------------------
+
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not found")
+
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+
+@app.get("/admin/risk-rules", dependencies=[Depends(require_admin)])
+def risk_rules_info():
+    rules = get_risk_rules()
+    return {
+        # Per process: other workers may differ for up to
+        # RISK_RULES_CHECK_SECONDS after the file changes
+        "worker_pid": os.getpid(),
+        "version": rules.version,
+        "default_risk": rules.default_risk,
+        "rules": rules.rules,
+    }
+
+
+@app.post("/admin/risk-rules/reload", dependencies=[Depends(require_admin)])
+def risk_rules_reload():
+    try:
+        rules = reload_risk_rules()
+    except Exception as e:
+        logging.error(f"Risk rules reload failed: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=400, detail=f"Reload failed: {str(e)}")
+
+    # Only this worker process is reloaded here; the others pick the
+    # file up on their next mtime check
+    return {
+        "status": "reloaded",
+        "worker_pid": os.getpid(),
+        "version": rules.version,
+        "rule_count": len(rules),
+        "other_workers_reload_within_seconds": RISK_RULES_CHECK_SECONDS or None,
+    }
+
+
+# -------------------------------------------------
+# Admin Profiling Endpoints
+# -------------------------------------------------
+
+def require_profiling(_: None = Depends(require_admin)) -> None:
+    if not PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Not found")
+
+
+@app.post("/admin/profile/start", dependencies=[Depends(require_profiling)])
+def profile_start(
+    seconds: Optional[float] = Query(None, gt=0),
+    requests: Optional[int] = Query(None, gt=0),
+    interval_ms: float = Query(5.0, ge=MIN_INTERVAL * 1000),
+):
+    """
+    Sample stacks for the next `seconds` or `requests` requests.
+    """
+
+    try:
+        PROFILER.start(seconds=seconds, requests=requests, interval=interval_ms / 1000)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    return PROFILER.status()
+
+
+@app.post("/admin/profile/stop", dependencies=[Depends(require_profiling)])
+def profile_stop():
+    PROFILER.stop()
+    return PROFILER.status()
+
+
+@app.get("/admin/profile/status", dependencies=[Depends(require_profiling)])
+def profile_status():
+    return PROFILER.status()
+
+
+@app.get("/admin/profile/collapsed", dependencies=[Depends(require_profiling)])
+def profile_collapsed():
+    """
+    Collapsed stacks of the last session (flamegraph.pl / speedscope input).
+    """
+
+    return PlainTextResponse(PROFILER.collapsed())
+
+
+@app.post("/admin/tracemalloc/start", dependencies=[Depends(require_profiling)])
+def tracemalloc_start(frames: int = 10):
+    ALLOCATIONS.start(frames=frames)
+    return {"tracing": ALLOCATIONS.tracing}
+
+
+@app.get("/admin/tracemalloc/snapshot", dependencies=[Depends(require_profiling)])
+def tracemalloc_snapshot(limit: int = 25, diff: bool = True, key_type: str = "lineno"):
+    """
+    Top allocation sites, or their growth since the previous snapshot.
+    """
+
+    if key_type not in ("lineno", "filename", "traceback"):
+        raise HTTPException(status_code=400, detail="Invalid key_type.")
+
+    try:
+        return ALLOCATIONS.snapshot(limit=limit, key_type=key_type, diff=diff)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@app.post("/admin/tracemalloc/stop", dependencies=[Depends(require_profiling)])
+def tracemalloc_stop():
+    ALLOCATIONS.stop()
+    return {"tracing": ALLOCATIONS.tracing}
 
 
 # -------------------------------------------------
@@ -131,4 +875,7 @@ def ready():
 if __name__ == "__main__":
     import uvicorn
     port = int(os.environ.get("PORT", 10000))
-    uvicorn.run("api:app", host="0.0.0.0", port=port)
+    # Worker processes share the memory-mapped local index
+    # (RETRIEVAL_BACKEND=local) through the page cache; all other
+    # state is per process (see WEB_CONCURRENCY above)
+    uvicorn.run("api:app", host="0.0.0.0", port=port, workers=WEB_CONCURRENCY)
@@ -0,0 +1,96 @@
+"""
+Benchmark: chunk corpus held as a list of dicts (read from the JSON
+artifact) vs the memory-mapped ChunkStore.
+
+Reports load time, Python heap held after loading (tracemalloc),
+process RSS growth, and the cost of touching every chunk's text.
+
+Run from the repo root:
+    python -m benchmarks.bench_chunk_store --chunks 50000
+"""
+
+import argparse
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.bench_serialization import _synthetic_chunks
+from src.processing.chunk_store import ChunkStore, write_chunk_store
+from src.serialization import read_artifact, write_artifact
+
+
+def _rss() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def _measure(name: str, load) -> None:
+    gc.collect()
+    rss_before = _rss()
+    tracemalloc.start()
+
+    start = time.perf_counter()
+    chunks = load()
+    load_s = time.perf_counter() - start
+
+    heap, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = _rss()
+
+    start = time.perf_counter()
+    total = sum(len(c["chunk_text"]) for c in chunks)
+    scan_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(0, len(chunks), max(1, len(chunks) // 1000)):
+        chunks[i]["section_path"], chunks[i]["doc_version"]
+    lookup_us = (time.perf_counter() - start) / 1000 * 1e6
+
+    mib = 1024 * 1024
+    print(
+        f"{name:<12}: load {load_s * 1000:9.1f} ms | heap {heap / mib:8.1f} MiB | "
+        f"RSS +{(rss_after - rss_before) / mib:7.1f} MiB | "
+        f"full text scan {scan_s * 1000:7.1f} ms | lookup {lookup_us:5.1f} us "
+        f"({total} chars)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    chunks = _synthetic_chunks(args.chunks, args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        artifact = Path(tmp) / "chunks.json"
+        store_dir = Path(tmp) / "store"
+
+        write_artifact(chunks, artifact, pretty=False)
+        start = time.perf_counter()
+        write_chunk_store(chunks, store_dir)
+        build_s = time.perf_counter() - start
+        del chunks
+
+        mib = 1024 * 1024
+        store_size = sum(p.stat().st_size for p in store_dir.iterdir())
+
+        print("=" * 72)
+        print(
+            f"{args.chunks} chunks | artifact {artifact.stat().st_size / mib:.1f} MiB | "
+            f"store {store_size / mib:.1f} MiB (built in {build_s:.1f}s)"
+        )
+        print("-" * 72)
+
+        _measure("list[dict]", lambda: read_artifact(artifact))
+        _measure("ChunkStore", lambda: ChunkStore(store_dir))
+
+        print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
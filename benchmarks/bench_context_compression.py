@@ -0,0 +1,110 @@
+"""
+Benchmark: query-focused sentence compression vs the first-800-chars
+prefix in _build_context.
+
+Each synthetic chunk is a long TMEP-like section with one "evidence"
+sentence about the application's goods and one generic "boilerplate"
+sentence (owner, entity type, serial number...) planted at random
+depths. The application goes through the real prompt template
+(structured_object_to_query). Compression is scored two ways:
+against that full query, and against application_focus_text (what
+_build_prompts uses). Reports how often each planted sentence reaches
+the prompt, the prompt size, and the compressor's cost per prompt.
+
+Run from the repo root:
+    python -m benchmarks.bench_context_compression --prompts 500
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks import synthetic
+from src.rag.context_compressor import compress_chunks
+from src.rag.generate_answer import MAX_CHUNK_CHARS
+from src.rag.input_adapter import application_focus_text, structured_object_to_query
+
+_EVIDENCE = (
+    "Geographically descriptive terms for {goods} must be disclaimed when "
+    "the applicant's {goods} originate in the named place."
+)
+# Matches the template's labels and the owner's name, not the goods
+_BOILERPLATE = (
+    "The owner name, entity type and citizenship of the applicant, and any "
+    "serial number or registration number, are stated in the application "
+    "before examination."
+)
+_GOODS = ("coffee", "cheese", "wine", "textiles", "furniture", "ceramics")
+
+
+def _prompt(rng: random.Random, n_chunks: int, text_words: int):
+    goods = rng.choice(_GOODS)
+
+    app = synthetic.synthetic_application(n_classes=1, seed=rng.randrange(1 << 30))
+    app.mark = f"NAPA VALLEY {goods.upper()}"
+    app.goods_map = {next(iter(app.goods_map)): f"{goods}; {goods} sold at retail"}
+
+    evidence = _EVIDENCE.format(goods=goods)
+
+    chunks = []
+    for i in range(n_chunks):
+        paragraph = synthetic._paragraph(rng, text_words).split(". ")
+        for planted in (evidence, _BOILERPLATE):
+            paragraph.insert(rng.randint(0, len(paragraph)), planted.rstrip("."))
+        chunks.append({
+            "text": ". ".join(paragraph),
+            "section_path": f"1210.0{i} Geographic Marks",
+        })
+
+    return structured_object_to_query(app), application_focus_text(app), chunks, evidence
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--prompts", type=int, default=500)
+    parser.add_argument("--chunks", type=int, default=2)
+    parser.add_argument("--text-words", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    prompts = [_prompt(rng, args.chunks, args.text_words) for _ in range(args.prompts)]
+
+    boilerplate = _BOILERPLATE.rstrip(".")
+    modes = ("prefix", "full query", "focus")
+    evidence_hits = dict.fromkeys(modes, 0)
+    boilerplate_hits = dict.fromkeys(modes, 0)
+    chars = dict.fromkeys(modes, 0)
+    elapsed = dict.fromkeys(modes, 0.0)
+    total = 0
+
+    for query, focus, chunks, evidence in prompts:
+        kept = {"prefix": [{**c, "text": c["text"][:MAX_CHUNK_CHARS]} for c in chunks]}
+
+        for mode, text in (("full query", query), ("focus", focus)):
+            start = time.perf_counter()
+            kept[mode] = compress_chunks(chunks, text, MAX_CHUNK_CHARS)
+            elapsed[mode] += time.perf_counter() - start
+
+        total += len(chunks)
+        for mode in modes:
+            for chunk in kept[mode]:
+                evidence_hits[mode] += evidence.rstrip(".") in chunk["text"]
+                boilerplate_hits[mode] += boilerplate in chunk["text"]
+                chars[mode] += len(chunk["text"])
+
+    print("=" * 72)
+    print(f"{args.prompts} prompts x {args.chunks} chunks of ~{args.text_words} words, budget {MAX_CHUNK_CHARS} chars/chunk")
+    print("-" * 72)
+    for mode in modes:
+        cost = f" | {elapsed[mode] / len(prompts) * 1e6:.0f} us/prompt" if mode != "prefix" else ""
+        print(
+            f"{mode:<12}: evidence kept {evidence_hits[mode] / total:6.1%} | "
+            f"boilerplate kept {boilerplate_hits[mode] / total:6.1%} | "
+            f"{chars[mode] / total:6.0f} chars/chunk{cost}"
+        )
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark: IVF approximate search vs exact brute-force search as
+the corpus grows, on a synthetic clustered corpus.
+
+For each corpus size: IVF build time, then per-query latency and
+recall@k for each nprobe, next to exact search. Also checks the
+doc_version-filtered path (half the corpus in another edition) and
+save/load through mmap.
+
+Run from the repo root:
+    python -m benchmarks.bench_ivf --sizes 10000 100000 1000000 --dim 128
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.bench_quantization import exact_top_k, synthetic_corpus, synthetic_queries
+from src.vectorstore.ivf_index import IVFIndex, default_n_lists
+
+
+def _recall(found: np.ndarray, expected: np.ndarray) -> float:
+    return len(set(found.tolist()) & set(expected.tolist())) / max(1, len(expected))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        vectors = synthetic_corpus(n, args.dim, args.seed, clusters=max(16, n // 500))
+        queries = synthetic_queries(vectors, args.queries, args.seed)
+        versions = ["TMEP Nov 2025" if i % 2 else "TMEP May 2025" for i in range(n)]
+        version_mask = np.asarray([v == "TMEP Nov 2025" for v in versions])
+
+        start = time.perf_counter()
+        truth = [exact_top_k(vectors, q, args.k) for q in queries]
+        exact_ms = (time.perf_counter() - start) / len(queries) * 1000
+
+        filtered_rows = np.flatnonzero(version_mask)
+        filtered_truth = [filtered_rows[exact_top_k(vectors[filtered_rows], q, args.k)] for q in queries]
+
+        start = time.perf_counter()
+        built = IVFIndex.build(vectors, versions)
+        build_s = time.perf_counter() - start
+
+        with tempfile.TemporaryDirectory() as tmp:
+            built.save(Path(tmp) / "ivf")
+            index = IVFIndex.load(Path(tmp) / "ivf")
+            del built
+
+            print("=" * 72)
+            print(
+                f"{n} vectors x {args.dim} dims | {index.n_lists} lists "
+                f"(default {default_n_lists(n)}) built in {build_s:.1f}s"
+            )
+            print("-" * 72)
+            print(f"{'search':<16}{'latency':>14}{'recall':>10}{'filtered recall':>18}")
+            print(f"{'exact':<16}{exact_ms:>11.2f} ms{1.0:>10.3f}{1.0:>18.3f}")
+
+            for nprobe in args.nprobe:
+                if nprobe > index.n_lists:
+                    continue
+
+                recall = 0.0
+                start = time.perf_counter()
+                for q, expected in zip(queries, truth):
+                    ids, _ = index.search(q, args.k, nprobe)
+                    recall += _recall(ids, expected)
+                latency_ms = (time.perf_counter() - start) / len(queries) * 1000
+
+                filtered = sum(
+                    _recall(index.search(q, args.k, nprobe, "TMEP Nov 2025")[0], expected)
+                    for q, expected in zip(queries, filtered_truth)
+                )
+
+                print(
+                    f"{'ivf nprobe=' + str(nprobe):<16}{latency_ms:>11.2f} ms"
+                    f"{recall / len(queries):>10.3f}{filtered / len(queries):>18.3f}"
+                )
+
+        print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
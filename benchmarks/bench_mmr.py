@@ -0,0 +1,77 @@
+"""
+Benchmark: cost and effect of MMR selection over over-fetched
+retrieval candidates.
+
+Candidates come in near-duplicate families (several chunks of one
+section family around a shared direction). For each pool size and
+lambda: per-call latency, how many distinct families the selected
+top-k covers, and the mean query relevance kept, vs plain top-k.
+
+Run from the repo root:
+    python -m benchmarks.bench_mmr --dim 768 --top-k 2 4
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.rag.mmr import mmr_select
+
+
+def _candidates(n: int, dim: int, families: int, rng: np.random.Generator):
+    centres = rng.standard_normal((families, dim), dtype=np.float32)
+    family = rng.integers(0, families, n)
+    vectors = centres[family] + 0.25 * rng.standard_normal((n, dim), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    query = centres[:3].mean(axis=0) + 0.5 * rng.standard_normal(dim, dtype=np.float32)
+    query /= np.linalg.norm(query)
+
+    relevance = vectors @ query
+    order = np.argsort(-relevance)
+    return vectors[order], relevance[order], family[order]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--pool", type=int, nargs="+", default=[8, 20, 50, 200])
+    parser.add_argument("--top-k", type=int, nargs="+", default=[2, 4])
+    parser.add_argument("--lambdas", type=float, nargs="+", default=[1.0, 0.7, 0.5])
+    parser.add_argument("--trials", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+
+    print("=" * 72)
+    print(f"{'pool':>6}{'k':>4}{'lambda':>8}{'latency':>14}{'families':>12}{'relevance':>12}")
+    print("-" * 72)
+
+    for pool in args.pool:
+        trials = [_candidates(pool, args.dim, max(2, pool // 3), rng) for _ in range(args.trials)]
+
+        for k in args.top_k:
+            for lam in args.lambdas:
+                families = relevance_kept = 0.0
+
+                start = time.perf_counter()
+                picks = [mmr_select(rel, vec, k, lam) for vec, rel, _ in trials]
+                latency_us = (time.perf_counter() - start) / len(trials) * 1e6
+
+                for (vec, rel, fam), pick in zip(trials, picks):
+                    families += len(set(fam[pick].tolist()))
+                    relevance_kept += float(rel[pick].mean())
+
+                print(
+                    f"{pool:>6}{k:>4}{lam:>8.1f}{latency_us:>11.1f} us"
+                    f"{families / len(trials):>12.2f}{relevance_kept / len(trials):>12.3f}"
+                )
+
+    print("=" * 72)
+    print("lambda 1.0 = plain top-k by relevance")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark: exact float32 search vs int8 / binary quantized search
+with full-precision rescoring, on a synthetic clustered corpus.
+
+Reports recall@k against exact search, per-query latency and the
+bytes each mode must scan (the part that has to stay resident).
+
+Run from the repo root:
+    python -m benchmarks.bench_quantization --vectors 200000 --dim 768
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from src.vectorstore.quantization import QuantizedSearch, write_quantized
+
+
+def synthetic_corpus(n: int, dim: int, seed: int, clusters: int = 256) -> np.ndarray:
+    """
+    Unit vectors around random topic centres; embedding-like enough
+    that neighbourhoods are meaningful (uniform noise is not).
+    """
+
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((clusters, dim), dtype=np.float32)
+    assign = rng.integers(0, clusters, n)
+
+    vectors = np.empty((n, dim), dtype=np.float32)
+    for start in range(0, n, 65536):
+        end = min(start + 65536, n)
+        vectors[start:end] = centres[assign[start:end]] + 0.8 * rng.standard_normal((end - start, dim), dtype=np.float32)
+
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def synthetic_queries(vectors: np.ndarray, n: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed + 1)
+    queries = vectors[rng.integers(0, len(vectors), n)] + 0.05 * rng.standard_normal((n, vectors.shape[1]), dtype=np.float32)
+    return queries / np.linalg.norm(queries, axis=1, keepdims=True)
+
+
+def exact_top_k(vectors: np.ndarray, query: np.ndarray, k: int) -> np.ndarray:
+    scores = vectors @ query
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vectors", type=int, default=200_000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--rescore-factors", type=int, nargs="+", default=[4, 10, 30])
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    mib = 1024 * 1024
+    vectors = synthetic_corpus(args.vectors, args.dim, args.seed)
+    queries = synthetic_queries(vectors, args.queries, args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index_dir = Path(tmp)
+        np.save(index_dir / "vectors.npy", vectors)
+        write_quantized(vectors, index_dir)
+        mapped = np.load(index_dir / "vectors.npy", mmap_mode="r")
+
+        start = time.perf_counter()
+        truth = [exact_top_k(vectors, q, args.k) for q in queries]
+        exact_ms = (time.perf_counter() - start) / len(queries) * 1000
+
+        print("=" * 72)
+        print(f"{args.vectors} vectors x {args.dim} dims, {args.queries} queries, recall@{args.k}")
+        print("-" * 72)
+        print(f"{'mode':<16}{'scanned':>12}{'latency':>14}{'recall':>10}")
+        print(f"{'float32 exact':<16}{vectors.nbytes / mib:>9.1f}MiB{exact_ms:>11.2f} ms{1.0:>10.3f}")
+
+        for mode in ("int8", "binary"):
+            search = QuantizedSearch(index_dir, mode, mapped)
+
+            for factor in args.rescore_factors:
+                hits = 0
+                start = time.perf_counter()
+                for q, expected in zip(queries, truth):
+                    rows, _ = search.search(q, args.k, factor)
+                    hits += len(set(rows.tolist()) & set(expected.tolist()))
+                latency_ms = (time.perf_counter() - start) / len(queries) * 1000
+
+                label = f"{mode} x{factor}"
+                print(
+                    f"{label:<16}{search.nbytes / mib:>9.1f}MiB{latency_ms:>11.2f} ms"
+                    f"{hits / (len(queries) * args.k):>10.3f}"
+                )
+
+        print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Benchmark: untyped Dict[str, Any] request + hand-indexed application
+vs the typed request schema + frozen TrademarkApplication,
+both starting from raw JSON request bodies.
+
+Run from the repo root:
+    python -m benchmarks.bench_request_model --items 100 --rounds 200
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+from typing import Any, Dict, List
+
+from pydantic import BaseModel
+
+from src.models.schema import TrademarkApplicationData
+from src.models.trademark import TrademarkApplication
+
+
+class _LegacyRequest(BaseModel):
+    data: Dict[str, Any]
+    doc_version: str
+
+
+class _LegacyApplication:
+    """
+    The previous TrademarkApplication: a plain object indexed by hand.
+    """
+
+    def __init__(self, data: Dict):
+        self.mark = data["mark_info"]["literal"]
+        self.mark_type = data["mark_info"]["type"]
+        self.register = data["mark_info"]["register"]
+        self.filing_basis = data["filing_basis"]["basis_type"]
+        self.use_in_commerce = data["filing_basis"]["use_in_commerce"]
+        self.goods_map = {
+            g["class_id"]: g["description"]
+            for g in data["goods_and_services"]
+        }
+        self.owner_name = data["owner"]["name"]
+        self.owner_entity = data["owner"]["entity"]
+        self.owner_citizenship = data["owner"]["citizenship"]
+        self.serial_number = data["identifiers"]["serial_number"]
+        self.registration_number = data["identifiers"]["registration_number"]
+        self.specimen = data.get("specimen", {})
+        self.disclaimer = data.get("disclaimer", {})
+        self.mark_features = data.get("mark_features", {})
+        self.claimed_prior_registrations = data.get("claimed_prior_registrations", [])
+
+
+class _TypedRequest(BaseModel):
+    data: TrademarkApplicationData
+    doc_version: str
+
+
+def _payload(i: int, n_classes: int) -> Dict[str, Any]:
+    return {
+        "data": {
+            "mark_info": {
+                "literal": f"MARK {i}",
+                "type": "Standard Character Claim",
+                "register": "Principal Register",
+            },
+            "filing_basis": {"basis_type": "1(b)", "use_in_commerce": False},
+            "goods_and_services": [
+                {"class_id": f"{c:03d}", "description": f"Goods for class {c} " * 8}
+                for c in range(1, n_classes + 1)
+            ],
+            "owner": {
+                "name": f"Owner {i} LLC",
+                "entity": "Limited Liability Company",
+                "citizenship": "Delaware",
+            },
+            "dates": {"filing_date": "2025-01-01"},
+            "identifiers": {"serial_number": f"9{i:07d}", "registration_number": None},
+            "mark_features": {"is_standard_character": True},
+            "disclaimer": {"present": False},
+            "specimen": {"provided": False},
+            "claimed_prior_registrations": [],
+        },
+        "doc_version": "TMEP Nov 2025",
+    }
+
+
+def _legacy(batch: List[bytes]) -> list:
+    return [
+        _LegacyApplication(_LegacyRequest.model_validate(json.loads(raw)).data)
+        for raw in batch
+    ]
+
+
+def _typed(batch: List[bytes]) -> list:
+    # One compiled pass from raw bytes to typed objects
+    return [
+        TrademarkApplication.from_schema(_TypedRequest.model_validate_json(raw).data)
+        for raw in batch
+    ]
+
+
+def _measure(fn, batch, rounds: int, repeats: int = 3) -> tuple[float, int, int]:
+    # Best of `repeats` runs: both paths take ~10 us/item, so a noisy
+    # neighbour easily swamps the difference in a single run
+    elapsed = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            fn(batch)
+        elapsed = min(elapsed, time.perf_counter() - start)
+
+    tracemalloc.start()
+    kept = fn(batch)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+
+    return elapsed, retained, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=100, help="Payloads per batch")
+    parser.add_argument("--classes", type=int, default=3, help="Goods/services classes per payload")
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    batch = [json.dumps(_payload(i, args.classes)).encode() for i in range(args.items)]
+    total = args.items * args.rounds
+
+    print("=" * 60)
+    print(f"Batch: {args.items} items x {args.classes} classes, {args.rounds} rounds")
+
+    for name, fn in (("Dict[str, Any] + manual", _legacy), ("Typed schema", _typed)):
+        elapsed, retained, peak = _measure(fn, batch, args.rounds)
+        print(
+            f"{name:<24}: {total / elapsed:>10,.0f} items/s | "
+            f"retained {retained / args.items:,.0f} B/item | "
+            f"peak {peak / 1024:,.0f} KiB/batch"
+        )
+
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark: legacy linear-scan classifier vs the compiled prefix trie.
+
+Run from the repo root:
+    python -m benchmarks.bench_risk_rules --citations 200000
+"""
+
+import argparse
+import random
+import time
+
+from src.rag.risk_rules import RiskRuleTable, load_risk_rules, DEFAULT_RULES_PATH
+
+
+def _legacy_classifier(rules: dict, default_risk: str):
+    """
+    The previous classify_section: linear scan over all prefixes,
+    longest first, using plain string startswith.
+    """
+
+    sorted_rules = sorted(
+        [
+            (risk, prefix.lower())
+            for risk, prefixes in rules.items()
+            for prefix in prefixes
+        ],
+        key=lambda x: len(x[1]),
+        reverse=True,
+    )
+
+    def classify(section_id: str) -> str:
+        section_id = section_id.strip().lower()
+        for risk, prefix in sorted_rules:
+            if section_id.startswith(prefix):
+                return risk
+        return default_risk
+
+    return classify
+
+
+def _synthetic_rules(n_rules: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    levels = ["HIGH", "MEDIUM-HIGH", "MEDIUM", "MEDIUM-LOW", "LOW"]
+    prefixes = set()
+
+    while len(prefixes) < n_rules:
+        prefix = str(rng.randint(100, 1999))
+        if rng.random() < 0.6:
+            prefix += f".{rng.randint(1, 20):02d}"
+        if rng.random() < 0.3:
+            prefix += f"({rng.choice('abcdefgh')})"
+        prefixes.add(prefix)
+
+    rules: dict = {level: [] for level in levels}
+    for i, prefix in enumerate(sorted(prefixes)):
+        rules[levels[i % len(levels)]].append(prefix)
+
+    return rules
+
+
+def _synthetic_citations(n: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    citations = []
+
+    for _ in range(n):
+        citation = str(rng.randint(100, 1999))
+        for _ in range(rng.randint(0, 2)):
+            citation += f".{rng.randint(1, 20):02d}"
+        for _ in range(rng.randint(0, 2)):
+            citation += f"({rng.choice(['a', 'b', 'c', 'i', 'ii', 'iii'])})"
+        citations.append(citation)
+
+    return citations
+
+
+def _time(fn, citations: list[str]) -> float:
+    start = time.perf_counter()
+    for citation in citations:
+        fn(citation)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--citations", type=int, default=100_000)
+    parser.add_argument("--synthetic-rules", type=int, default=0,
+                        help="Benchmark a synthetic table of N rules instead of the shipped file")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    table = load_risk_rules(DEFAULT_RULES_PATH)
+    rules, default_risk = table.rules, table.default_risk
+
+    if args.synthetic_rules:
+        rules = _synthetic_rules(args.synthetic_rules, args.seed)
+        table = RiskRuleTable("synthetic", default_risk, rules)
+
+    legacy = _legacy_classifier(rules, default_risk)
+    citations = _synthetic_citations(args.citations, args.seed)
+
+    legacy_s = _time(legacy, citations)
+    trie_s = _time(table.classify, citations)
+
+    disagreements = sum(
+        1 for c in citations if legacy(c) != table.classify(c)
+    )
+
+    print("=" * 60)
+    print(f"Rules: {len(table)} | Citations: {len(citations)}")
+    print(f"Legacy linear scan : {legacy_s:.3f}s ({len(citations) / legacy_s:,.0f} ops/s)")
+    print(f"Prefix trie        : {trie_s:.3f}s ({len(citations) / trie_s:,.0f} ops/s)")
+    print(f"Speedup            : {legacy_s / trie_s:.2f}x")
+    print(f"Disagreements      : {disagreements} (component vs raw-string prefix matching)")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Benchmark: stdlib json vs the serialization layer (orjson / msgpack)
+on chunk-artifact-sized payloads and batch-sized API responses.
+
+Run from the repo root:
+    python -m benchmarks.bench_serialization --chunks 20000
+"""
+
+import argparse
+import json
+import random
+import time
+
+from src import serialization
+
+
+def _synthetic_chunks(n: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    words = [
+        "mark", "applicant", "registration", "likelihood", "confusion",
+        "descriptive", "specimen", "§", "goods", "services", "examining",
+        "attorney", "refusal", "1207.01(a)", "Trademark", "–", "consumer",
+    ]
+    chunks = []
+
+    for i in range(n):
+        sid = f"{rng.randint(100, 1999)}.{rng.randint(1, 20):02d}"
+        chunks.append({
+            "chunk_id": f"tmep-{i // 50:04d}.html::{sid}::{i % 3}",
+            "section_id": sid,
+            "section_title": " ".join(rng.choices(words, k=6)),
+            "section_path": f"{sid} " + " ".join(rng.choices(words, k=6)),
+            "chunk_text": " ".join(rng.choices(words, k=rng.randint(100, 600))),
+            "source": "USPTO TMEP",
+            "doc_version": "TMEP Nov 2025",
+            "order": i,
+            "source_file": f"tmep-{i // 50:04d}.html",
+        })
+
+    return chunks
+
+
+def _bench(name: str, dump, load, obj, rounds: int) -> None:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        encoded = dump(obj)
+    encode_s = (time.perf_counter() - start) / rounds
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        load(encoded)
+    decode_s = (time.perf_counter() - start) / rounds
+
+    print(
+        f"{name:<22}: encode {encode_s * 1000:8.1f} ms | "
+        f"decode {decode_s * 1000:8.1f} ms | "
+        f"size {len(encoded) / 1024 / 1024:7.2f} MiB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chunks", type=int, default=20_000)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    chunks = _synthetic_chunks(args.chunks, args.seed)
+
+    print("=" * 60)
+    print(f"Chunk artifact: {len(chunks)} chunks")
+
+    _bench(
+        "stdlib json (indent)",
+        lambda o: json.dumps(o, indent=2, ensure_ascii=False).encode("utf-8"),
+        json.loads,
+        chunks,
+        args.rounds,
+    )
+
+    if serialization.orjson is not None:
+        _bench(
+            "orjson (indent)",
+            lambda o: serialization.dumps_json(o, pretty=True),
+            serialization.loads_json,
+            chunks,
+            args.rounds,
+        )
+    else:
+        print("orjson                : not installed (stdlib fallback in use)")
+
+    if serialization.msgpack is not None:
+        _bench(
+            "msgpack",
+            serialization.dumps_msgpack,
+            serialization.loads_msgpack,
+            chunks,
+            args.rounds,
+        )
+    else:
+        print("msgpack               : not installed")
+
+    # Batch-sized /analyze/batch response
+    response = {
+        "status": "success",
+        "results": [
+            {"index": i, "status": "success", "analysis": c["chunk_text"]}
+            for i, c in enumerate(chunks[:100])
+        ],
+    }
+
+    print(f"Batch response: {len(response['results'])} items")
+
+    _bench(
+        "stdlib json (compact)",
+        lambda o: json.dumps(o, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+        json.loads,
+        response,
+        args.rounds * 100,
+    )
+    _bench(
+        "dumps_json",
+        serialization.dumps_json,
+        serialization.loads_json,
+        response,
+        args.rounds * 100,
+    )
+
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
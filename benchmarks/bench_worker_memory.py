@@ -0,0 +1,151 @@
+"""
+Benchmark: per-worker memory of the retrieval index as the worker
+count grows, memory-mapped (shared page cache) vs loaded into each
+worker's heap.
+
+Each worker opens the index, runs queries that touch every vector
+page, and reports RSS / PSS / private bytes from
+/proc/self/smaps_rollup (Linux). PSS splits shared pages between
+the processes mapping them, so flat PSS per worker = no duplication.
+
+Queries here are random vectors: the query embedding model is not
+loaded. In production it is private per process unless the workers
+share one via EMBEDDING_SERVICE_URL (src.embeddings.query_embedding).
+
+Run from the repo root:
+    python -m benchmarks.bench_worker_memory --chunks 50000 --dim 768 --workers 1 2 4
+"""
+
+import argparse
+import multiprocessing as mp
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from benchmarks import synthetic
+from src.serialization import loads_json
+from src.vectorstore.local_index import LocalIndex, build_local_index
+
+
+def _synthetic_index(output_dir: Path, n: int, dim: int, seed: int) -> Path:
+    rng = np.random.default_rng(seed)
+    citations = synthetic.generate_citations(n, seed=seed)
+    text = synthetic.generate_llm_output(n_issues=1, explanation_words=80, seed=seed)
+
+    records = [
+        {
+            "chunk_id": f"tmep-{i // 50:04d}.html::{sid}::{i}",
+            "text": text,
+            "section_id": sid,
+            "section_path": f"{sid} Synthetic Section",
+            "source_file": f"tmep-{i // 50:04d}.html",
+            "doc_version": "TMEP Nov 2025",
+            "source": "USPTO TMEP",
+        }
+        for i, sid in enumerate(citations)
+    ]
+    vectors = rng.standard_normal((n, dim), dtype=np.float32)
+    return build_local_index(records, vectors, output_dir)
+
+
+def _memory() -> Dict[str, int]:
+    values = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if parts[0] in ("Rss:", "Pss:", "Private_Clean:", "Private_Dirty:"):
+                values[parts[0][:-1]] = int(parts[1]) * 1024
+    values["Private"] = values.pop("Private_Clean", 0) + values.pop("Private_Dirty", 0)
+    return values
+
+
+def _worker(index_dir: str, mode: str, queries: int, ready, go, results) -> None:
+    if mode == "mmap":
+        index = LocalIndex(Path(index_dir))
+        vectors = None
+    else:
+        # Naive per-worker copy: vectors and records in the heap
+        base = LocalIndex(Path(index_dir))
+        vectors = np.load(Path(index_dir) / "vectors.npy")
+        records = [loads_json(base._records.get_bytes(i)) for i in range(len(base))]
+        del base
+
+    rng = np.random.default_rng()
+    dim = index.manifest["dim"] if vectors is None else vectors.shape[1]
+
+    for _ in range(queries):
+        q = rng.standard_normal(dim, dtype=np.float32)
+        if vectors is None:
+            index.search(q, 5, "TMEP Nov 2025")
+        else:
+            top = np.argsort(-(vectors @ q))[:5]
+            [records[i] for i in top]
+
+    # Measure once every worker has its working set mapped
+    ready.wait()
+    go.wait()
+    results.put(_memory())
+
+
+def _run(index_dir: Path, mode: str, workers: int, queries: int) -> List[Dict[str, int]]:
+    ctx = mp.get_context("spawn")
+    ready = ctx.Barrier(workers + 1)
+    go = ctx.Event()
+    results = ctx.Queue()
+
+    procs = [
+        ctx.Process(target=_worker, args=(str(index_dir), mode, queries, ready, go, results))
+        for _ in range(workers)
+    ]
+    for p in procs:
+        p.start()
+
+    ready.wait()
+    go.set()
+    stats = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=50_000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    mib = 1024 * 1024
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        index_dir = _synthetic_index(Path(tmp) / "index", args.chunks, args.dim, args.seed)
+        size = sum(p.stat().st_size for p in index_dir.iterdir())
+
+        print("=" * 72)
+        print(
+            f"Index: {args.chunks} chunks x {args.dim} dims, {size / mib:.1f} MiB on disk "
+            f"(built in {time.perf_counter() - start:.1f}s)"
+        )
+        print("-" * 72)
+        print(f"{'mode':<8}{'workers':>8}{'RSS/worker':>16}{'PSS/worker':>16}{'private/worker':>18}")
+
+        for mode in ("heap", "mmap"):
+            for n in args.workers:
+                stats = _run(index_dir, mode, n, args.queries)
+                avg = {k: sum(s[k] for s in stats) / n for k in stats[0]}
+                print(
+                    f"{mode:<8}{n:>8}{avg['Rss'] / mib:>13.1f}MiB"
+                    f"{avg['Pss'] / mib:>13.1f}MiB{avg['Private'] / mib:>15.1f}MiB"
+                )
+
+        print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
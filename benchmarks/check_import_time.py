@@ -0,0 +1,118 @@
+"""
+Import-time budget check for api.py.
+
+Imports the app in a fresh interpreter with the service env vars
+removed, and fails (exit status 1) if:
+  - the import raises (a missing variable must not stop /health),
+  - a lazily-loaded SDK (groq, weaviate) was imported, or
+  - the best-of-N import time exceeds the budget.
+
+Run from the repo root:
+    python -m benchmarks.check_import_time
+    python -m benchmarks.check_import_time --budget-ms 600 --runs 5
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+
+LAZY_MODULES = ("groq", "weaviate")
+
+SERVICE_ENV_VARS = (
+    "TMEP_DOC_VERSION",
+    "WEAVIATE_URL",
+    "WEAVIATE_API_KEY",
+    "GROQ_API_KEY",
+)
+
+_PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+import api
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "loaded": [m for m in {LAZY_MODULES!r} if m in sys.modules],
+}}))
+"""
+
+
+def _run_probe(env: Dict[str, str], importtime: bool = False) -> subprocess.CompletedProcess:
+    cmd = [sys.executable]
+    if importtime:
+        cmd += ["-X", "importtime"]
+    cmd += ["-c", _PROBE]
+    return subprocess.run(cmd, env=env, capture_output=True, text=True)
+
+
+def _top_imports(stderr: str, limit: int) -> List[str]:
+    """
+    Largest self-time entries from -X importtime output.
+    """
+
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), name.strip()))
+
+    rows.sort(reverse=True)
+    return [f"{us / 1000:8.1f} ms  {name}" for us, name in rows[:limit]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("IMPORT_BUDGET_MS", "750")))
+    parser.add_argument("--runs", type=int, default=3, help="Best-of-N import timing")
+    parser.add_argument("--top", type=int, default=10, help="Slowest modules to list")
+    args = parser.parse_args()
+
+    env = {k: v for k, v in os.environ.items() if k not in SERVICE_ENV_VARS}
+    # The app calls load_dotenv(); a local .env must not mask a regression
+    env["PYTHON_DOTENV_DISABLED"] = "1"
+
+    timings = []
+    loaded = []
+
+    for _ in range(args.runs):
+        proc = _run_probe(env)
+        if proc.returncode != 0:
+            print("❌ api.py failed to import without service env vars:")
+            print(proc.stderr)
+            sys.exit(1)
+
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        timings.append(result["seconds"] * 1000)
+        loaded = result["loaded"]
+
+    best = min(timings)
+    failures = []
+
+    if loaded:
+        failures.append(f"Lazy SDKs imported eagerly: {', '.join(loaded)}")
+    if best > args.budget_ms:
+        failures.append(f"Import took {best:.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    print("=" * 60)
+    print(f"import api: best {best:.1f} ms of {args.runs} (budget {args.budget_ms:.0f} ms)")
+    print("-" * 60)
+    for line in _top_imports(_run_probe(env, importtime=True).stderr, args.top):
+        print(line)
+    print("-" * 60)
+
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+
+    print("✅ Within budget; no lazy SDKs loaded at import")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+Lease and requeue checks for the SQLite job queue (src.jobs).
+
+Runs each scenario against a throwaway queue file and fails (exit
+status 1) if any of these stop holding:
+  - a RUNNING job past its lease is requeued, or failed once it is
+    out of attempts;
+  - after a requeue and a second claim, complete / fail / retry_later
+    from the first claim are refused and leave the row untouched;
+  - a worker whose lease was lost counts "lease_lost" instead of
+    overwriting the new run;
+  - "error" / "degraded" analyses are retried while attempts remain,
+    then failed / stored;
+  - the default handler (analyze_application) reports a timed-out or
+    failing LLM call as "error", so the job is retried, then failed;
+  - queue files created before lease tokens still open.
+
+Run from the repo root:
+    python -m benchmarks.check_job_leases
+"""
+
+import concurrent.futures
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+from src.jobs import worker
+from src.rag import generate_answer
+from src.jobs.store import FAILED, QUEUED, RUNNING, SUCCEEDED, JobStore
+from src.jobs.worker import JobWorkerPool
+from src.observability.metrics import JOBS_PROCESSED
+
+
+TTL = 3600.0
+
+APPLICATION = {
+    "mark_info": {"literal": "NAPA", "type": "Standard Character Claim", "register": "Principal Register"},
+    "filing_basis": {"basis_type": "1(a)", "use_in_commerce": True},
+    "goods_and_services": [{"class_id": "030", "description": "coffee"}],
+    "owner": {"name": "Jane Doe", "entity": "Individual", "citizenship": "US"},
+    "identifiers": {"serial_number": "97000001", "registration_number": None},
+}
+
+SECTION = {
+    "chunk_id": "1209.01-0", "section_id": "1209.01", "section_path": "1209.01 Distinctiveness",
+    "text": "Geographically descriptive terms are refused registration.",
+    "similarity": 0.9, "doc_version": "v", "source": "tmep",
+}
+
+
+def _expire_lease() -> None:
+    # A lease_seconds of 0 only catches rows started strictly earlier
+    time.sleep(0.01)
+
+
+def _outcomes(outcome: str) -> float:
+    return JOBS_PROCESSED._values.get((outcome,), 0.0)
+
+
+def check_stale_job_requeued(store: JobStore) -> None:
+    job_id = store.enqueue({"n": 1})
+    first = store.claim_next()
+    assert first["id"] == job_id and first["status"] == RUNNING
+
+    _expire_lease()
+    recovered = store.recover_running(max_attempts=3, ttl_seconds=TTL, lease_seconds=0)
+    assert recovered == {"requeued": 1, "failed": 0}, recovered
+    assert store.get(job_id)["status"] == QUEUED
+
+
+def check_stale_job_failed_out_of_attempts(store: JobStore) -> None:
+    job_id = store.enqueue({"n": 1})
+    store.claim_next()
+
+    _expire_lease()
+    recovered = store.recover_running(max_attempts=1, ttl_seconds=TTL, lease_seconds=0)
+    assert recovered == {"requeued": 0, "failed": 1}, recovered
+    assert store.get(job_id)["status"] == FAILED
+
+
+def check_first_claim_fenced_after_reclaim(store: JobStore) -> None:
+    job_id = store.enqueue({"n": 1})
+    first = store.claim_next()
+
+    _expire_lease()
+    store.recover_running(max_attempts=3, ttl_seconds=TTL, lease_seconds=0)
+    second = store.claim_next()
+    assert second["id"] == job_id and second["attempts"] == 2
+    assert second["lease_token"] != first["lease_token"]
+
+    stale = first["lease_token"]
+    assert not store.complete(job_id, stale, {"from": "first"}, TTL)
+    assert not store.fail(job_id, stale, "first failed", TTL)
+    assert not store.retry_later(job_id, stale, 0, "first retry")
+
+    row = store.get(job_id)
+    assert row["status"] == RUNNING and "result" not in row and "error" not in row, row
+
+    assert store.complete(job_id, second["lease_token"], {"from": "second"}, TTL)
+    assert store.get(job_id)["result"] == {"from": "second"}
+
+    # A finished job is not reopened by a late update with its own token
+    assert not store.retry_later(job_id, second["lease_token"], 0, "late")
+    assert store.get(job_id)["status"] == SUCCEEDED
+
+
+def check_worker_counts_lost_lease(store: JobStore) -> None:
+    job_id = store.enqueue({"n": 1})
+
+    def slow_handler(payload):
+        # Lease expires mid-run and another worker takes the job
+        _expire_lease()
+        store.recover_running(max_attempts=3, ttl_seconds=TTL, lease_seconds=0)
+        store.claim_next()
+        return {"status": "success", "analysis": "stale"}
+
+    pool = JobWorkerPool(store, handler=slow_handler, workers=0)
+    before = _outcomes("lease_lost")
+    pool._process(store.claim_next())
+
+    assert _outcomes("lease_lost") == before + 1
+    row = store.get(job_id)
+    assert row["status"] == RUNNING and "result" not in row, row
+
+
+def check_llm_errors_retried_then_failed(store: JobStore) -> None:
+    job_id = store.enqueue({"n": 1})
+    pool = JobWorkerPool(
+        store,
+        handler=lambda payload: {"status": "error", "analysis": "LLM request timed out. Please retry."},
+        workers=0,
+    )
+
+    for attempt in range(1, worker.JOB_MAX_ATTEMPTS + 1):
+        job = store.claim_next()
+        assert job is not None and job["attempts"] == attempt, job
+        pool._process(job)
+
+    row = store.get(job_id)
+    assert row["status"] == FAILED and row["error"].startswith("LLM request timed out"), row
+    assert store.claim_next() is None
+
+
+def check_degraded_kept_from_last_attempt(store: JobStore) -> None:
+    job_id = store.enqueue({"n": 1})
+    pool = JobWorkerPool(
+        store,
+        handler=lambda payload: {"status": "degraded", "analysis": "retrieval only"},
+        workers=0,
+    )
+
+    for _ in range(worker.JOB_MAX_ATTEMPTS):
+        pool._process(store.claim_next())
+        if store.get(job_id)["status"] != QUEUED:
+            break
+
+    row = store.get(job_id)
+    assert row["status"] == SUCCEEDED and row["attempts"] == worker.JOB_MAX_ATTEMPTS, row
+    assert row["result"]["status"] == "degraded"
+
+
+def _check_real_analysis_failure(store: JobStore, error: Exception, message: str) -> None:
+    # Real pipeline; only retrieval and the Groq call are replaced
+    def failing_llm(system_prompt, user_prompt):
+        raise error
+
+    search, call_llm = generate_answer.similarity_search, generate_answer._call_llm
+    generate_answer.similarity_search = lambda query, top_k=2, doc_version=None: [dict(SECTION)]
+    generate_answer._call_llm = failing_llm
+
+    try:
+        job_id = store.enqueue({"data": APPLICATION, "doc_version": "v"})
+        pool = JobWorkerPool(store, workers=0)
+
+        for attempt in range(1, worker.JOB_MAX_ATTEMPTS + 1):
+            job = store.claim_next()
+            assert job is not None and job["attempts"] == attempt, job
+            pool._process(job)
+    finally:
+        generate_answer.similarity_search, generate_answer._call_llm = search, call_llm
+
+    row = store.get(job_id)
+    assert row["status"] == FAILED and row["error"] == message, row
+    assert store.claim_next() is None
+
+
+def check_llm_timeout_in_pipeline_failed(store: JobStore) -> None:
+    _check_real_analysis_failure(
+        store, concurrent.futures.TimeoutError(), generate_answer.LLM_TIMEOUT_MESSAGE
+    )
+
+
+def check_llm_exception_in_pipeline_failed(store: JobStore) -> None:
+    _check_real_analysis_failure(
+        store, RuntimeError("provider down"), generate_answer.LLM_ERROR_MESSAGE
+    )
+
+
+def check_legacy_queue_file_opens(path: Path) -> None:
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE jobs (id TEXT PRIMARY KEY, status TEXT NOT NULL, payload BLOB NOT NULL, "
+        "result BLOB, error TEXT, attempts INTEGER NOT NULL DEFAULT 0, created_at REAL NOT NULL, "
+        "available_at REAL NOT NULL, started_at REAL, finished_at REAL, expires_at REAL)"
+    )
+    conn.commit()
+    conn.close()
+
+    store = JobStore(path)
+    job_id = store.enqueue({"n": 1})
+    job = store.claim_next()
+    assert store.complete(job_id, job["lease_token"], {"ok": True}, TTL)
+
+
+CHECKS: List[Tuple[str, Callable[[JobStore], None]]] = [
+    ("stale job requeued", check_stale_job_requeued),
+    ("stale job failed out of attempts", check_stale_job_failed_out_of_attempts),
+    ("first claim fenced after reclaim", check_first_claim_fenced_after_reclaim),
+    ("worker counts lost lease", check_worker_counts_lost_lease),
+    ("LLM errors retried, then failed", check_llm_errors_retried_then_failed),
+    ("degraded kept from last attempt", check_degraded_kept_from_last_attempt),
+    ("LLM timeout in analyze_application retried, then failed", check_llm_timeout_in_pipeline_failed),
+    ("LLM exception in analyze_application retried, then failed", check_llm_exception_in_pipeline_failed),
+]
+
+
+def main():
+    # No waiting between retries here; the backoff itself is config
+    worker.JOB_RETRY_BACKOFF_SECONDS = 0.0
+
+    failures = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for i, (name, check) in enumerate(CHECKS):
+            try:
+                check(JobStore(Path(tmp) / f"jobs-{i}.sqlite3"))
+                print(f"✅ {name}")
+            except AssertionError as e:
+                failures.append(name)
+                print(f"❌ {name}: {e}")
+
+        try:
+            check_legacy_queue_file_opens(Path(tmp) / "legacy.sqlite3")
+            print("✅ legacy queue file opens")
+        except (AssertionError, sqlite3.Error) as e:
+            failures.append("legacy queue file opens")
+            print(f"❌ legacy queue file opens: {e}")
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
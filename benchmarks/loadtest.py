@@ -0,0 +1,460 @@
+"""
+End-to-end load test: api:app under uvicorn against the local
+Weaviate / Groq stand-ins in benchmarks.stub_servers. The app runs
+its production retrieval code with only the Weaviate client object
+swapped for a stub-backed one (benchmarks.stubbed_app).
+
+Drives POST /analyze (or /analyze/stream) either closed-loop at a
+fixed concurrency or open-loop at a fixed arrival rate, then reports
+client-side latency percentiles, throughput and error rates, plus
+per-stage latency and errors scraped from the app's /metrics.
+
+Run from the repo root:
+    python -m benchmarks.loadtest --concurrency 16 --duration 30
+    python -m benchmarks.loadtest --rate 20 --duration 60 --groq-error-rate 0.05
+    python -m benchmarks.loadtest --rate 20 --output loadtest.json
+
+Open-loop latency is measured from each request's scheduled start, so
+time spent waiting for a free client slot counts against the app
+(no coordinated omission).
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import requests
+
+from benchmarks import stub_servers
+
+
+# -------------------------------------------------
+# Request Payloads
+# -------------------------------------------------
+
+_CLASS_TEXT = (
+    "Downloadable software for managing trademark portfolios",
+    "Clothing, namely, shirts, hats and jackets",
+    "Restaurant and catering services",
+    "Online retail store services featuring cosmetics",
+    "Providing temporary use of non-downloadable software",
+)
+
+
+def _payload(rng: random.Random, doc_version: str, distinct: int) -> Dict:
+    """
+    TrademarkApplicationData body. `distinct` bounds how many
+    different applications are sent, so cache-friendly and
+    cache-hostile mixes can both be modelled.
+    """
+
+    n = rng.randrange(distinct)
+    n_classes = 1 + n % 3
+    return {
+        "doc_version": doc_version,
+        "data": {
+            "mark_info": {
+                "literal": f"LOADTEST MARK {n}",
+                "type": "Standard Character Claim",
+                "register": "Principal Register",
+            },
+            "filing_basis": {"basis_type": "1(a)", "use_in_commerce": True},
+            "goods_and_services": [
+                {"class_id": f"{9 + 16 * i:03d}", "description": _CLASS_TEXT[(n + i) % len(_CLASS_TEXT)]}
+                for i in range(n_classes)
+            ],
+            "owner": {"name": "Load Test LLC", "entity": "Limited Liability Company", "citizenship": "Delaware"},
+            "identifiers": {"serial_number": f"9{n:07d}", "registration_number": None},
+        },
+    }
+
+
+# -------------------------------------------------
+# Process Management
+# -------------------------------------------------
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_stubs(args) -> subprocess.Popen:
+    cmd = [
+        sys.executable, "-m", "benchmarks.stub_servers",
+        "--weaviate-port", "0", "--groq-port", "0",
+        "--issues", str(args.issues), "--text-words", str(args.text_words),
+    ]
+    for prefix in ("weaviate", "groq"):
+        for field in ("latency_ms", "jitter_ms", "error_rate", "error_status", "stall_rate", "stall_ms"):
+            value = getattr(args, f"{prefix}_{field}")
+            cmd += [f"--{prefix}-{field.replace('_', '-')}", str(value)]
+
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True)
+    line = proc.stdout.readline()
+    match = re.search(r"weaviate=(\d+) groq=(\d+)", line)
+    if not match:
+        proc.kill()
+        raise RuntimeError(f"Stub servers failed to start: {line!r}")
+
+    proc.weaviate_port, proc.groq_port = int(match.group(1)), int(match.group(2))
+    return proc
+
+
+def _start_app(args, stubs: subprocess.Popen, port: int) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.update({
+        "TMEP_DOC_VERSION": args.doc_version,
+        "WEAVIATE_URL": f"http://127.0.0.1:{stubs.weaviate_port}",
+        "WEAVIATE_API_KEY": "stub",
+        "GROQ_API_KEY": "stub",
+        "GROQ_BASE_URL": f"http://127.0.0.1:{stubs.groq_port}",
+    })
+
+    cmd = [
+        sys.executable, "-m", "uvicorn", "benchmarks.stubbed_app:app",
+        "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(args.workers),
+        "--log-level", "warning",
+    ]
+    output = None if args.show_app_logs else subprocess.DEVNULL
+    proc = subprocess.Popen(cmd, env=env, stdout=output, stderr=output)
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"api:app exited with status {proc.returncode}")
+        try:
+            if requests.get(f"http://127.0.0.1:{port}/health", timeout=1).ok:
+                return proc
+        except requests.ConnectionError:
+            pass
+        time.sleep(0.2)
+
+    proc.kill()
+    raise RuntimeError("api:app did not become healthy within 30s")
+
+
+def _stop(proc: Optional[subprocess.Popen]) -> None:
+    if proc is None or proc.poll() is not None:
+        return
+    proc.terminate()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+# -------------------------------------------------
+# Load Generation
+# -------------------------------------------------
+
+class _Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: List[float] = []
+        self.outcomes: Dict[str, int] = {}
+
+    def record(self, latency: float, outcome: str) -> None:
+        with self._lock:
+            self.latencies.append(latency)
+            self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+
+
+def _classify(response: requests.Response, stream: bool) -> str:
+    """
+    /analyze reports LLM failures inside a 200 body, so outcomes are
+    derived from the payload as well as the status code.
+    """
+
+    if response.status_code != 200:
+        return f"http_{response.status_code}"
+    if stream:
+        return "ok"
+
+    analysis = str(response.json().get("analysis", ""))
+    if analysis.startswith("LLM request timed out"):
+        return "llm_timeout"
+    if analysis.startswith("Error generating analysis"):
+        return "llm_error"
+    return "ok"
+
+
+def _make_sender(args, base_url: str, recorder: _Recorder):
+    local = threading.local()
+    path = "/analyze/stream" if args.stream else "/analyze"
+
+    def send(rng: random.Random, scheduled: float) -> None:
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+
+        body = _payload(rng, args.doc_version, args.distinct)
+        try:
+            response = session.post(f"{base_url}{path}", json=body, timeout=args.timeout)
+            if args.stream:
+                for _ in response.iter_lines():
+                    pass
+            outcome = _classify(response, args.stream)
+        except requests.Timeout:
+            outcome = "client_timeout"
+        except requests.RequestException:
+            outcome = "connection_error"
+
+        recorder.record(time.perf_counter() - scheduled, outcome)
+
+    return send
+
+
+def _run_closed_loop(args, send) -> None:
+    deadline = time.perf_counter() + args.duration
+
+    def worker(i: int) -> None:
+        rng = random.Random(args.seed + i)
+        while time.perf_counter() < deadline:
+            send(rng, time.perf_counter())
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(args.concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def _run_open_loop(args, send) -> None:
+    """
+    Poisson arrivals at --rate req/s; at most --max-outstanding
+    requests in flight, the rest wait (and accrue latency).
+    """
+
+    rng = random.Random(args.seed)
+    start = time.perf_counter()
+    next_at = start
+
+    with ThreadPoolExecutor(max_workers=args.max_outstanding) as pool:
+        while next_at < start + args.duration:
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(send, random.Random(rng.random()), next_at)
+            next_at += rng.expovariate(args.rate)
+
+
+# -------------------------------------------------
+# Reporting
+# -------------------------------------------------
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return float("nan")
+    idx = max(0, math.ceil(q * len(sorted_values)) - 1)
+    return sorted_values[idx]
+
+
+_SAMPLE_RE = re.compile(r"^(\w+)(?:\{(.*)\})?\s+(\S+)$")
+_LABEL_RE = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+def _scrape_metrics(base_url: str) -> List[tuple]:
+    text = requests.get(f"{base_url}/metrics", timeout=10).text
+    samples = []
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        match = _SAMPLE_RE.match(line)
+        if match:
+            labels = dict(_LABEL_RE.findall(match.group(2) or ""))
+            samples.append((match.group(1), labels, float(match.group(3))))
+    return samples
+
+
+def _diff_samples(before: List[tuple], after: List[tuple]) -> List[tuple]:
+    """
+    Counter/histogram deltas over the measured window, so warm-up
+    traffic does not leak into the stage report.
+    """
+
+    baseline = {(name, tuple(sorted(labels.items()))): value for name, labels, value in before}
+    return [
+        (name, labels, value - baseline.get((name, tuple(sorted(labels.items()))), 0.0))
+        for name, labels, value in after
+    ]
+
+
+def _stage_report(samples: List[tuple]) -> Dict:
+    """
+    Mean latency per pipeline stage (from the histogram sum/count)
+    and error counts per stage. With --workers > 1 this reflects only
+    the worker that served the scrape.
+    """
+
+    stages: Dict[str, Dict] = {}
+
+    for name, labels, value in samples:
+        if name.startswith("tmep_stage_latency_seconds_"):
+            entry = stages.setdefault(labels.get("stage", ""), {})
+            entry[name.rsplit("_", 1)[-1]] = value
+        elif name == "tmep_errors_total":
+            entry = stages.setdefault(labels.get("stage", ""), {})
+            errors = entry.setdefault("errors", {})
+            errors[labels.get("type", "")] = value
+        elif name == "tmep_llm_failures_total":
+            entry = stages.setdefault("llm_call", {})
+            entry.setdefault("llm_failures", {})[labels.get("reason", "")] = value
+
+    for entry in stages.values():
+        count = entry.pop("count", 0)
+        total = entry.pop("sum", 0.0)
+        entry.pop("bucket", None)
+        if count:
+            entry["calls"] = int(count)
+            entry["mean_ms"] = total / count * 1000
+
+    return {stage: entry for stage, entry in stages.items() if entry}
+
+
+def _stub_stats(stubs: subprocess.Popen) -> Dict:
+    stats = {}
+    for name, port in (("weaviate", stubs.weaviate_port), ("groq", stubs.groq_port)):
+        try:
+            stats[name] = requests.get(f"http://127.0.0.1:{port}/_stub/stats", timeout=5).json()
+        except requests.RequestException as e:
+            stats[name] = {"error": str(e)}
+    return stats
+
+
+def _print_report(report: Dict) -> None:
+    c = report["client"]
+    print("=" * 72)
+    print(f"Mode: {report['mode']}  |  duration {c['elapsed_seconds']:.1f}s  |  workers {report['params']['workers']}")
+    print("-" * 72)
+    print(f"Requests     : {c['requests']}  ({c['throughput_rps']:.2f} req/s, {c['goodput_rps']:.2f} ok/s)")
+    print(
+        f"Latency (ms) : p50 {c['p50_ms']:.1f} | p90 {c['p90_ms']:.1f} | "
+        f"p99 {c['p99_ms']:.1f} | max {c['max_ms']:.1f}"
+    )
+    print(f"Error rate   : {c['error_rate']:.2%}")
+    for outcome, count in sorted(c["outcomes"].items()):
+        print(f"   {outcome:<18}{count:>8}")
+
+    print("-" * 72)
+    print(f"{'stage':<22}{'calls':>10}{'mean ms':>12}   errors")
+    for stage, entry in sorted(report["stages"].items()):
+        errors = {**entry.get("errors", {}), **entry.get("llm_failures", {})}
+        errors_text = ", ".join(f"{k}={int(v)}" for k, v in sorted(errors.items())) or "-"
+        mean = f"{entry['mean_ms']:.1f}" if "mean_ms" in entry else "-"
+        print(f"{stage:<22}{entry.get('calls', 0):>10}{mean:>12}   {errors_text}")
+
+    print("-" * 72)
+    for name, stats in report["stubs"].items():
+        print(f"Stub {name:<9}: {stats}")
+    print("=" * 72)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--concurrency", type=int, help="Closed loop: this many clients back-to-back")
+    mode.add_argument("--rate", type=float, help="Open loop: Poisson arrivals per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of load")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Closed-loop warm-up seconds, not reported")
+    parser.add_argument("--max-outstanding", type=int, default=256, help="Open loop: client in-flight cap")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Client request timeout")
+    parser.add_argument("--stream", action="store_true", help="Drive /analyze/stream instead of /analyze")
+    parser.add_argument("--distinct", type=int, default=1000, help="Distinct applications in the request mix")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--show-app-logs", action="store_true", help="Pass the app's log output through")
+    parser.add_argument("--app-url", help="Drive an already-running app instead of starting one")
+    parser.add_argument("--doc-version", default="TMEP Nov 2025")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", type=Path, help="Write the JSON report here")
+    parser.add_argument("--text-words", type=int, default=150, help="Words per stub chunk")
+    parser.add_argument("--issues", type=int, default=5, help="Issues per stub completion")
+    stub_servers.add_fault_args(parser, "weaviate", latency_ms=40.0)
+    stub_servers.add_fault_args(parser, "groq", latency_ms=800.0)
+    args = parser.parse_args()
+
+    if args.concurrency is None and args.rate is None:
+        args.concurrency = 8
+
+    stubs = app = None
+    try:
+        stubs = _start_stubs(args)
+
+        if args.app_url:
+            base_url = args.app_url.rstrip("/")
+        else:
+            port = _free_port()
+            app = _start_app(args, stubs, port)
+            base_url = f"http://127.0.0.1:{port}"
+
+        print(f"🚀 Load testing {base_url} (stubs: weaviate={stubs.weaviate_port}, groq={stubs.groq_port})")
+
+        if args.concurrency and args.warmup:
+            warm = argparse.Namespace(**{**vars(args), "duration": args.warmup})
+            _run_closed_loop(warm, _make_sender(warm, base_url, _Recorder()))
+
+        metrics_before = _scrape_metrics(base_url)
+        recorder = _Recorder()
+        send = _make_sender(args, base_url, recorder)
+        started = time.perf_counter()
+
+        if args.rate:
+            _run_open_loop(args, send)
+            mode_desc = f"open loop @ {args.rate:g} req/s"
+        else:
+            _run_closed_loop(args, send)
+            mode_desc = f"closed loop x{args.concurrency}"
+
+        elapsed = time.perf_counter() - started
+        latencies = sorted(recorder.latencies)
+        total = len(latencies)
+        ok = recorder.outcomes.get("ok", 0)
+
+        report = {
+            "mode": mode_desc,
+            "params": {
+                k: v for k, v in vars(args).items()
+                if k not in ("output", "app_url")
+            },
+            "client": {
+                "requests": total,
+                "elapsed_seconds": elapsed,
+                "throughput_rps": total / elapsed if elapsed else 0.0,
+                "goodput_rps": ok / elapsed if elapsed else 0.0,
+                "error_rate": (total - ok) / total if total else 0.0,
+                "p50_ms": _percentile(latencies, 0.50) * 1000,
+                "p90_ms": _percentile(latencies, 0.90) * 1000,
+                "p99_ms": _percentile(latencies, 0.99) * 1000,
+                "max_ms": (latencies[-1] if latencies else float("nan")) * 1000,
+                "outcomes": recorder.outcomes,
+            },
+            "stages": _stage_report(_diff_samples(metrics_before, _scrape_metrics(base_url))),
+            "stubs": _stub_stats(stubs),
+        }
+
+        _print_report(report)
+
+        if args.output:
+            args.output.parent.mkdir(parents=True, exist_ok=True)
+            args.output.write_text(json.dumps(report, indent=2, default=str), encoding="utf-8")
+            print(f"📁 Report saved: {args.output}")
+
+    finally:
+        _stop(app)
+        _stop(stubs)
+
+
+if __name__ == "__main__":
+    main()
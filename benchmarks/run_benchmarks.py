@@ -0,0 +1,198 @@
+"""
+Micro-benchmark suite for the ingestion and risk-engine hot paths.
+
+Run from the repo root:
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run_benchmarks --compare benchmarks/baseline.json --threshold 0.15
+
+--compare exits with status 1 if any benchmark's ops/sec dropped by
+more than --threshold (fractional) against the baseline.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from benchmarks import synthetic
+from src.parsing.parse_tmep_html import parse_tmep_html
+from src.processing.normalize_sections import normalize_sections
+from src.processing.chunk_sections import chunk_sections
+from src.rag.input_adapter import structured_object_to_query
+from src.rag.risk_engine import parse_llm_output, classify_section
+
+
+# -------------------------------------------------
+# Measurement
+# -------------------------------------------------
+
+def _measure(fn: Callable[[], object], min_time: float, repeat: int) -> Dict:
+    """
+    Best-of-`repeat` ops/sec, each run auto-sized to take at least
+    `min_time` seconds; peak traced memory of a single call.
+    """
+
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops *= 2
+
+    best = elapsed / loops
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        best = min(best, (time.perf_counter() - start) / loops)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "ops_per_sec": 1.0 / best,
+        "mean_seconds": best,
+        "peak_memory_bytes": peak,
+        "loops": loops,
+    }
+
+
+def _build_cases(args, workdir: Path) -> Dict[str, Callable[[], object]]:
+    html_path = synthetic.write_tmep_html_corpus(
+        workdir,
+        n_files=1,
+        n_sections=args.sections,
+        depth=args.depth,
+        text_words=args.text_words,
+        seed=args.seed,
+    )[0]
+
+    parsed = parse_tmep_html(html_path)
+    normalized = normalize_sections(parsed)
+    app = synthetic.synthetic_application(n_classes=args.classes, seed=args.seed)
+    llm_output = synthetic.generate_llm_output(n_issues=args.issues, seed=args.seed)
+    citations = synthetic.generate_citations(n=1000, seed=args.seed)
+
+    def classify_1000():
+        for citation in citations:
+            classify_section(citation)
+
+    return {
+        "parse_tmep_html": lambda: parse_tmep_html(html_path),
+        "normalize_sections": lambda: normalize_sections(parsed),
+        "chunk_sections": lambda: chunk_sections(normalized, html_path.name),
+        "structured_object_to_query": lambda: structured_object_to_query(app),
+        "parse_llm_output": lambda: parse_llm_output(llm_output),
+        "classify_section_x1000": classify_1000,
+    }
+
+
+# -------------------------------------------------
+# Baseline Comparison
+# -------------------------------------------------
+
+def _compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    regressions = []
+
+    for name, current in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous:
+            continue
+
+        change = current["ops_per_sec"] / previous["ops_per_sec"] - 1.0
+        current["change_vs_baseline"] = change
+
+        if change < -threshold:
+            regressions.append(
+                f"{name}: {previous['ops_per_sec']:,.1f} -> "
+                f"{current['ops_per_sec']:,.1f} ops/s ({change:+.1%})"
+            )
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sections", type=int, default=200, help="Sections in the synthetic HTML page")
+    parser.add_argument("--depth", type=int, default=3, help="Section nesting depth")
+    parser.add_argument("--text-words", type=int, default=150, help="Words of text per section")
+    parser.add_argument("--classes", type=int, default=5, help="Goods/services classes per application")
+    parser.add_argument("--issues", type=int, default=8, help="Issues per synthetic LLM output")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds per timing run")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="*", help="Run only these benchmarks")
+    parser.add_argument("--save-baseline", type=Path)
+    parser.add_argument("--compare", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.15)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = _build_cases(args, Path(tmp))
+
+        if args.only:
+            cases = {k: v for k, v in cases.items() if k in args.only}
+
+        results = {}
+        print("=" * 72)
+        print(f"{'benchmark':<30}{'ops/sec':>14}{'mean':>14}{'peak mem':>14}")
+        print("-" * 72)
+
+        for name, fn in cases.items():
+            results[name] = _measure(fn, args.min_time, args.repeat)
+            r = results[name]
+            print(
+                f"{name:<30}{r['ops_per_sec']:>14,.1f}"
+                f"{r['mean_seconds'] * 1000:>12.3f}ms"
+                f"{r['peak_memory_bytes'] / 1024:>11,.1f}KiB"
+            )
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {
+            k: v for k, v in vars(args).items()
+            if k in ("sections", "depth", "text_words", "classes", "issues", "seed")
+        },
+        "results": results,
+    }
+
+    exit_code = 0
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        if baseline.get("params") != report["params"]:
+            print("⚠️  Baseline was recorded with different parameters")
+
+        regressions = _compare(results, baseline, args.threshold)
+        print("-" * 72)
+        if regressions:
+            print(f"❌ Regressions beyond {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"   {line}")
+            exit_code = 1
+        else:
+            print(f"✅ No regressions beyond {args.threshold:.0%}")
+
+    if args.save_baseline:
+        args.save_baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.save_baseline.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"📁 Baseline saved: {args.save_baseline}")
+
+    print("=" * 72)
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,409 @@
+"""
+Local stand-ins for the two paid services the API calls, for load
+testing without cloud traffic:
+
+  Weaviate   POST /v1/graphql              (Get nearText query)
+             GET  /v1/.well-known/ready
+  Groq       POST /openai/v1/chat/completions  (plain and stream=true)
+
+Both inject configurable latency and errors. Counters are served at
+GET /_stub/stats. Point the API at them by serving
+benchmarks.stubbed_app:app (which swaps in benchmarks.stub_weaviate_client)
+with WEAVIATE_URL=http://127.0.0.1:<port> and GROQ_BASE_URL=http://127.0.0.1:<port>.
+
+Run from the repo root:
+    python -m benchmarks.stub_servers --weaviate-port 8181 --groq-port 8282 \\
+        --groq-latency-ms 800 --groq-error-rate 0.02
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+from benchmarks import synthetic
+
+
+# -------------------------------------------------
+# Fault Injection
+# -------------------------------------------------
+
+@dataclass
+class FaultProfile:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 500
+    stall_rate: float = 0.0
+    stall_ms: float = 0.0
+
+    def delay_seconds(self, rng: random.Random) -> float:
+        """
+        Base latency plus exponential jitter; a `stall_rate` fraction
+        of calls additionally hang for `stall_ms` (timeout testing).
+        """
+
+        delay = self.latency_ms
+        if self.jitter_ms > 0:
+            delay += rng.expovariate(1.0 / self.jitter_ms)
+        if self.stall_rate and rng.random() < self.stall_rate:
+            delay += self.stall_ms
+        return delay / 1000.0
+
+    def should_fail(self, rng: random.Random) -> bool:
+        return bool(self.error_rate) and rng.random() < self.error_rate
+
+
+class _Stats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = {}
+
+    def inc(self, key: str) -> None:
+        with self._lock:
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    # Set on the per-server subclass
+    faults: FaultProfile = FaultProfile()
+    stats: _Stats = None
+    seed: int = 7
+
+    def log_message(self, format, *args):
+        pass
+
+    def _rng(self) -> random.Random:
+        return random.Random(f"{self.seed}:{threading.get_ident()}:{time.perf_counter_ns()}")
+
+    def _read_json(self) -> Dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b"{}"
+        return json.loads(raw or b"{}")
+
+    def _send_json(self, status: int, body: Dict) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _inject(self, rng: random.Random) -> bool:
+        """
+        Sleep the configured latency; return True if an error
+        response was sent instead of the real one.
+        """
+
+        time.sleep(self.faults.delay_seconds(rng))
+
+        if self.faults.should_fail(rng):
+            self.stats.inc("injected_errors")
+            self._send_json(
+                self.faults.error_status,
+                {"error": {"message": "injected failure", "type": "stub_error"}},
+            )
+            return True
+        return False
+
+    def do_GET(self):
+        if self.path == "/_stub/stats":
+            self._send_json(200, self.stats.snapshot())
+            return
+        self._handle_get()
+
+    def _handle_get(self):
+        self._send_json(404, {"error": "not found"})
+
+
+# -------------------------------------------------
+# Weaviate Stand-in
+# -------------------------------------------------
+
+_CONCEPT_RE = re.compile(r'concepts:\s*\[\s*("(?:[^"\\]|\\.)*")')
+_LIMIT_RE = re.compile(r"limit:\s*(\d+)")
+_VERSION_RE = re.compile(r'valueText:\s*("(?:[^"\\]|\\.)*")')
+_CLASS_RE = re.compile(r"Get\s*{\s*(\w+)\s*\(")
+_VECTOR_RE = re.compile(r"_additional\s*{[^}]*\bvector\b")
+
+
+_STUB_VECTOR_DIM = 32
+
+
+def _stub_vector(section_id: str, jitter: random.Random) -> List[float]:
+    """
+    Sections of one chapter share a base direction, so MMR sees
+    near-duplicate families like the real corpus.
+    """
+    base = random.Random(section_id.split(".")[0])
+    return [base.gauss(0, 1) + 0.3 * jitter.gauss(0, 1) for _ in range(_STUB_VECTOR_DIM)]
+
+
+def _weaviate_objects(
+    query: str,
+    limit: int,
+    doc_version: str,
+    text_words: int,
+    with_vectors: bool = False,
+) -> List[Dict]:
+    """
+    Deterministic pseudo-results for a query: same query, same
+    sections. Distances span the MIN_SIMILARITY cut-off so the
+    filter path is exercised.
+    """
+
+    seed = int(hashlib.sha256(query.encode("utf-8")).hexdigest()[:12], 16)
+    rng = random.Random(seed)
+    citations = synthetic.generate_citations(limit, seed=seed)
+
+    objects = []
+    for i, sid in enumerate(citations):
+        objects.append({
+            "chunk_id": f"tmep-stub.html::{sid}::{i}",
+            "text": synthetic._paragraph(rng, text_words),
+            "section_id": sid,
+            "section_path": f"{sid} {rng.choice(synthetic._TITLES)}",
+            "source_file": "tmep-stub.html",
+            "doc_version": doc_version,
+            "source": "USPTO TMEP",
+            "_additional": {"distance": round(rng.uniform(0.05, 0.35), 4)},
+        })
+        if with_vectors:
+            objects[-1]["_additional"]["vector"] = _stub_vector(sid, rng)
+
+    # Always return at least one hit above the similarity floor
+    if objects:
+        objects[0]["_additional"]["distance"] = round(rng.uniform(0.05, 0.2), 4)
+
+    return objects
+
+
+class WeaviateStubHandler(_StubHandler):
+    text_words: int = 150
+
+    def _handle_get(self):
+        if self.path == "/v1/.well-known/ready":
+            self.stats.inc("ready")
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        super()._handle_get()
+
+    def do_POST(self):
+        if self.path != "/v1/graphql":
+            self._send_json(404, {"error": "not found"})
+            return
+
+        body = self._read_json()
+        self.stats.inc("queries")
+
+        if self._inject(self._rng()):
+            return
+
+        gql = body.get("query", "")
+        concept = _CONCEPT_RE.search(gql)
+        limit = _LIMIT_RE.search(gql)
+        version = _VERSION_RE.search(gql)
+        class_name = _CLASS_RE.search(gql)
+
+        if not concept or not class_name:
+            self._send_json(200, {"errors": [{"message": "stub: unsupported query"}]})
+            return
+
+        objects = _weaviate_objects(
+            json.loads(concept.group(1)),
+            int(limit.group(1)) if limit else 10,
+            json.loads(version.group(1)) if version else "",
+            self.text_words,
+            with_vectors=_VECTOR_RE.search(gql) is not None,
+        )
+        self._send_json(200, {"data": {"Get": {class_name.group(1): objects}}})
+
+
+# -------------------------------------------------
+# Groq Stand-in (OpenAI-compatible chat completions)
+# -------------------------------------------------
+
+class GroqStubHandler(_StubHandler):
+    n_issues: int = 5
+    stream_chunks: int = 20
+
+    def do_POST(self):
+        if self.path != "/openai/v1/chat/completions":
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+
+        body = self._read_json()
+        self.stats.inc("completions")
+
+        rng = self._rng()
+        model = body.get("model", "stub")
+        prompt_chars = sum(len(m.get("content") or "") for m in body.get("messages", []))
+        content = synthetic.generate_llm_output(
+            n_issues=self.n_issues,
+            seed=rng.randint(0, 1_000_000),
+        )
+        usage = {
+            "prompt_tokens": prompt_chars // 4,
+            "completion_tokens": len(content) // 4,
+            "total_tokens": prompt_chars // 4 + len(content) // 4,
+        }
+
+        if body.get("stream"):
+            self._stream(rng, model, content, usage)
+            return
+
+        if self._inject(rng):
+            return
+
+        self._send_json(200, {
+            "id": f"chatcmpl-stub-{rng.getrandbits(32):08x}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+                "logprobs": None,
+            }],
+            "usage": usage,
+        })
+
+    def _stream(self, rng: random.Random, model: str, content: str, usage: Dict) -> None:
+        """
+        Server-sent events: time-to-first-token is the failure point,
+        the configured latency is spread across the chunks.
+        """
+
+        delay = self.faults.delay_seconds(rng)
+        if self.faults.should_fail(rng):
+            time.sleep(delay)
+            self.stats.inc("injected_errors")
+            self._send_json(self.faults.error_status, {"error": {"message": "injected failure"}})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        completion_id = f"chatcmpl-stub-{rng.getrandbits(32):08x}"
+        step = max(1, len(content) // self.stream_chunks)
+        pieces = [content[i:i + step] for i in range(0, len(content), step)]
+
+        for i, piece in enumerate(pieces):
+            time.sleep(delay / len(pieces))
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}],
+            }
+            if i == len(pieces) - 1:
+                chunk["choices"][0]["finish_reason"] = "stop"
+                chunk["x_groq"] = {"usage": usage}
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+# -------------------------------------------------
+# Server Lifecycle
+# -------------------------------------------------
+
+def start_stub(
+    handler: type,
+    port: int,
+    faults: FaultProfile,
+    host: str = "127.0.0.1",
+    **attrs,
+) -> ThreadingHTTPServer:
+    """
+    Start a stub on a daemon thread; port 0 picks a free port
+    (read it back from server.server_address).
+    """
+
+    configured = type(handler.__name__, (handler,), {
+        "faults": faults,
+        "stats": _Stats(),
+        **attrs,
+    })
+
+    server = ThreadingHTTPServer((host, port), configured)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name=handler.__name__, daemon=True).start()
+    return server
+
+
+def add_fault_args(parser: argparse.ArgumentParser, prefix: str, latency_ms: float) -> None:
+    group = parser.add_argument_group(f"{prefix} stub")
+    group.add_argument(f"--{prefix}-latency-ms", type=float, default=latency_ms)
+    group.add_argument(f"--{prefix}-jitter-ms", type=float, default=latency_ms / 4)
+    group.add_argument(f"--{prefix}-error-rate", type=float, default=0.0)
+    group.add_argument(f"--{prefix}-error-status", type=int, default=500)
+    group.add_argument(f"--{prefix}-stall-rate", type=float, default=0.0)
+    group.add_argument(f"--{prefix}-stall-ms", type=float, default=0.0)
+
+
+def faults_from_args(args, prefix: str) -> FaultProfile:
+    return FaultProfile(**{
+        field: getattr(args, f"{prefix}_{field}")
+        for field in ("latency_ms", "jitter_ms", "error_rate", "error_status", "stall_rate", "stall_ms")
+    })
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--weaviate-port", type=int, default=8181)
+    parser.add_argument("--groq-port", type=int, default=8282)
+    parser.add_argument("--text-words", type=int, default=150, help="Words per returned chunk")
+    parser.add_argument("--issues", type=int, default=5, help="Issues per completion")
+    add_fault_args(parser, "weaviate", latency_ms=40.0)
+    add_fault_args(parser, "groq", latency_ms=800.0)
+    args = parser.parse_args(argv)
+
+    weaviate = start_stub(
+        WeaviateStubHandler, args.weaviate_port, faults_from_args(args, "weaviate"),
+        host=args.host, text_words=args.text_words,
+    )
+    groq = start_stub(
+        GroqStubHandler, args.groq_port, faults_from_args(args, "groq"),
+        host=args.host, n_issues=args.issues,
+    )
+
+    # Parsed by the load-test runner; keep the format stable
+    print(
+        f"STUBS READY weaviate={weaviate.server_address[1]} groq={groq.server_address[1]}",
+        flush=True,
+    )
+
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        weaviate.shutdown()
+        groq.shutdown()
+
+
+if __name__ == "__main__":
+    main()
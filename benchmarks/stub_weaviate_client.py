@@ -0,0 +1,129 @@
+"""
+Stand-in for the Weaviate v4 client, for the load test and other
+harness runs against benchmarks.stub_servers.
+
+The app's production retrieval path (weaviate_search._search_collection:
+collections.get -> query.near_text with a doc_version Filter) runs
+unchanged; only the object returned by get_client() is replaced. Each
+near_text call becomes one GraphQL POST to the stub server, so its
+latency and fault injection still apply per query.
+
+    from benchmarks.stub_weaviate_client import install
+    install("http://127.0.0.1:8181")
+
+The load test serves the app through benchmarks.stubbed_app, which
+calls install() in every uvicorn worker before importing api.
+"""
+
+import json
+import os
+from types import SimpleNamespace
+from typing import Any, Dict, Optional
+
+import requests
+
+from src.vectorstore.weaviate_client import CLASS_NAME
+
+
+STUB_TIMEOUT_SECONDS = float(os.getenv("STUB_WEAVIATE_TIMEOUT", "30"))
+
+_RETURN_PROPERTIES = (
+    "chunk_id", "text", "section_id", "section_path",
+    "source_file", "doc_version", "source",
+)
+
+
+def _neartext_graphql(query: str, limit: int, doc_version: str, with_vectors: bool) -> str:
+    # json.dumps produces a valid GraphQL string literal
+    additional = "_additional { distance vector }" if with_vectors else "_additional { distance }"
+    return (
+        "{ Get { "
+        f"{CLASS_NAME}("
+        f"nearText: {{concepts: [{json.dumps(query)}]}}, "
+        f"limit: {int(limit)}, "
+        "where: {path: [\"doc_version\"], operator: Equal, "
+        f"valueText: {json.dumps(doc_version)}}}"
+        ") { "
+        + " ".join(_RETURN_PROPERTIES)
+        + f" {additional} }} }} }}"
+    )
+
+
+class _StubQuery:
+    def __init__(self, client: "StubWeaviateClient", name: str):
+        self._client = client
+        self._name = name
+
+    def near_text(
+        self,
+        query: str,
+        limit: int = 10,
+        filters: Any = None,
+        return_metadata: Any = None,
+        include_vector: bool = False,
+        **_: Any,
+    ) -> SimpleNamespace:
+        # Filter.by_property("doc_version").equal(v) keeps v in .value
+        doc_version = getattr(filters, "value", "") or ""
+
+        response = self._client.session.post(
+            f"{self._client.url}/v1/graphql",
+            json={"query": _neartext_graphql(query, limit, doc_version, include_vector)},
+            timeout=STUB_TIMEOUT_SECONDS,
+        )
+        response.raise_for_status()
+        body = response.json()
+
+        if body.get("errors"):
+            raise RuntimeError(f"Weaviate GraphQL error: {body['errors'][0].get('message')}")
+
+        objects = (body.get("data") or {}).get("Get", {}).get(self._name) or []
+
+        return SimpleNamespace(objects=[_stub_object(obj) for obj in objects])
+
+
+def _stub_object(obj: Dict) -> SimpleNamespace:
+    additional = obj.pop("_additional", None) or {}
+    return SimpleNamespace(
+        properties=obj,
+        metadata=SimpleNamespace(distance=additional.get("distance")),
+        vector=additional.get("vector"),
+    )
+
+
+class _StubCollections:
+    def __init__(self, client: "StubWeaviateClient"):
+        self._client = client
+
+    def get(self, name: str) -> SimpleNamespace:
+        return SimpleNamespace(query=_StubQuery(self._client, name))
+
+
+class StubWeaviateClient:
+    """
+    The subset of weaviate.WeaviateClient the search path uses.
+    """
+
+    def __init__(self, url: str):
+        self.url = url.rstrip("/")
+        self.session = requests.Session()
+        self.collections = _StubCollections(self)
+
+    def is_ready(self) -> bool:
+        response = self.session.get(f"{self.url}/v1/.well-known/ready", timeout=STUB_TIMEOUT_SECONDS)
+        return response.status_code == 200
+
+    def close(self) -> None:
+        self.session.close()
+
+
+def install(url: Optional[str] = None) -> None:
+    """
+    Make weaviate_search.get_client() return a stub-backed client
+    (one per call, closed by the caller like the real one).
+    """
+
+    from src.vectorstore import weaviate_search
+
+    url = url or os.environ["WEAVIATE_URL"]
+    weaviate_search.get_client = lambda: StubWeaviateClient(url)
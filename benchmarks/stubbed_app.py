@@ -0,0 +1,15 @@
+"""
+api:app with Weaviate served by benchmarks.stub_servers through the
+stub v4 client (benchmarks.stub_weaviate_client), for uvicorn:
+
+    WEAVIATE_URL=http://127.0.0.1:8181 GROQ_BASE_URL=http://127.0.0.1:8282 \\
+        python -m uvicorn benchmarks.stubbed_app:app --workers 2
+
+Groq needs no patching: the SDK honours GROQ_BASE_URL.
+"""
+
+from benchmarks.stub_weaviate_client import install
+
+install()
+
+from api import app  # noqa: E402,F401
@@ -0,0 +1,191 @@
+"""
+Synthetic inputs for benchmarks: TMEP-like HTML, LLM outputs and
+structured applications. Deterministic for a given seed.
+"""
+
+import random
+from pathlib import Path
+from types import SimpleNamespace
+from typing import List
+
+
+_WORDS = (
+    "applicant mark registration examining attorney likelihood confusion "
+    "descriptive merely goods services specimen commerce refusal register "
+    "principal supplemental identification class consumer trade dress "
+    "disclaimer translation geographic surname ornamental functional "
+    "amendment declaration verified statement filing basis intent use"
+).split()
+
+_TITLES = (
+    "Likelihood of Confusion", "Descriptiveness", "Specimens",
+    "Identification of Goods and Services", "Disclaimers",
+    "Surnames", "Geographic Marks", "Filing Basis", "Drawings",
+)
+
+
+def _sentence(rng: random.Random, n_words: int) -> str:
+    words = rng.choices(_WORDS, k=n_words)
+    return " ".join(words).capitalize() + "."
+
+
+def _paragraph(rng: random.Random, text_words: int) -> str:
+    sentences = []
+    remaining = text_words
+    while remaining > 0:
+        n = min(remaining, rng.randint(8, 25))
+        sentences.append(_sentence(rng, n))
+        remaining -= n
+    return " ".join(sentences)
+
+
+def _section_id(chapter: int, path: List[int]) -> str:
+    sid = str(chapter)
+    for depth, idx in enumerate(path):
+        if depth == 0:
+            sid += f".{idx:02d}"
+        elif depth == 1:
+            sid += f"({chr(ord('a') + idx - 1)})"
+        else:
+            sid += f"({'i' * min(idx, 3)})"
+    return sid
+
+
+def generate_tmep_html(
+    n_sections: int = 50,
+    depth: int = 2,
+    text_words: int = 120,
+    paragraphs: int = 3,
+    seed: int = 7,
+) -> str:
+    """
+    Build one TMEP-like HTML page: nested div.Section elements with
+    "1207.01(a) Title" headings and p/li children.
+    """
+
+    rng = random.Random(seed)
+    chapter = rng.choice([800, 900, 1200, 1207, 1209, 1300])
+    emitted = 0
+    parts: List[str] = ["<html><body>"]
+
+    def emit(path: List[int], level: int) -> None:
+        nonlocal emitted
+        if emitted >= n_sections:
+            return
+        emitted += 1
+
+        sid = _section_id(chapter, path)
+        parts.append('<div class="Section">')
+        # Page-level sections carry h1.page-title, subsections h2
+        if level == 1:
+            parts.append(f'<h1 class="page-title">{sid} {rng.choice(_TITLES)}</h1>')
+        else:
+            parts.append(f"<h2>{sid} {rng.choice(_TITLES)}</h2>")
+
+        for _ in range(paragraphs):
+            parts.append(f"<p>{_paragraph(rng, text_words // paragraphs)}</p>")
+        if rng.random() < 0.3:
+            parts.append(f"<li>{_sentence(rng, 12)}</li>")
+        # Occasional short fragments that the length filters drop
+        if rng.random() < 0.1:
+            parts.append('<div class="Section"><h2>Note</h2><p>Short.</p></div>')
+
+        if level < depth:
+            for child in range(1, rng.randint(2, 4)):
+                emit(path + [child], level + 1)
+
+        parts.append("</div>")
+
+    top = 1
+    while emitted < n_sections:
+        emit([top], 1)
+        top += 1
+
+    parts.append("</body></html>")
+    return "\n".join(parts)
+
+
+def write_tmep_html_corpus(
+    output_dir: Path,
+    n_files: int = 5,
+    n_sections: int = 50,
+    depth: int = 2,
+    text_words: int = 120,
+    seed: int = 7,
+) -> List[Path]:
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    paths = []
+    for i in range(n_files):
+        path = output_dir / f"tmep-synthetic-{i:04d}.html"
+        path.write_text(
+            generate_tmep_html(n_sections, depth, text_words, seed=seed + i),
+            encoding="utf-8",
+        )
+        paths.append(path)
+
+    return paths
+
+
+def generate_llm_output(n_issues: int = 5, explanation_words: int = 80, seed: int = 7) -> str:
+    """
+    LLM completion in the mandatory ISSUE / TMEP CITATION /
+    TMEP-BASED EXPLANATION format, with a short preamble.
+    """
+
+    rng = random.Random(seed)
+    blocks = ["Based on the retrieved TMEP excerpts, the following issues apply.\n"]
+
+    for _ in range(n_issues):
+        citation = f"{rng.choice([904, 1202, 1207, 1209, 1213, 1402])}.{rng.randint(1, 15):02d}"
+        if rng.random() < 0.4:
+            citation += f"({rng.choice('abcd')})"
+        blocks.append(
+            f"ISSUE:\n{_sentence(rng, 10)}\n\n"
+            f"TMEP CITATION:\n§{citation}\n\n"
+            f"TMEP-BASED EXPLANATION:\n{_paragraph(rng, explanation_words)}\n"
+        )
+
+    return "\n".join(blocks)
+
+
+def generate_citations(n: int = 1000, seed: int = 7) -> List[str]:
+    rng = random.Random(seed)
+    citations = []
+    for _ in range(n):
+        citation = str(rng.randint(100, 1999))
+        if rng.random() < 0.7:
+            citation += f".{rng.randint(1, 20):02d}"
+        if rng.random() < 0.4:
+            citation += f"({rng.choice('abcdef')})"
+        citations.append(citation)
+    return citations
+
+
+def synthetic_application(n_classes: int = 3, seed: int = 7) -> SimpleNamespace:
+    """
+    Duck-typed application with the attributes input_adapter reads.
+    """
+
+    rng = random.Random(seed)
+    return SimpleNamespace(
+        mark=" ".join(rng.choices(_WORDS, k=3)).upper(),
+        mark_type="Standard Character Claim",
+        register="Principal Register",
+        filing_basis=rng.choice(["1(a)", "1(b)", "44(d)", "44(e)", "66(a)"]),
+        use_in_commerce=rng.random() < 0.5,
+        goods_map={
+            f"{c:03d}": _paragraph(rng, 40)
+            for c in rng.sample(range(1, 46), n_classes)
+        },
+        owner_name="Synthetic Holdings LLC",
+        owner_entity="Limited Liability Company",
+        owner_citizenship="Delaware",
+        serial_number="90000000",
+        registration_number=None,
+        specimen=None,
+        disclaimer=None,
+        mark_features=None,
+        claimed_prior_registrations=(),
+    )
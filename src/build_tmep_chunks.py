@@ -1,9 +1,12 @@
+import os
+import time
 from pathlib import Path
-import json
 
 from src.parsing.parse_tmep_html import parse_tmep_html
-from src.processing.normalize_sections import normalize_sections
-from src.processing.chunk_sections import chunk_sections
+from src.processing.normalize_sections import DOC_VERSION, normalize_sections
+from src.processing.chunk_sections import chunk_sections, save_chunks
+from src.processing.chunk_store import CHUNK_STORE_DIR, write_chunk_store
+from src.serialization import write_artifact
 
 
 
@@ -11,33 +14,77 @@ from src.processing.chunk_sections import chunk_sections
 # Paths (MATCH YOUR PROJECT STRUCTURE)
 # ---------------------------------------
 RAW_HTML_DIR = Path(
-    "data/raw/tmep-nov2025-html/TMEP"
+    os.getenv("TMEP_RAW_HTML_DIR", "data/raw/tmep-nov2025-html/TMEP")
 )
 OUTPUT_CHUNKS = Path(
-    "data/chunks/tmep_chunks.json"
+    os.getenv("TMEP_CHUNKS_PATH", "data/chunks/tmep_chunks.json")
 )
+BUILD_REPORT_PATH = Path(
+    os.getenv("TMEP_BUILD_REPORT_PATH", "data/reports/build_report.json")
+)
+SLOWEST_FILES_SHOWN = 5
+
+
+def _summarize(files: list[dict], stages: dict[str, float]) -> dict:
+    totals = {
+        "files": len(files),
+        "bytes_read": sum(f["parse"]["bytes_read"] for f in files),
+        "section_divs": sum(f["parse"]["section_divs"] for f in files),
+        "parse_dropped_no_id": sum(f["parse"]["dropped_no_id"] for f in files),
+        "parse_dropped_short": sum(f["parse"]["dropped_short"] for f in files),
+        "normalize_dropped_no_id": sum(f["normalize"]["dropped_no_id"] for f in files),
+        "normalize_dropped_short": sum(f["normalize"]["dropped_short"] for f in files),
+        "sections": sum(f["normalize"]["sections"] for f in files),
+        "chunks": sum(f["chunks"] for f in files),
+        "files_without_chunks": sum(1 for f in files if f["chunks"] == 0),
+    }
+    return {"totals": totals, "stage_seconds": {k: round(v, 4) for k, v in stages.items()}}
 
 
 def main():
     all_chunks = []
     seen_chunk_ids = set()
 
+    build_start = time.perf_counter()
+    stages = {"parse": 0.0, "normalize": 0.0, "chunk": 0.0}
+    file_reports: list[dict] = []
+
     html_files = sorted(RAW_HTML_DIR.glob("*.html"))
 
-    print(f"📄 Found {len(html_files)} TMEP HTML files")
+    print(f"📄 Found {len(html_files)} TMEP HTML files ({DOC_VERSION})")
 
     for html_file in html_files:
         print(f"→ Processing {html_file.name}")
+        parse_stats: dict = {}
+        normalize_stats: dict = {}
 
         # 1️⃣ Parse
-        parsed = parse_tmep_html(html_file)
+        t0 = time.perf_counter()
+        parsed = parse_tmep_html(html_file, stats=parse_stats)
 
         # 2️⃣ Normalize
-        normalized = normalize_sections(parsed)
+        t1 = time.perf_counter()
+        normalized = normalize_sections(parsed, doc_version=DOC_VERSION, stats=normalize_stats)
 
         # 3️⃣ Chunk (1 section = 1 chunk)
+        t2 = time.perf_counter()
         source_file = html_file.name
         chunks = chunk_sections(normalized, source_file)
+        t3 = time.perf_counter()
+
+        stages["parse"] += t1 - t0
+        stages["normalize"] += t2 - t1
+        stages["chunk"] += t3 - t2
+        file_reports.append({
+            "file": source_file,
+            "parse_seconds": round(t1 - t0, 4),
+            "normalize_seconds": round(t2 - t1, 4),
+            "chunk_seconds": round(t3 - t2, 4),
+            "total_seconds": round(t3 - t0, 4),
+            "parse": parse_stats,
+            "normalize": normalize_stats,
+            "chunks": len(chunks),
+        })
 
 
         # 4️⃣ Validate + collect
@@ -50,16 +97,54 @@ def main():
             seen_chunk_ids.add(cid)
             all_chunks.append(chunk)
 
-    # 5️⃣ Save output
-    OUTPUT_CHUNKS.parent.mkdir(parents=True, exist_ok=True)
-    OUTPUT_CHUNKS.write_text(
-        json.dumps(all_chunks, indent=2, ensure_ascii=False),
-        encoding="utf-8"
-    )
-
+    # 5️⃣ Save output (.json, or .msgpack for a compact binary artifact)
+    t0 = time.perf_counter()
+    save_chunks(all_chunks, OUTPUT_CHUNKS)
+
+    # 6️⃣ Compact memory-mapped store for runtime consumers
+    t1 = time.perf_counter()
+    write_chunk_store(all_chunks, CHUNK_STORE_DIR)
+    stages["save_chunks"] = t1 - t0
+    stages["chunk_store"] = time.perf_counter() - t1
+
+    # 7️⃣ Build report: per-file and per-stage numbers
+    report = {
+        "doc_version": DOC_VERSION,
+        "raw_html_dir": str(RAW_HTML_DIR),
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "elapsed_seconds": round(time.perf_counter() - build_start, 4),
+        **_summarize(file_reports, stages),
+        "files": file_reports,
+    }
+    write_artifact(report, BUILD_REPORT_PATH)
+
+    totals = report["totals"]
     print("=" * 60)
     print(f"✅ Total chunks created: {len(all_chunks)}")
+    print(
+        f"🔎 Sections: {totals['section_divs']} divs → {totals['sections']} kept "
+        f"(dropped: {totals['parse_dropped_no_id']} without ID, "
+        f"{totals['parse_dropped_short']} < 80 chars at parse, "
+        f"{totals['normalize_dropped_short']} < 50 chars at normalize)"
+    )
+    print(
+        "⏱️ Stages: " + ", ".join(f"{k} {v:.2f}s" for k, v in stages.items())
+        + f" | total {report['elapsed_seconds']:.2f}s"
+    )
+    if totals["files_without_chunks"]:
+        print(f"⚠️ {totals['files_without_chunks']} files produced no chunks")
+
+    print("🐢 Slowest files:")
+    for f in sorted(file_reports, key=lambda f: f["total_seconds"], reverse=True)[:SLOWEST_FILES_SHOWN]:
+        print(
+            f"   {f['file']}: {f['total_seconds']:.3f}s "
+            f"(parse {f['parse_seconds']:.3f}s, {f['parse']['bytes_read'] / 1024:.0f} KiB, "
+            f"{f['chunks']} chunks)"
+        )
+
     print(f"📁 Output file: {OUTPUT_CHUNKS}")
+    print(f"🗂️ Chunk store: {CHUNK_STORE_DIR}")
+    print(f"📊 Build report: {BUILD_REPORT_PATH}")
     print("=" * 60)
 
 
@@ -0,0 +1,184 @@
+# src/embeddings/query_embedding.py
+
+import argparse
+import logging
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Tuple
+
+import numpy as np
+
+from src.serialization import dumps_json, loads_json
+
+
+# -------------------------------------------------
+# Local Query Embedding
+# -------------------------------------------------
+# Weaviate's text2vec-weaviate module embeds with Snowflake Arctic
+# (create_schema pins EMBEDDING_MODEL); the local retrieval backend
+# must embed queries with the same model so its vectors are
+# comparable with the exported chunk vectors. sentence-transformers
+# is an optional dependency, imported on first use only.
+#
+# The model (torch weights, several hundred MB) is private memory of
+# whichever process loads it. With several uvicorn workers, run it
+# once as a service and point the workers at it, so only the
+# memory-mapped index is repeated across workers:
+#
+#   python -m src.embeddings.query_embedding --port 8765
+#   EMBEDDING_SERVICE_URL=http://127.0.0.1:8765 WEB_CONCURRENCY=4 python api.py
+
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "Snowflake/snowflake-arctic-embed-m-v1.5")
+QUERY_PREFIX = os.getenv(
+    "EMBEDDING_QUERY_PREFIX",
+    "Represent this sentence for searching relevant passages: ",
+)
+
+EMBEDDING_SERVICE_URL = os.getenv("EMBEDDING_SERVICE_URL")
+EMBEDDING_SERVICE_TIMEOUT = float(os.getenv("EMBEDDING_SERVICE_TIMEOUT", "10"))
+
+_model = None
+_model_lock = threading.Lock()
+_sessions = threading.local()
+
+
+def get_embedding_model():
+    global _model
+
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                try:
+                    from sentence_transformers import SentenceTransformer
+                except ImportError as e:
+                    raise RuntimeError(
+                        "sentence-transformers is required for local query embedding."
+                    ) from e
+
+                _model = SentenceTransformer(EMBEDDING_MODEL)
+
+    return _model
+
+
+def embedding_info() -> Tuple[str, int]:
+    """
+    (model name, vector dimension) of whatever embeds queries for
+    this process: the embedding service when configured, else the
+    in-process model.
+    """
+
+    if EMBEDDING_SERVICE_URL:
+        info = _service_call("GET", "/info")
+        return info["model"], int(info["dim"])
+
+    return EMBEDDING_MODEL, int(get_embedding_model().get_sentence_embedding_dimension())
+
+
+def embed_query(text: str) -> np.ndarray:
+    """
+    L2-normalised float32 query vector.
+    """
+    return embed_texts([QUERY_PREFIX + text])[0]
+
+
+def embed_texts(texts: List[str], batch_size: int = 32) -> np.ndarray:
+    """
+    L2-normalised float32 vectors for passages (no query prefix).
+    """
+
+    if EMBEDDING_SERVICE_URL:
+        body = _service_call("POST", "/embed", {"texts": texts, "batch_size": batch_size})
+        return np.asarray(body["vectors"], dtype=np.float32)
+
+    return _encode(texts, batch_size)
+
+
+def _encode(texts: List[str], batch_size: int) -> np.ndarray:
+    vectors = get_embedding_model().encode(
+        texts,
+        batch_size=batch_size,
+        normalize_embeddings=True,
+        convert_to_numpy=True,
+    )
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def _service_call(method: str, path: str, payload=None) -> dict:
+    import requests
+
+    session = getattr(_sessions, "session", None)
+    if session is None:
+        session = _sessions.session = requests.Session()
+
+    response = session.request(
+        method,
+        f"{EMBEDDING_SERVICE_URL.rstrip('/')}{path}",
+        data=None if payload is None else dumps_json(payload),
+        headers={"Content-Type": "application/json"},
+        timeout=EMBEDDING_SERVICE_TIMEOUT,
+    )
+    response.raise_for_status()
+    return loads_json(response.content)
+
+
+# -------------------------------------------------
+# Embedding Service (one model shared by all workers)
+# -------------------------------------------------
+
+class _EmbeddingHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != "/info":
+            return self._send(404, {"error": "Not found"})
+
+        model = get_embedding_model()
+        self._send(200, {"model": EMBEDDING_MODEL, "dim": model.get_sentence_embedding_dimension()})
+
+    def do_POST(self):
+        if self.path != "/embed":
+            return self._send(404, {"error": "Not found"})
+
+        try:
+            body = loads_json(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            vectors = _encode(body["texts"], int(body.get("batch_size", 32)))
+        except (ValueError, KeyError, TypeError) as e:
+            return self._send(400, {"error": str(e)})
+        except Exception as e:
+            logging.error(f"Embedding failed: {str(e)}", exc_info=True)
+            return self._send(500, {"error": "Embedding failed"})
+
+        self._send(200, {"vectors": vectors.tolist()})
+
+    def _send(self, status: int, body: dict) -> None:
+        payload = dumps_json(body)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve query embeddings from one shared model.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    # Load before accepting, so the first worker request is not slow
+    dim = get_embedding_model().get_sentence_embedding_dimension()
+    server = ThreadingHTTPServer((args.host, args.port), _EmbeddingHandler)
+    print(f"✅ Embedding service for {EMBEDDING_MODEL} (dim {dim}) on http://{args.host}:{args.port}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
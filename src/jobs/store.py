@@ -0,0 +1,246 @@
+# src/jobs/store.py
+
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from src.serialization import dumps_json, loads_json
+
+
+JOBS_DB_PATH = Path(os.getenv("JOBS_DB_PATH", "data/jobs.sqlite3"))
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+# -------------------------------------------------
+# Durable Job Queue (SQLite)
+# -------------------------------------------------
+# One row per job; the queue is simply the QUEUED rows ordered by
+# available_at. Claiming is a single BEGIN IMMEDIATE transaction, so
+# any number of worker threads or processes can share the file.
+#
+# Every claim gets a fresh lease_token. complete / fail / retry_later
+# only touch the row while it is still RUNNING under that token, so a
+# worker whose job was recovered (lease expired) and claimed again
+# elsewhere cannot overwrite the new run's outcome.
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id            TEXT PRIMARY KEY,
+    status        TEXT NOT NULL,
+    payload       BLOB NOT NULL,
+    result        BLOB,
+    error         TEXT,
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    created_at    REAL NOT NULL,
+    available_at  REAL NOT NULL,
+    started_at    REAL,
+    finished_at   REAL,
+    expires_at    REAL,
+    lease_token   TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, available_at);
+CREATE INDEX IF NOT EXISTS jobs_expiry ON jobs (expires_at);
+"""
+
+
+class JobStore:
+    def __init__(self, path: Path = JOBS_DB_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "lease_token" not in columns:
+                # Queue files created before leases were fenced
+                conn.execute("ALTER TABLE jobs ADD COLUMN lease_token TEXT")
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        One connection per thread (sqlite3 connections are not
+        shareable across threads by default).
+        """
+
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # -------------------------------------------------
+    # Producer Side
+    # -------------------------------------------------
+
+    def enqueue(self, payload: Dict[str, Any]) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+
+        self._connect().execute(
+            "INSERT INTO jobs (id, status, payload, created_at, available_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (job_id, QUEUED, dumps_json(payload), now, now),
+        )
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connect().execute(
+            "SELECT * FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+
+        if row is None:
+            return None
+        if row["expires_at"] is not None and row["expires_at"] < time.time():
+            return None
+
+        return _row_to_job(row)
+
+    def count_queued(self) -> int:
+        return self._connect().execute(
+            "SELECT COUNT(*) FROM jobs WHERE status = ?", (QUEUED,)
+        ).fetchone()[0]
+
+    # -------------------------------------------------
+    # Worker Side
+    # -------------------------------------------------
+
+    def claim_next(self) -> Optional[Dict[str, Any]]:
+        """
+        Atomically move the oldest runnable job to RUNNING under a new
+        lease_token, which the worker passes back when it finishes.
+        """
+
+        conn = self._connect()
+        now = time.time()
+        token = uuid.uuid4().hex
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE status = ? AND available_at <= ? "
+                "ORDER BY available_at LIMIT 1",
+                (QUEUED, now),
+            ).fetchone()
+
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+
+            conn.execute(
+                "UPDATE jobs SET status = ?, started_at = ?, attempts = attempts + 1, "
+                "lease_token = ? WHERE id = ?",
+                (RUNNING, now, token, row["id"]),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        job = _row_to_job(row)
+        job.update(status=RUNNING, started_at=now, attempts=row["attempts"] + 1, lease_token=token)
+        job["payload"] = loads_json(row["payload"])
+        return job
+
+    # The three calls below return False when the lease was lost (the
+    # job was recovered and possibly claimed again); nothing is written.
+
+    def complete(self, job_id: str, lease_token: str, result: Dict[str, Any], ttl_seconds: float) -> bool:
+        now = time.time()
+        return self._connect().execute(
+            "UPDATE jobs SET status = ?, result = ?, error = NULL, finished_at = ?, expires_at = ?, "
+            "lease_token = NULL WHERE id = ? AND status = ? AND lease_token = ?",
+            (SUCCEEDED, dumps_json(result), now, now + ttl_seconds, job_id, RUNNING, lease_token),
+        ).rowcount == 1
+
+    def fail(self, job_id: str, lease_token: str, error: str, ttl_seconds: float) -> bool:
+        now = time.time()
+        return self._connect().execute(
+            "UPDATE jobs SET status = ?, error = ?, finished_at = ?, expires_at = ?, "
+            "lease_token = NULL WHERE id = ? AND status = ? AND lease_token = ?",
+            (FAILED, error, now, now + ttl_seconds, job_id, RUNNING, lease_token),
+        ).rowcount == 1
+
+    def retry_later(self, job_id: str, lease_token: str, delay_seconds: float, error: str) -> bool:
+        """
+        Put a RUNNING job back in the queue, not runnable before
+        `delay_seconds` from now.
+        """
+
+        return self._connect().execute(
+            "UPDATE jobs SET status = ?, available_at = ?, error = ?, started_at = NULL, "
+            "lease_token = NULL WHERE id = ? AND status = ? AND lease_token = ?",
+            (QUEUED, time.time() + delay_seconds, error, job_id, RUNNING, lease_token),
+        ).rowcount == 1
+
+    # -------------------------------------------------
+    # Maintenance
+    # -------------------------------------------------
+
+    def recover_running(
+        self,
+        max_attempts: int,
+        ttl_seconds: float,
+        lease_seconds: float,
+    ) -> Dict[str, int]:
+        """
+        RUNNING rows older than `lease_seconds` belong to a worker that
+        crashed or was restarted (a live one finishes well within the
+        lease): requeue them, or fail those out of attempts.
+        """
+
+        conn = self._connect()
+        now = time.time()
+        stale = now - lease_seconds
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            failed = conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ?, expires_at = ?, "
+                "lease_token = NULL WHERE status = ? AND started_at < ? AND attempts >= ?",
+                (FAILED, "Interrupted too many times", now, now + ttl_seconds, RUNNING, stale, max_attempts),
+            ).rowcount
+            requeued = conn.execute(
+                "UPDATE jobs SET status = ?, available_at = ?, started_at = NULL, "
+                "lease_token = NULL WHERE status = ? AND started_at < ?",
+                (QUEUED, now, RUNNING, stale),
+            ).rowcount
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        return {"requeued": requeued, "failed": failed}
+
+    def purge_expired(self) -> int:
+        return self._connect().execute(
+            "DELETE FROM jobs WHERE expires_at IS NOT NULL AND expires_at < ?",
+            (time.time(),),
+        ).rowcount
+
+
+def _row_to_job(row: sqlite3.Row) -> Dict[str, Any]:
+    job = {
+        "id": row["id"],
+        "status": row["status"],
+        "attempts": row["attempts"],
+        "created_at": row["created_at"],
+        "started_at": row["started_at"],
+        "finished_at": row["finished_at"],
+        "expires_at": row["expires_at"],
+    }
+    if row["result"] is not None:
+        job["result"] = loads_json(row["result"])
+    if row["error"] is not None:
+        job["error"] = row["error"]
+    return job
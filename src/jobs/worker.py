@@ -0,0 +1,224 @@
+# src/jobs/worker.py
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from src.jobs.store import JobStore
+from src.observability.metrics import STAGE_LATENCY, ERRORS, JOBS_PROCESSED
+from src.resilience.circuit_breaker import CircuitOpenError
+
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "1.0"))
+JOB_RESULT_TTL_SECONDS = float(os.getenv("JOB_RESULT_TTL_SECONDS", "86400"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+# Longer than any single analysis can run (LLM timeout x retries)
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "300"))
+JOB_MAINTENANCE_SECONDS = 60.0
+# Delay before retrying an analysis that came back as an LLM error or
+# incomplete; doubles with each attempt
+JOB_RETRY_BACKOFF_SECONDS = float(os.getenv("JOB_RETRY_BACKOFF_SECONDS", "15"))
+
+# analyze_application statuses worth another attempt. "error" is a
+# failed LLM call; "degraded" / "partial" are reports missing the LLM
+# analysis for all or some classes, kept only from the last attempt.
+_RETRYABLE_STATUSES = ("error", "degraded", "partial")
+
+
+def run_analysis_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Default job handler: payload is a TrademarkRequest body.
+    """
+
+    from src.models.schema import TrademarkApplicationData
+    from src.rag.pipeline import analyze_application
+
+    return analyze_application(
+        TrademarkApplicationData.model_validate(payload["data"]),
+        doc_version=payload["doc_version"],
+        per_class=payload.get("per_class", False),
+    )
+
+
+# -------------------------------------------------
+# Worker Pool
+# -------------------------------------------------
+
+class JobWorkerPool:
+    """
+    Fixed number of threads draining the JobStore queue. The pool
+    size is the analysis rate limit, independent of web traffic.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        handler: Callable[[Dict[str, Any]], Dict[str, Any]] = run_analysis_job,
+        workers: int = JOB_WORKERS,
+        poll_seconds: float = JOB_POLL_SECONDS,
+    ):
+        self.store = store
+        self.handler = handler
+        self.workers = workers
+        self.poll_seconds = poll_seconds
+
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._last_maintenance = 0.0
+        self._maintenance_lock = threading.Lock()
+
+    def start(self) -> None:
+        if self._threads:
+            return
+
+        self._stop.clear()
+        self._maintain(force=True)
+
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+        logging.info(f"Job worker pool started with {self.workers} workers")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop claiming jobs; running jobs finish (or are recovered on
+        the next start if the process exits first).
+        """
+
+        self._stop.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def notify(self) -> None:
+        """
+        Wake an idle worker now instead of at the next poll.
+        """
+        self._wakeup.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._maintain()
+
+            try:
+                job = self.store.claim_next()
+            except Exception as e:
+                logging.error(f"Job claim failed: {str(e)}", exc_info=True)
+                job = None
+
+            if job is None:
+                self._wakeup.wait(self.poll_seconds)
+                self._wakeup.clear()
+                continue
+
+            self._process(job)
+
+    def _process(self, job: Dict[str, Any]) -> None:
+        job_id = job["id"]
+        token = job["lease_token"]
+        retries_left = job["attempts"] < JOB_MAX_ATTEMPTS
+
+        try:
+            with STAGE_LATENCY.time(stage="job"):
+                result = self.handler(job["payload"])
+
+        except CircuitOpenError as e:
+            # Dependency down: wait out the breaker instead of burning attempts
+            if retries_left:
+                self._finish(job, "retried", self.store.retry_later(job_id, token, e.retry_after, str(e)))
+            else:
+                self._finish(job, "failed", self.store.fail(job_id, token, str(e), JOB_RESULT_TTL_SECONDS))
+            return
+
+        except Exception as e:
+            logging.error(f"Job {job_id} failed: {str(e)}", exc_info=True)
+            ERRORS.inc(stage="job", type=type(e).__name__)
+            error = str(e) if isinstance(e, ValueError) else "Internal server error"
+            self._finish(job, "failed", self.store.fail(job_id, token, error, JOB_RESULT_TTL_SECONDS))
+            return
+
+        status = result.get("status")
+
+        if status in _RETRYABLE_STATUSES and retries_left:
+            delay = JOB_RETRY_BACKOFF_SECONDS * 2 ** (job["attempts"] - 1)
+            logging.warning(f"Job {job_id} attempt {job['attempts']} returned {status}; retrying in {delay:.0f}s")
+            self._finish(job, "retried", self.store.retry_later(job_id, token, delay, f"Analysis {status}"))
+        elif status == "error":
+            self._finish(job, "failed", self.store.fail(job_id, token, result["analysis"], JOB_RESULT_TTL_SECONDS))
+        elif status in _RETRYABLE_STATUSES:
+            # Out of attempts: an incomplete report beats none
+            self._finish(job, status, self.store.complete(job_id, token, result, JOB_RESULT_TTL_SECONDS))
+        else:
+            self._finish(job, "succeeded", self.store.complete(job_id, token, result, JOB_RESULT_TTL_SECONDS))
+
+    def _finish(self, job: Dict[str, Any], outcome: str, recorded: bool) -> None:
+        """
+        Count the outcome, or a lost lease when the store refused the
+        update (the job outlived JOB_LEASE_SECONDS and was recovered;
+        whatever run holds it now owns the result).
+        """
+
+        if not recorded:
+            logging.warning(
+                f"Job {job['id']} lease lost after {time.time() - job['started_at']:.0f}s; "
+                f"{outcome} outcome discarded"
+            )
+            outcome = "lease_lost"
+        JOBS_PROCESSED.inc(outcome=outcome)
+
+    def _maintain(self, force: bool = False) -> None:
+        """
+        Recover jobs orphaned by dead workers and purge expired
+        results; at most once per JOB_MAINTENANCE_SECONDS per pool.
+        """
+
+        now = time.monotonic()
+        if not force and now - self._last_maintenance < JOB_MAINTENANCE_SECONDS:
+            return
+        if not self._maintenance_lock.acquire(blocking=False):
+            return
+
+        try:
+            self._last_maintenance = now
+            recovered = self.store.recover_running(
+                max_attempts=JOB_MAX_ATTEMPTS,
+                ttl_seconds=JOB_RESULT_TTL_SECONDS,
+                lease_seconds=JOB_LEASE_SECONDS,
+            )
+            purged = self.store.purge_expired()
+
+            if recovered["requeued"] or recovered["failed"] or purged:
+                logging.info(
+                    f"Job maintenance: requeued {recovered['requeued']}, "
+                    f"failed {recovered['failed']}, purged {purged}"
+                )
+        except Exception as e:
+            logging.error(f"Job maintenance failed: {str(e)}", exc_info=True)
+        finally:
+            self._maintenance_lock.release()
+
+
+# -------------------------------------------------
+# Standalone Worker Process
+# -------------------------------------------------
+# Run analyses outside the web process (set JOB_WORKERS=0 for the app;
+# required when it runs with WEB_CONCURRENCY > 1):
+#     python -m src.jobs.worker
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    pool = JobWorkerPool(JobStore(), workers=max(1, JOB_WORKERS))
+    pool.start()
+
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pool.stop()
@@ -0,0 +1,105 @@
+# src/models/schema.py
+
+from typing import List, Optional
+from typing_extensions import TypedDict
+from pydantic import BaseModel, ConfigDict, with_config
+from pydantic.dataclasses import dataclass
+
+
+# -------------------------------------------------
+# Trademark Application Request Schema
+# -------------------------------------------------
+# Mirrors the structured data object described in the system prompt.
+# Required keys stay required (a missing key is a 422, not a 500);
+# values that may legitimately be empty are Optional.
+#
+# No sub-object is a BaseModel: model instances are what made typed
+# validation slower than the old untyped dict. Sections only read
+# once by TrademarkApplication.from_schema are validated TypedDicts
+# (plain dicts); sections the application keeps and callers read by
+# attribute are frozen, slotted pydantic dataclasses.
+#
+# Numbers are accepted where strings are expected ("class_id": 30,
+# "serial_number": 97123456), as they were with the untyped payload.
+
+_CONFIG = ConfigDict(extra="ignore", coerce_numbers_to_str=True)
+
+
+class _Schema(BaseModel):
+    model_config = ConfigDict(frozen=True, **_CONFIG)
+
+
+@with_config(_CONFIG)
+class MarkInfo(TypedDict):
+    literal: Optional[str]
+    type: str
+    register: str
+
+
+@with_config(_CONFIG)
+class FilingBasis(TypedDict):
+    basis_type: str
+    use_in_commerce: bool
+
+
+@with_config(_CONFIG)
+class GoodsAndServices(TypedDict):
+    class_id: str
+    description: str
+
+
+@with_config(_CONFIG)
+class Owner(TypedDict):
+    name: str
+    entity: str
+    citizenship: str
+
+
+@with_config(_CONFIG)
+class Identifiers(TypedDict):
+    serial_number: Optional[str]
+    registration_number: Optional[str]
+
+
+@dataclass(frozen=True, slots=True, config=_CONFIG)
+class Dates:
+    filing_date: Optional[str] = None
+    first_use: Optional[str] = None
+    first_use_in_commerce: Optional[str] = None
+
+
+
+@dataclass(frozen=True, slots=True, config=_CONFIG)
+class MarkFeatures:
+    is_standard_character: Optional[bool] = None
+    is_design_mark: Optional[bool] = None
+    contains_color_claim: Optional[bool] = None
+    translation_statement: Optional[str] = None
+    transliteration_statement: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True, config=_CONFIG)
+class Disclaimer:
+    present: bool = False
+    text: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True, config=_CONFIG)
+class Specimen:
+    provided: bool = False
+    description: Optional[str] = None
+    type: Optional[str] = None
+
+
+class TrademarkApplicationData(_Schema):
+    mark_info: MarkInfo
+    filing_basis: FilingBasis
+    goods_and_services: List[GoodsAndServices]
+    owner: Owner
+    identifiers: Identifiers
+
+    dates: Optional[Dates] = None
+    mark_features: Optional[MarkFeatures] = None
+    disclaimer: Optional[Disclaimer] = None
+    specimen: Optional[Specimen] = None
+    claimed_prior_registrations: List[str] = []
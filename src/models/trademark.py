@@ -1,31 +1,79 @@
 # src/models/trademark.py
 
-from typing import Dict, List
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
 
+from src.models.schema import (
+    TrademarkApplicationData,
+    Dates,
+    MarkFeatures,
+    Disclaimer,
+    Specimen,
+)
 
+
+@dataclass(slots=True)
 class TrademarkApplication:
-    def __init__(self, data: Dict):
+    mark: Optional[str]
+    mark_type: str
+    register: str
+
+    filing_basis: str
+    use_in_commerce: bool
+
+    goods_map: Dict[str, str]
+
+    owner_name: str
+    owner_entity: str
+    owner_citizenship: str
+
+    serial_number: Optional[str]
+    registration_number: Optional[str]
+
+    dates: Optional[Dates]
+    specimen: Optional[Specimen]
+    disclaimer: Optional[Disclaimer]
+    mark_features: Optional[MarkFeatures]
+    claimed_prior_registrations: Tuple[str, ...]
+
+    @classmethod
+    def from_schema(cls, data: TrademarkApplicationData) -> "TrademarkApplication":
+        """
+        Build straight from an already-validated request schema.
+        """
+
+        return cls(
+            mark=data.mark_info["literal"],
+            mark_type=data.mark_info["type"],
+            register=data.mark_info["register"],
+
+            filing_basis=data.filing_basis["basis_type"],
+            use_in_commerce=data.filing_basis["use_in_commerce"],
 
-        self.mark = data["mark_info"]["literal"]
-        self.mark_type = data["mark_info"]["type"]
-        self.register = data["mark_info"]["register"]
+            goods_map={
+                g["class_id"]: g["description"]
+                for g in data.goods_and_services
+            },
 
-        self.filing_basis = data["filing_basis"]["basis_type"]
-        self.use_in_commerce = data["filing_basis"]["use_in_commerce"]
+            owner_name=data.owner["name"],
+            owner_entity=data.owner["entity"],
+            owner_citizenship=data.owner["citizenship"],
 
-        self.goods_map = {
-            g["class_id"]: g["description"]
-            for g in data["goods_and_services"]
-        }
+            serial_number=data.identifiers["serial_number"],
+            registration_number=data.identifiers["registration_number"],
 
-        self.owner_name = data["owner"]["name"]
-        self.owner_entity = data["owner"]["entity"]
-        self.owner_citizenship = data["owner"]["citizenship"]
+            dates=data.dates,
+            specimen=data.specimen,
+            disclaimer=data.disclaimer,
+            mark_features=data.mark_features,
+            claimed_prior_registrations=tuple(data.claimed_prior_registrations),
+        )
 
-        self.serial_number = data["identifiers"]["serial_number"]
-        self.registration_number = data["identifiers"]["registration_number"]
+    @classmethod
+    def from_dict(cls, data: Dict) -> "TrademarkApplication":
+        """
+        Validate a raw payload and build the application.
+        Raises pydantic.ValidationError on malformed input.
+        """
 
-        self.specimen = data.get("specimen", {})
-        self.disclaimer = data.get("disclaimer", {})
-        self.mark_features = data.get("mark_features", {})
-        self.claimed_prior_registrations = data.get("claimed_prior_registrations", [])
+        return cls.from_schema(TrademarkApplicationData.model_validate(data))
@@ -0,0 +1,274 @@
+# src/observability/metrics.py
+
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, List, Sequence, Tuple
+
+
+# -------------------------------------------------
+# Minimal Prometheus-compatible metric types
+# -------------------------------------------------
+# Recording is a dict lookup plus an in-place increment under a
+# per-metric lock; all aggregation (cumulative buckets, formatting)
+# is deferred to render(), which only runs on a /metrics scrape.
+
+DEFAULT_LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+
+def _escape(value: str) -> str:
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\n", "\\n")
+        .replace('"', '\\"')
+    )
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}"
+            for key, v in items
+        ]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    @contextmanager
+    def track_inprogress(self, **labels):
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}"
+            for key, v in items
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            state[idx] += 1
+            state[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(state)) for key, state in self._values.items()]
+
+        lines = []
+        for key, state in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (math.inf,), state[:-1]):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} "
+                    f"{_format_value(cumulative)}"
+                )
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(state[-1])}")
+            lines.append(f"{self.name}_count{labels} {_format_value(cumulative)}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# -------------------------------------------------
+# Application Metrics
+# -------------------------------------------------
+
+REGISTRY = Registry()
+
+STAGE_LATENCY = REGISTRY.register(Histogram(
+    "tmep_stage_latency_seconds",
+    "Latency of each analysis pipeline stage.",
+    labelnames=("stage",),
+))
+
+REQUEST_LATENCY = REGISTRY.register(Histogram(
+    "tmep_request_latency_seconds",
+    "End-to-end latency of analysis endpoints.",
+    labelnames=("endpoint",),
+))
+
+REQUESTS_IN_FLIGHT = REGISTRY.register(Gauge(
+    "tmep_requests_in_flight",
+    "Analysis requests currently being processed.",
+    labelnames=("endpoint",),
+))
+
+RETRIEVAL_SIMILARITY = REGISTRY.register(Histogram(
+    "tmep_retrieval_similarity",
+    "Similarity scores of chunks returned by vector search.",
+    buckets=(0.5, 0.6, 0.7, 0.75, 0.8, 0.85, 0.9, 0.95, 1.0),
+))
+
+LLM_TOKENS = REGISTRY.register(Counter(
+    "tmep_llm_tokens_total",
+    "LLM tokens consumed, by kind (prompt/completion).",
+    labelnames=("kind",),
+))
+
+LLM_FAILURES = REGISTRY.register(Counter(
+    "tmep_llm_failures_total",
+    "Failed LLM calls, by reason (timeout/provider_error).",
+    labelnames=("reason",),
+))
+
+ERRORS = REGISTRY.register(Counter(
+    "tmep_errors_total",
+    "Errors raised while serving requests, by stage and exception type.",
+    labelnames=("stage", "type"),
+))
+
+CIRCUIT_STATE = REGISTRY.register(Gauge(
+    "tmep_circuit_state",
+    "Circuit breaker state per dependency (0=closed, 1=half-open, 2=open).",
+    labelnames=("breaker",),
+))
+
+CIRCUIT_REJECTIONS = REGISTRY.register(Counter(
+    "tmep_circuit_rejections_total",
+    "Calls rejected without an attempt because a breaker was open.",
+    labelnames=("breaker",),
+))
+
+ADMISSION_QUEUE_DEPTH = REGISTRY.register(Gauge(
+    "tmep_admission_queue_depth",
+    "Requests waiting for an admission slot.",
+    labelnames=("endpoint",),
+))
+
+ADMISSION_REJECTIONS = REGISTRY.register(Counter(
+    "tmep_admission_rejections_total",
+    "Requests shed by admission control, by reason (queue_full/deadline/disconnected).",
+    labelnames=("endpoint", "reason"),
+))
+
+ADMISSION_WAIT = REGISTRY.register(Histogram(
+    "tmep_admission_wait_seconds",
+    "Time admitted requests spent queued for a slot.",
+    labelnames=("endpoint",),
+))
+
+JOBS_PROCESSED = REGISTRY.register(Counter(
+    "tmep_jobs_processed_total",
+    "Async analysis jobs finished by workers, by outcome (succeeded/failed/retried/degraded/partial/lease_lost).",
+    labelnames=("outcome",),
+))
@@ -0,0 +1,226 @@
+# src/observability/profiling.py
+
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Dict, List, Optional
+
+
+# -------------------------------------------------
+# Sampling Profiler (collapsed-stack output)
+# -------------------------------------------------
+# A daemon thread snapshots every thread's stack via
+# sys._current_frames() at a fixed interval. Nothing is hooked into
+# the interpreter, so overhead is bounded by the sampling rate and is
+# zero while no session is active.
+
+DEFAULT_INTERVAL = 0.005
+# Below this the sampler spends its time walking stacks, not sleeping
+MIN_INTERVAL = 0.001
+MAX_DURATION = 300.0
+
+
+class SamplingProfiler:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._stacks: Counter = Counter()
+        self._samples = 0
+        self._remaining_requests: Optional[int] = None
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self._deadline: Optional[float] = None
+
+    # Checked once per request by the middleware; a plain attribute
+    # read when profiling is off.
+    @property
+    def active(self) -> bool:
+        return self._thread is not None
+
+    def start(
+        self,
+        seconds: Optional[float] = None,
+        requests: Optional[int] = None,
+        interval: float = DEFAULT_INTERVAL,
+    ) -> None:
+        """
+        Profile for the next `seconds`, or until `requests` requests
+        have completed, whichever comes first.
+        """
+
+        if not seconds and not requests:
+            raise ValueError("Provide seconds and/or requests.")
+        if (seconds is not None and seconds <= 0) or (requests is not None and requests <= 0):
+            raise ValueError("seconds and requests must be positive.")
+        if not interval >= MIN_INTERVAL:
+            raise ValueError(f"interval must be at least {MIN_INTERVAL * 1000:g} ms.")
+
+        with self._lock:
+            if self._thread is not None:
+                raise RuntimeError("A profiling session is already running.")
+
+            self._stacks = Counter()
+            self._samples = 0
+            self._remaining_requests = requests
+            self._started_at = time.time()
+            self._finished_at = None
+            self._deadline = time.monotonic() + min(seconds or MAX_DURATION, MAX_DURATION)
+            self._stop.clear()
+
+            self._thread = threading.Thread(
+                target=self._run,
+                args=(interval,),
+                name="sampling-profiler",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def request_finished(self) -> None:
+        with self._lock:
+            if self._remaining_requests is None:
+                return
+            self._remaining_requests -= 1
+            if self._remaining_requests > 0:
+                return
+        self._stop.set()
+
+    def status(self) -> Dict:
+        return {
+            "active": self.active,
+            "samples": self._samples,
+            "started_at": self._started_at,
+            "finished_at": self._finished_at,
+            "remaining_requests": self._remaining_requests,
+        }
+
+    def collapsed(self) -> str:
+        """
+        Brendan Gregg collapsed-stack format, one "f1;f2;f3 count"
+        line per unique stack (input for flamegraph.pl / speedscope).
+        """
+
+        with self._lock:
+            items = sorted(self._stacks.items())
+        return "".join(f"{stack} {count}\n" for stack, count in items)
+
+    def _run(self, interval: float) -> None:
+        own_ident = threading.get_ident()
+
+        try:
+            while not self._stop.is_set() and time.monotonic() < self._deadline:
+                frames = sys._current_frames()
+                sampled: List[str] = []
+
+                for ident, frame in frames.items():
+                    if ident == own_ident:
+                        continue
+                    sampled.append(_collapse(frame))
+
+                with self._lock:
+                    self._stacks.update(sampled)
+                    self._samples += 1
+
+                self._stop.wait(interval)
+        finally:
+            with self._lock:
+                self._thread = None
+                self._finished_at = time.time()
+
+
+def _collapse(frame) -> str:
+    parts = []
+    while frame is not None:
+        code = frame.f_code
+        parts.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+        frame = frame.f_back
+    parts.reverse()
+    return ";".join(parts)
+
+
+# -------------------------------------------------
+# tracemalloc Snapshot / Diff
+# -------------------------------------------------
+
+class AllocationTracker:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = 10) -> None:
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(frames)
+            self._baseline = _take_snapshot()
+
+    def stop(self) -> None:
+        with self._lock:
+            self._baseline = None
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+
+    def snapshot(self, limit: int = 25, key_type: str = "lineno", diff: bool = True) -> Dict:
+        """
+        Top allocation sites, either absolute or as growth since the
+        previous snapshot (which becomes the new baseline).
+        """
+
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                raise RuntimeError("tracemalloc is not running.")
+
+            snapshot = _take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+
+            if diff and self._baseline is not None:
+                stats = [
+                    {
+                        "location": str(stat.traceback),
+                        "size_diff": stat.size_diff,
+                        "size": stat.size,
+                        "count_diff": stat.count_diff,
+                        "count": stat.count,
+                    }
+                    for stat in snapshot.compare_to(self._baseline, key_type)[:limit]
+                ]
+            else:
+                stats = [
+                    {
+                        "location": str(stat.traceback),
+                        "size": stat.size,
+                        "count": stat.count,
+                    }
+                    for stat in snapshot.statistics(key_type)[:limit]
+                ]
+
+            self._baseline = snapshot
+
+        return {
+            "traced_current_bytes": current,
+            "traced_peak_bytes": peak,
+            "mode": "diff" if diff else "absolute",
+            "stats": stats,
+        }
+
+
+def _take_snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    ))
+
+
+PROFILER = SamplingProfiler()
+ALLOCATIONS = AllocationTracker()
@@ -8,7 +8,7 @@ SECTION_ID_RE = re.compile(
 )
 
 
-def parse_tmep_html(html_path: Path) -> list[dict]:
+def parse_tmep_html(html_path: Path, stats: dict | None = None) -> list[dict]:
     """
     Parse TMEP HTML into ATOMIC legal units.
 
@@ -16,23 +16,38 @@ def parse_tmep_html(html_path: Path) -> list[dict]:
     - TMEP subsection (e.g. 301.01(a))
     - CFR block
     - USC block
+
+    If `stats` is given it is filled with bytes_read, section_divs,
+    dropped_no_id, dropped_short and sections counts.
     """
 
     if not html_path.exists():
         raise FileNotFoundError(f"TMEP HTML file not found: {html_path}")
 
-    soup = BeautifulSoup(html_path.read_text(encoding="utf-8"), "html.parser")
+    raw = html_path.read_bytes()
+    soup = BeautifulSoup(raw.decode("utf-8"), "html.parser")
     sections: list[dict] = []
 
+    counts = {"bytes_read": len(raw), "section_divs": 0, "dropped_no_id": 0, "dropped_short": 0}
+
+    # Hierarchy of every identified Section div, keyed by id(div).
+    # find_all walks the document in order, so ancestors come first.
+    hierarchy: dict[int, tuple[str, int]] = {}
+
     # Iterate ALL Section divs (do NOT skip nested ones)
     for section_div in soup.find_all("div", class_="Section"):
+        counts["section_divs"] += 1
         heading = _extract_heading(section_div)
         section_id, title = _split_heading(heading)
 
         # Skip structural wrappers without IDs
         if not section_id:
+            counts["dropped_no_id"] += 1
             continue
 
+        parent_id, depth = _find_parent(section_div, hierarchy)
+        hierarchy[id(section_div)] = (section_id, depth)
+
         text_parts: list[str] = []
 
         for el in section_div.find_all(
@@ -45,17 +60,36 @@ def parse_tmep_html(html_path: Path) -> list[dict]:
         full_text = "\n".join(text_parts).strip()
 
         if len(full_text) < 80:
+            counts["dropped_short"] += 1
             continue
 
         sections.append({
             "section_id": section_id,
             "section_title": title,
             "full_text": full_text,
+            "parent_id": parent_id,
+            "depth": depth,
         })
 
+    if stats is not None:
+        counts["sections"] = len(sections)
+        stats.update(counts)
+
     return sections
 
 
+def _find_parent(section_div, hierarchy: dict[int, tuple[str, int]]) -> tuple[str | None, int]:
+    """
+    Nearest enclosing Section div with a section ID -> (parent_id, depth).
+    Top-level sections have depth 0.
+    """
+    for ancestor in section_div.find_parents("div", class_="Section"):
+        known = hierarchy.get(id(ancestor))
+        if known:
+            return known[0], known[1] + 1
+    return None, 0
+
+
 def _extract_heading(section_div) -> str:
     headings = section_div.find_all("h1", class_="page-title")
     if headings:
@@ -54,9 +54,10 @@
 #         json.dump(chunks, f, indent=2, ensure_ascii=False)
 
 from pathlib import Path
-import json
 from typing import List, Dict
 
+from src.serialization import write_artifact
+
 
 def chunk_sections(sections: List[Dict], source_file: str) -> List[Dict]:
     """
@@ -92,6 +93,8 @@ def chunk_sections(sections: List[Dict], source_file: str) -> List[Dict]:
             "section_id": sid,
             "section_title": section["section_title"],
             "section_path": section["section_path"],
+            "parent_id": section.get("parent_id"),
+            "depth": section.get("depth", 0),
 
             "chunk_text": text,
 
@@ -105,8 +108,4 @@ def chunk_sections(sections: List[Dict], source_file: str) -> List[Dict]:
 
 
 def save_chunks(chunks: List[Dict], output_path: Path) -> None:
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(
-        json.dumps(chunks, indent=2, ensure_ascii=False),
-        encoding="utf-8"
-    )
+    write_artifact(chunks, output_path)
@@ -0,0 +1,219 @@
+# src/processing/chunk_store.py
+
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from src.processing.section_tree import SectionTree, write_section_tree
+from src.serialization import (
+    StringArena,
+    read_artifact,
+    write_artifact,
+    write_string_arena,
+)
+
+
+CHUNK_STORE_DIR = Path(
+    os.getenv("TMEP_CHUNK_STORE_DIR", "data/chunks/tmep_chunk_store")
+)
+CHUNK_STORE_FORMAT = 2
+
+# Unique (or nearly unique) per chunk: one UTF-8 arena each
+TEXT_FIELDS = (
+    "chunk_id", "section_id", "section_title", "section_path",
+    "parent_id", "chunk_text",
+)
+
+# A handful of distinct values repeated across every chunk:
+# stored once in the manifest, one small integer code per chunk
+CODED_FIELDS = ("source", "doc_version", "source_file")
+
+CHUNK_FIELDS = TEXT_FIELDS + CODED_FIELDS + ("order", "depth")
+
+
+# -------------------------------------------------
+# Compact Chunk Store
+# -------------------------------------------------
+# Same content as the chunk artifact, laid out for memory-mapping
+# instead of one Python dict per chunk:
+#
+#   manifest.json                 count, vocabularies of coded fields
+#   <text field>.bin/.offsets.npy UTF-8 string arena per text field
+#   <coded field>.codes.npy       uint16 [N], index into the vocabulary
+#   order.npy                     int32 [N]
+#   depth.npy                     uint8 [N], section nesting depth
+#   section_tree.json             section hierarchy (section_tree.py)
+#
+# Opening the store maps the files; nothing is decoded until a field
+# of a chunk is actually read.
+
+
+def write_chunk_store(chunks: Sequence[Dict], output_dir: Path = CHUNK_STORE_DIR) -> Path:
+    """
+    Write the store files, then swap the directory into place so
+    readers never see a half-written store.
+    """
+
+    output_dir = Path(output_dir)
+    staging = output_dir.with_name(output_dir.name + ".tmp")
+    if staging.exists():
+        shutil.rmtree(staging)
+    staging.mkdir(parents=True)
+
+    for field in TEXT_FIELDS:
+        write_string_arena((c.get(field) or "" for c in chunks), staging / field)
+
+    vocabularies: Dict[str, List[str]] = {}
+    for field in CODED_FIELDS:
+        values = [c.get(field) or "" for c in chunks]
+        vocabulary = sorted(set(values))
+        if len(vocabulary) > np.iinfo(np.uint16).max:
+            raise ValueError(f"Too many distinct values for coded field: {field}")
+
+        code = {v: i for i, v in enumerate(vocabulary)}
+        np.save(
+            staging / f"{field}.codes.npy",
+            np.asarray([code[v] for v in values], dtype=np.uint16),
+        )
+        vocabularies[field] = vocabulary
+
+    np.save(
+        staging / "order.npy",
+        np.asarray([c.get("order", -1) for c in chunks], dtype=np.int32),
+    )
+    np.save(
+        staging / "depth.npy",
+        np.asarray([c.get("depth") or 0 for c in chunks], dtype=np.uint8),
+    )
+    write_section_tree(chunks, staging / "section_tree.json")
+
+    write_artifact({
+        "format": CHUNK_STORE_FORMAT,
+        "count": len(chunks),
+        "vocabularies": vocabularies,
+    }, staging / "manifest.json")
+
+    previous = output_dir.with_name(output_dir.name + ".old")
+    if output_dir.exists():
+        if previous.exists():
+            shutil.rmtree(previous)
+        output_dir.rename(previous)
+    staging.rename(output_dir)
+    if previous.exists():
+        shutil.rmtree(previous)
+
+    return output_dir
+
+
+class ChunkStore:
+    """
+    Read-only, memory-mapped sequence of ChunkView.
+    """
+
+    def __init__(self, store_dir: Path = CHUNK_STORE_DIR):
+        store_dir = Path(store_dir)
+        self.store_dir = store_dir
+        self.manifest = read_artifact(store_dir / "manifest.json")
+
+        if self.manifest.get("format") != CHUNK_STORE_FORMAT:
+            raise RuntimeError(f"Unsupported chunk store format in {store_dir}")
+
+        self._count = self.manifest["count"]
+        self._arenas = {f: StringArena(store_dir / f) for f in TEXT_FIELDS}
+        self._codes = {
+            f: np.load(store_dir / f"{f}.codes.npy", mmap_mode="r")
+            for f in CODED_FIELDS
+        }
+        self._vocabularies = self.manifest["vocabularies"]
+        self._order = np.load(store_dir / "order.npy", mmap_mode="r")
+        self._depth = np.load(store_dir / "depth.npy", mmap_mode="r")
+        self._tree: Optional[SectionTree] = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, row: int) -> "ChunkView":
+        if row < 0:
+            row += self._count
+        if not 0 <= row < self._count:
+            raise IndexError("chunk row out of range")
+        return ChunkView(self, row)
+
+    def __iter__(self) -> Iterator["ChunkView"]:
+        for row in range(self._count):
+            yield ChunkView(self, row)
+
+    @property
+    def section_tree(self) -> SectionTree:
+        if self._tree is None:
+            self._tree = SectionTree.load(self.store_dir / "section_tree.json")
+        return self._tree
+
+    def field(self, row: int, name: str) -> Any:
+        if name == "parent_id":
+            return self._arenas[name][row] or None
+        if name in self._arenas:
+            return self._arenas[name][row]
+        if name in self._codes:
+            return self._vocabularies[name][self._codes[name][row]]
+        if name == "order":
+            return int(self._order[row])
+        if name == "depth":
+            return int(self._depth[row])
+        raise KeyError(name)
+
+    def close(self) -> None:
+        for arena in self._arenas.values():
+            arena.close()
+
+
+class ChunkView:
+    """
+    One chunk, decoded field by field on access. Supports the
+    dict-style reads (chunk["chunk_text"], chunk.get(...)) that
+    existing chunk consumers use.
+    """
+
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: ChunkStore, row: int):
+        self._store = store
+        self._row = row
+
+    def __getitem__(self, name: str) -> Any:
+        return self._store.field(self._row, name)
+
+    def __getattr__(self, name: str) -> Any:
+        if name in CHUNK_FIELDS:
+            return self._store.field(self._row, name)
+        raise AttributeError(name)
+
+    def __repr__(self) -> str:
+        return f"ChunkView(row={self._row}, chunk_id={self['chunk_id']!r})"
+
+    def get(self, name: str, default: Any = None) -> Any:
+        try:
+            return self._store.field(self._row, name)
+        except KeyError:
+            return default
+
+    def keys(self) -> Iterable[str]:
+        return CHUNK_FIELDS
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {f: self._store.field(self._row, f) for f in CHUNK_FIELDS}
+
+
+def read_chunks(path: Path) -> Sequence:
+    """
+    Chunk artifact file (.json / .msgpack) -> list of dicts;
+    chunk store directory -> ChunkStore.
+    """
+
+    path = Path(path)
+    if path.is_dir():
+        return ChunkStore(path)
+    return read_artifact(path)
@@ -1,43 +1,64 @@
+import os
 from pathlib import Path
-import json
 import re
 
+from src.serialization import write_artifact
 
-DOC_VERSION = "TMEP Nov 2025"
+
+# Edition label stamped on every section; set per ingest
+DOC_VERSION = os.getenv("TMEP_DOC_VERSION", "TMEP Nov 2025")
 SOURCE_NAME = "USPTO TMEP"
 
 
 def normalize_sections(
-    sections: list[dict]
+    sections: list[dict],
+    doc_version: str = DOC_VERSION,
+    stats: dict | None = None
 ) -> list[dict]:
     """
     Normalize and validate parsed TMEP sections.
     Returns a clean list of sections ready for chunking.
+
+    If `stats` is given it is filled with dropped_no_id,
+    dropped_short and sections counts.
     """
 
     normalized: list[dict] = []
+    dropped_no_id = 0
+    dropped_short = 0
 
     for idx, section in enumerate(sections):
         section_id = _normalize_section_id(section.get("section_id"))
         if not section_id:
+            dropped_no_id += 1
             continue
         section_title = _normalize_title(section.get("section_title"))
         text = _normalize_text(section.get("full_text"))
 
         # Validation: skip empty or broken sections
         if not text or len(text) < 50:
+            dropped_short += 1
             continue
 
         normalized.append({
             "section_id": section_id,
             "section_title": section_title,
             "section_path": _build_section_path(section_id, section_title),
+            "parent_id": _normalize_section_id(section.get("parent_id")),
+            "depth": section.get("depth", 0),
             "text": text,
             "source": SOURCE_NAME,
-            "doc_version": DOC_VERSION,
+            "doc_version": doc_version,
             "order": idx
         })
 
+    if stats is not None:
+        stats.update(
+            dropped_no_id=dropped_no_id,
+            dropped_short=dropped_short,
+            sections=len(normalized),
+        )
+
     return normalized
 
 
@@ -85,7 +106,4 @@ def save_normalized_sections(
     sections: list[dict],
     output_path: Path
 ) -> None:
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-
-    with output_path.open("w", encoding="utf-8") as f:
-        json.dump(sections, f, indent=2, ensure_ascii=False)
+    write_artifact(sections, output_path)
@@ -0,0 +1,161 @@
+# src/processing/section_tree.py
+
+import re
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from src.serialization import read_artifact, write_artifact
+
+
+SECTION_TREE_FORMAT = 1
+
+# 1207.01(a)(i) -> 1207.01(a) -> 1207.01 -> 1207
+_LAST_LEVEL_RE = re.compile(r"(\([a-z0-9]+\)|\.[0-9]+)$")
+
+
+# -------------------------------------------------
+# Section Hierarchy Index
+# -------------------------------------------------
+# One node per section_id, in document order, with the parent index
+# and the chunk rows (positions in the chunk store) of each section:
+#
+#   {"format", "sections": [...], "parent": [...], "depth": [...],
+#    "rows": [[...], ...]}
+#
+# Children and siblings are derived on load.
+
+
+def citation_parent(section_id: str) -> Optional[str]:
+    """
+    Parent implied by the citation numbering alone.
+    """
+    parent = _LAST_LEVEL_RE.sub("", section_id)
+    return parent if parent and parent != section_id else None
+
+
+def build_section_tree(chunks: Sequence) -> Dict:
+    """
+    Chunks carry the parser's parent_id; when that parent was not
+    emitted as a chunk (too short, or in another file), fall back to
+    the nearest emitted ancestor by citation numbering.
+    """
+
+    index: Dict[str, int] = {}
+    rows: List[List[int]] = []
+    declared: List[Optional[str]] = []
+
+    for row, chunk in enumerate(chunks):
+        sid = chunk["section_id"]
+        if sid not in index:
+            index[sid] = len(rows)
+            rows.append([])
+            declared.append(chunk.get("parent_id"))
+        rows[index[sid]].append(row)
+
+    sections = list(index)
+    parent: List[int] = []
+
+    for sid, pid in zip(sections, declared):
+        candidate = pid if pid in index else citation_parent(sid)
+        while candidate is not None and candidate not in index:
+            candidate = citation_parent(candidate)
+        parent.append(index[candidate] if candidate is not None and candidate != sid else -1)
+
+    # Depth in the emitted tree, not the raw DOM depth
+    depth: List[int] = []
+    for i in range(len(sections)):
+        d, p = 0, parent[i]
+        while p != -1 and d < len(sections):
+            d, p = d + 1, parent[p]
+        depth.append(d)
+
+    return {
+        "format": SECTION_TREE_FORMAT,
+        "sections": sections,
+        "parent": parent,
+        "depth": depth,
+        "rows": rows,
+    }
+
+
+def write_section_tree(chunks: Sequence, output_path: Path) -> None:
+    write_artifact(build_section_tree(chunks), output_path, pretty=False)
+
+
+class SectionTree:
+    def __init__(self, tree: Dict):
+        if tree.get("format") != SECTION_TREE_FORMAT:
+            raise RuntimeError("Unsupported section tree format")
+
+        self._sections: List[str] = tree["sections"]
+        self._parent: List[int] = tree["parent"]
+        self._depth: List[int] = tree["depth"]
+        self._rows: List[List[int]] = tree["rows"]
+        self._index = {sid: i for i, sid in enumerate(self._sections)}
+
+        self._children: List[List[int]] = [[] for _ in self._sections]
+        for i, p in enumerate(self._parent):
+            if p != -1:
+                self._children[p].append(i)
+
+    @classmethod
+    def load(cls, path: Path) -> "SectionTree":
+        return cls(read_artifact(path))
+
+    def __contains__(self, section_id: str) -> bool:
+        return section_id in self._index
+
+    def __len__(self) -> int:
+        return len(self._sections)
+
+    def parent(self, section_id: str) -> Optional[str]:
+        i = self._index.get(section_id)
+        if i is None or self._parent[i] == -1:
+            return None
+        return self._sections[self._parent[i]]
+
+    def ancestors(self, section_id: str) -> List[str]:
+        """
+        Nearest first.
+        """
+        result: List[str] = []
+        parent = self.parent(section_id)
+        while parent is not None and len(result) < len(self._sections):
+            result.append(parent)
+            parent = self.parent(parent)
+        return result
+
+    def children(self, section_id: str) -> List[str]:
+        i = self._index.get(section_id)
+        if i is None:
+            return []
+        return [self._sections[c] for c in self._children[i]]
+
+    def siblings(self, section_id: str) -> List[str]:
+        """
+        Other children of the same parent, nearest in document order first.
+        """
+        i = self._index.get(section_id)
+        if i is None or self._parent[i] == -1:
+            return []
+
+        group = self._children[self._parent[i]]
+        pos = bisect_left(group, i)
+        before, after = group[:pos][::-1], group[pos + 1:]
+
+        ordered: List[int] = []
+        for k in range(max(len(before), len(after))):
+            if k < len(after):
+                ordered.append(after[k])
+            if k < len(before):
+                ordered.append(before[k])
+        return [self._sections[s] for s in ordered]
+
+    def depth(self, section_id: str) -> int:
+        i = self._index.get(section_id)
+        return self._depth[i] if i is not None else 0
+
+    def rows(self, section_id: str) -> List[int]:
+        i = self._index.get(section_id)
+        return list(self._rows[i]) if i is not None else []
@@ -0,0 +1,122 @@
+# src/rag/context_compressor.py
+
+import math
+import os
+import re
+from collections import Counter
+from typing import Dict, List
+
+from src.observability.metrics import STAGE_LATENCY
+
+
+CONTEXT_COMPRESSION = os.getenv("CONTEXT_COMPRESSION", "1") == "1"
+
+# Marks the gap where sentences were left out
+ELISION = " … "
+
+# Split after sentence punctuation when the next sentence starts like
+# one; "e.g." and citations like "§1207.01(a)" are not followed by a
+# capital, so they stay intact
+_SENTENCE_RE = re.compile(r"(?<=[.!?;])\s+(?=[A-Z§(\"“])|\n+")
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+_STOPWORDS = frozenset("""
+a an and are as at be been but by for from has have if in into is it its
+may must no not of on or such that the their then there these this to was
+were which will with within without any all also other than under upon
+""".split())
+
+
+# -------------------------------------------------
+# Query-focused Extractive Compression
+# -------------------------------------------------
+# Instead of the first N characters of every chunk, keep the
+# sentences that best match the query, in document order, within the
+# same per-chunk character budget. Scoring is lexical (IDF-weighted
+# query-term overlap, IDF over the sentences of this prompt's chunks)
+# so it costs about a millisecond per prompt and needs no model.
+
+
+def split_sentences(text: str) -> List[str]:
+    return [s.strip() for s in _SENTENCE_RE.split(text) if s and s.strip()]
+
+
+def _terms(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS and len(t) > 1]
+
+
+def _select(sentences: List[str], scores: List[float], max_chars: int) -> str:
+    """
+    Highest-scoring sentences that fit, re-joined in document order.
+    """
+
+    ranked = sorted(range(len(sentences)), key=lambda i: scores[i], reverse=True)
+    chosen: List[int] = []
+    used = 0
+
+    for i in ranked:
+        if scores[i] <= 0:
+            break
+        cost = len(sentences[i]) + len(ELISION)
+        if used + cost <= max_chars:
+            chosen.append(i)
+            used += cost
+
+    if not chosen:
+        # Best sentence alone exceeds the budget
+        return sentences[ranked[0]][:max_chars]
+
+    chosen.sort()
+    parts = [sentences[chosen[0]]]
+    for prev, i in zip(chosen, chosen[1:]):
+        parts.append((" " if i == prev + 1 else ELISION) + sentences[i])
+
+    text = "".join(parts)
+    return (ELISION.lstrip() + text) if chosen[0] > 0 else text
+
+
+def compress_chunks(chunks: List[Dict], query: str, max_chars: int) -> List[Dict]:
+    """
+    Copies of the chunks whose "text" is cut down to at most
+    max_chars of query-relevant sentences. Chunks that already fit,
+    or share no terms with the query, keep the plain prefix.
+    """
+
+    if not CONTEXT_COMPRESSION or not chunks:
+        return chunks
+
+    with STAGE_LATENCY.time(stage="context_compression"):
+        query_terms = set(_terms(query))
+        split = [
+            split_sentences(c["text"]) if len(c["text"]) > max_chars else None
+            for c in chunks
+        ]
+
+        # Document frequency over every sentence in this prompt
+        sentence_terms = [[set(_terms(s)) for s in sents] if sents else None for sents in split]
+        df: Counter = Counter()
+        n_sentences = 0
+        for terms in sentence_terms:
+            for t in terms or ():
+                df.update(t & query_terms)
+                n_sentences += 1
+
+        idf = {t: math.log(1 + n_sentences / df[t]) for t in df}
+
+        compressed: List[Dict] = []
+        for chunk, sents, terms in zip(chunks, split, sentence_terms):
+            if not sents:
+                compressed.append(chunk)
+                continue
+
+            scores = [
+                sum(idf.get(t, 0.0) for t in sentence) / math.sqrt(len(sentence) + 1)
+                for sentence in terms
+            ]
+            if not any(scores):
+                compressed.append(chunk)
+                continue
+
+            compressed.append({**chunk, "text": _select(sents, scores, max_chars)})
+
+    return compressed
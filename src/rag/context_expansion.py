@@ -0,0 +1,137 @@
+# src/rag/context_expansion.py
+
+import logging
+import os
+import threading
+from typing import Dict, List, Optional
+
+from src.observability.metrics import STAGE_LATENCY
+
+
+CONTEXT_EXPANSION = os.getenv("CONTEXT_EXPANSION", "1") == "1"
+
+# Extra prompt tokens the expansion may add on top of the retrieved hits
+EXPANSION_TOKEN_BUDGET = int(os.getenv("EXPANSION_TOKEN_BUDGET", "400"))
+
+# Rough English average; only used to stay inside the budget
+CHARS_PER_TOKEN = 4
+
+
+# -------------------------------------------------
+# Small-to-big Context Expansion
+# -------------------------------------------------
+# Retrieval hits narrow subsections (1207.01(a)); the rules that
+# govern them often sit in the parent (1207.01). Using the section
+# tree and chunk store built by build_tmep_chunks, each hit is
+# expanded in-process, with no extra vector queries:
+#
+#   1. its ancestors (governing text), nearest first
+#   2. for broad hits, their subsections
+#   3. its siblings, nearest in document order first
+#
+# until EXPANSION_TOKEN_BUDGET is spent. Hits are expanded in rank
+# order, so the best hit gets its context first.
+
+_store = None
+_store_lock = threading.Lock()
+_store_failed = False
+
+
+def _get_store():
+    """
+    The chunk store, opened on first use. None (logged once) when it
+    is not deployed, in which case expansion is a no-op.
+    """
+    global _store, _store_failed
+
+    if _store is None and not _store_failed:
+        with _store_lock:
+            if _store is None and not _store_failed:
+                from src.processing.chunk_store import CHUNK_STORE_DIR, ChunkStore
+
+                try:
+                    _store = ChunkStore(CHUNK_STORE_DIR)
+                    _store.section_tree
+                except Exception as e:
+                    _store_failed = True
+                    logging.warning(f"Context expansion disabled: {str(e)}")
+
+    return _store
+
+
+def _estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def expand_context(
+    chunks: List[Dict],
+    token_budget: int = EXPANSION_TOKEN_BUDGET,
+    max_chunk_chars: Optional[int] = None,
+) -> List[Dict]:
+    """
+    Return the retrieved chunks followed by related-section chunks,
+    each tagged with "relation" (parent / child / sibling) and
+    "expanded_from" (the hit's section_id). max_chunk_chars mirrors
+    the prompt's per-chunk truncation when estimating cost.
+    """
+
+    if not CONTEXT_EXPANSION or not chunks or token_budget <= 0:
+        return chunks
+
+    store = _get_store()
+    if store is None:
+        return chunks
+
+    with STAGE_LATENCY.time(stage="context_expansion"):
+        tree = store.section_tree
+        versions = store.manifest["vocabularies"]["doc_version"]
+
+        seen = {c["section_id"] for c in chunks}
+        expanded: List[Dict] = []
+        remaining = token_budget
+
+        for hit in chunks:
+            sid = hit["section_id"]
+            if hit.get("doc_version") not in versions or sid not in tree:
+                continue
+
+            candidates = (
+                [(s, "parent") for s in tree.ancestors(sid)]
+                + [(s, "child") for s in tree.children(sid)]
+                + [(s, "sibling") for s in tree.siblings(sid)]
+            )
+
+            for related, relation in candidates:
+                if related in seen:
+                    continue
+
+                for row in tree.rows(related):
+                    chunk = store[row]
+                    text = chunk["chunk_text"]
+                    if max_chunk_chars is not None:
+                        text = text[:max_chunk_chars]
+
+                    cost = _estimate_tokens(text)
+                    if cost > remaining:
+                        continue
+
+                    remaining -= cost
+                    seen.add(related)
+                    expanded.append({
+                        "chunk_id": chunk["chunk_id"],
+                        "text": chunk["chunk_text"],
+                        "section_id": related,
+                        "section_path": chunk["section_path"],
+                        "source_file": chunk["source_file"],
+                        "doc_version": chunk["doc_version"],
+                        "source": chunk["source"],
+                        "distance": None,
+                        "similarity": None,
+                        "relation": relation,
+                        "expanded_from": sid,
+                    })
+
+                if remaining < CHARS_PER_TOKEN:
+                    break
+
+    return chunks + expanded
@@ -0,0 +1,347 @@
+# src/rag/facet_table.py
+
+import argparse
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.observability.metrics import STAGE_LATENCY
+from src.rag.input_adapter import free_text_lines, norm_text, safe_compact
+from src.serialization import read_artifact, write_artifact
+
+
+FACET_TABLE_PATH = Path(os.getenv("FACET_TABLE_PATH", "data/facets/facet_table.json"))
+FACET_TABLE_FORMAT = 1
+
+# Sections stored per facet value at build time
+FACET_BUILD_TOP_K = 3
+
+# Table sections added to a request, on top of the free-text hits:
+# at most one per resolved facet, and at most this many in total
+FACET_TOP_K = int(os.getenv("FACET_TOP_K", "4"))
+
+# Closed value sets the table is built for. Values outside these
+# (or facets missing from the table) stay in the free-text query.
+FACET_VALUES: Dict[str, List[str]] = {
+    "mark_type": [
+        "Standard Character Claim", "Special Form", "Sound Mark",
+        "Color Mark", "Scent Mark", "Motion Mark", "Three-Dimensional Mark",
+    ],
+    "register": ["Principal Register", "Supplemental Register"],
+    "filing_basis": ["1(a)", "1(b)", "44(d)", "44(e)", "66(a)"],
+    "use_in_commerce": ["True", "False"],
+    "owner_entity": [
+        "Individual", "Corporation", "Limited Liability Company",
+        "Partnership", "Limited Partnership", "Joint Venture",
+        "Sole Proprietorship", "Trust", "Estate", "Association",
+        "Government Entity",
+    ],
+    "class": [f"{n:03d}" for n in range(1, 46)],
+}
+
+# Same line format as structured_object_to_retrieval_query
+_FACET_LABELS = {
+    "mark_type": "Mark Type",
+    "register": "Register",
+    "filing_basis": "Filing Basis",
+    "use_in_commerce": "Use in Commerce",
+    "owner_entity": "Entity Type",
+    "class": "Class",
+}
+
+
+# -------------------------------------------------
+# Offline Facet -> Section Table
+# -------------------------------------------------
+# Most of an application's retrieval-relevant fields come from small
+# closed sets. Retrieval for each (facet, value) is run once per
+# doc_version and stored; at request time those facets are resolved
+# by lookup and only the free text (mark literal, goods descriptions,
+# disclaimer / translation) is embedded and searched.
+#
+#   python -m src.rag.facet_table --doc-version "TMEP Nov 2025"
+
+
+def facet_key(facet: str, value) -> Optional[str]:
+    """
+    Canonical table key for a raw application value.
+    """
+
+    if value in (None, "", []):
+        return None
+    if facet == "class":
+        text = str(value).strip()
+        return f"{int(text):03d}" if text.isdigit() else None
+    return " ".join(str(value).split()).lower()
+
+
+def facet_query(facet: str, value: str) -> str:
+    return f"{_FACET_LABELS[facet]}: {value}"
+
+
+def build_facet_table(doc_version: str, top_k: int = FACET_BUILD_TOP_K) -> Dict:
+    from src.vectorstore.weaviate_search import similarity_search_batch
+
+    keys: List[Tuple[str, str]] = [
+        (facet, value) for facet, values in FACET_VALUES.items() for value in values
+    ]
+    outcomes = similarity_search_batch(
+        [facet_query(facet, value) for facet, value in keys],
+        top_k=top_k,
+        doc_version=doc_version,
+    )
+
+    facets: Dict[str, Dict[str, List[Dict]]] = {facet: {} for facet in FACET_VALUES}
+    for (facet, value), outcome in zip(keys, outcomes):
+        # No section above the similarity floor: resolved to nothing
+        facets[facet][facet_key(facet, value)] = [] if isinstance(outcome, Exception) else outcome
+
+    return {
+        "top_k": top_k,
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "facets": facets,
+    }
+
+
+def save_facet_table(doc_version: str, table: Dict, path: Path = FACET_TABLE_PATH) -> None:
+    """
+    Store one doc_version's table, keeping the other editions'.
+    """
+
+    existing = read_artifact(path) if path.exists() else {}
+    tables = existing.get("tables", {}) if existing.get("format") == FACET_TABLE_FORMAT else {}
+    tables[doc_version] = table
+
+    write_artifact({"format": FACET_TABLE_FORMAT, "tables": tables}, path, pretty=False)
+
+
+# -------------------------------------------------
+# Request Time
+# -------------------------------------------------
+# Off unless FACET_TABLE_ENABLED=1 (and a table exists for the
+# doc_version). Every non-per-class retrieval (/analyze, jobs,
+# /analyze/stream, /analyze/batch) goes through plan_facet_retrieval,
+# so an application gets the same context from every endpoint;
+# per-class units always search per class.
+#
+# Table sections were scored against the facet's own query, not this
+# application's, so they are never ranked against free-text hits, nor
+# against another facet's sections: each resolved facet contributes
+# its own best section (in facet order, up to FACET_TOP_K), after the
+# free-text hits as a separate, labelled tier. A facet that
+# contributes no section stays in the free-text query.
+
+FACET_TABLE_ENABLED = os.getenv("FACET_TABLE_ENABLED", "0") == "1"
+
+# Like RISK_RULES_CHECK_SECONDS: each process re-reads the file once
+# its mtime/size changes, checked at most this often (0 = never)
+FACET_TABLE_CHECK_SECONDS = float(os.getenv("FACET_TABLE_CHECK_SECONDS", "5"))
+
+_tables: Optional[Dict] = None
+_tables_stamp: Optional[tuple] = None
+_next_check = 0.0
+_tables_lock = threading.Lock()
+
+
+def _file_stamp(path: Path) -> Optional[tuple]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _load_tables() -> Dict:
+    if not FACET_TABLE_PATH.exists():
+        return {}
+    artifact = read_artifact(FACET_TABLE_PATH)
+    return artifact["tables"] if artifact.get("format") == FACET_TABLE_FORMAT else {}
+
+
+def get_facet_tables() -> Dict:
+    """
+    All doc_version tables, loaded on first use and re-read when the
+    file changes; empty when no table has been built (facet
+    resolution is then skipped). A file that fails to load keeps the
+    tables already in use.
+    """
+    global _tables, _tables_stamp, _next_check
+
+    if _tables is not None and (FACET_TABLE_CHECK_SECONDS <= 0 or time.monotonic() < _next_check):
+        return _tables
+    if not _tables_lock.acquire(blocking=_tables is None):
+        return _tables
+
+    try:
+        _next_check = time.monotonic() + FACET_TABLE_CHECK_SECONDS
+        stamp = _file_stamp(FACET_TABLE_PATH)
+        if _tables is None or stamp != _tables_stamp:
+            # Recorded first so a broken file is reported once
+            _tables_stamp = stamp
+            try:
+                _tables = _load_tables()
+            except Exception as e:
+                logging.error(f"Facet table load failed: {str(e)}", exc_info=True)
+                if _tables is None:
+                    _tables = {}
+    finally:
+        _tables_lock.release()
+
+    return _tables
+
+
+def _application_facets(app) -> List[Tuple[str, object]]:
+    facets = [
+        ("mark_type", app.mark_type),
+        ("register", app.register),
+        ("filing_basis", app.filing_basis),
+        ("use_in_commerce", app.use_in_commerce),
+        ("owner_entity", app.owner_entity),
+    ]
+    goods_map = getattr(app, "goods_map", {}) or {}
+    facets.extend(("class", cls) for cls in sorted(goods_map.keys()))
+    return facets
+
+
+def resolve_facets(app, doc_version: str) -> Optional[List[Tuple[str, object, Optional[List[Dict]]]]]:
+    """
+    (facet, value, table sections) for each of the application's
+    facets, sections None where the table has no entry; None when
+    there is no table for this doc_version. Each section is a copy
+    carrying the facet line it was stored for ("facet").
+    """
+
+    table = get_facet_tables().get(doc_version)
+    if table is None:
+        return None
+
+    resolved: List[Tuple[str, object, Optional[List[Dict]]]] = []
+
+    for facet, value in _application_facets(app):
+        key = facet_key(facet, value)
+        sections = table["facets"].get(facet, {}).get(key) if key else None
+        if sections is not None:
+            label = facet_query(facet, norm_text(value))
+            sections = [{**section, "facet": label} for section in sections]
+        resolved.append((facet, value, sections))
+
+    return resolved
+
+
+def free_text_query(app, unresolved: List[Tuple[str, object]]) -> str:
+    """
+    The retrieval query minus everything the table resolved.
+    """
+
+    lines = [f"Mark: {safe_compact(app.mark)}"]
+
+    for facet, value in unresolved:
+        if facet != "class" and norm_text(value):
+            lines.append(facet_query(facet, norm_text(value)))
+
+    lines.append(f"Citizenship: {safe_compact(app.owner_citizenship)}")
+
+    return "\n".join(lines + free_text_lines(app))
+
+
+def plan_facet_retrieval(app, doc_version: str) -> Optional[Tuple[str, List[Dict]]]:
+    """
+    (free-text query to search, table sections to append with
+    merge_facet_hits), or None when the table is disabled or has no
+    entry for doc_version (retrieve as before).
+    """
+
+    if not FACET_TABLE_ENABLED:
+        return None
+
+    from src.vectorstore.weaviate_search import MIN_SIMILARITY
+
+    with STAGE_LATENCY.time(stage="facet_lookup"):
+        resolved = resolve_facets(app, doc_version)
+    if resolved is None:
+        return None
+
+    extra: List[Dict] = []
+    seen = set()
+    unresolved: List[Tuple[str, object]] = []
+
+    for facet, value, sections in resolved:
+        # The floor is re-applied in case MIN_SIMILARITY was raised
+        # after the table was built
+        relevant = [s for s in sections or () if (s.get("similarity") or 0.0) >= MIN_SIMILARITY]
+        best = max(relevant, key=lambda s: s["similarity"], default=None)
+
+        if best is not None and best["chunk_id"] in seen:
+            # Already added for another facet
+            continue
+        if best is None or len(extra) >= FACET_TOP_K:
+            unresolved.append((facet, value))
+            continue
+
+        seen.add(best["chunk_id"])
+        extra.append(best)
+
+    return free_text_query(app, unresolved), extra
+
+
+def merge_facet_hits(text_hits: List[Dict], facet_hits: List[Dict]) -> List[Dict]:
+    """
+    Free-text hits in search order, then the table sections they do
+    not already include.
+    """
+
+    seen = {h["chunk_id"] for h in text_hits}
+    return text_hits + [h for h in facet_hits if h["chunk_id"] not in seen]
+
+
+def retrieve_with_facets(app, doc_version: str, top_k: int) -> Optional[List[Dict]]:
+    """
+    Free-text vector search (top_k) followed by the table sections.
+    None when the table is not used for doc_version (caller retrieves
+    as before).
+    """
+
+    from src.vectorstore.weaviate_search import similarity_search
+
+    plan = plan_facet_retrieval(app, doc_version)
+    if plan is None:
+        return None
+
+    query, facet_hits = plan
+
+    try:
+        text_hits = similarity_search(query, top_k=top_k, doc_version=doc_version)
+    except ValueError:
+        # Nothing relevant for the free text; the facet sections still are
+        if not facet_hits:
+            raise
+        text_hits = []
+
+    return merge_facet_hits(text_hits, facet_hits)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute facet -> TMEP section retrieval table.")
+    parser.add_argument("--doc-version", required=True)
+    parser.add_argument("--top-k", type=int, default=FACET_BUILD_TOP_K)
+    parser.add_argument("--output", type=Path, default=FACET_TABLE_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    table = build_facet_table(args.doc_version, args.top_k)
+    save_facet_table(args.doc_version, table, args.output)
+
+    values = sum(len(v) for v in table["facets"].values())
+    empty = sum(1 for v in table["facets"].values() for hits in v.values() if not hits)
+    print(
+        f"✅ Facet table for {args.doc_version}: {values} facet values "
+        f"({empty} without relevant sections) → {args.output} "
+        f"({time.perf_counter() - start:.1f}s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,83 @@
 import os
-from typing import List, Dict
-from groq import Groq
+import threading
+from typing import List, Dict, Tuple, Iterator, Optional, Sequence
 from dotenv import load_dotenv
 import concurrent.futures
 import logging
 
 
 from src.vectorstore.weaviate_search import similarity_search
-from src.rag.risk_engine import apply_risk_engine
+from src.observability.metrics import (
+    STAGE_LATENCY,
+    LLM_TOKENS,
+    LLM_FAILURES,
+    ERRORS,
+)
+from src.resilience.circuit_breaker import LLM_BREAKER, CircuitOpenError
+from src.rag.context_expansion import expand_context
+from src.rag.context_compressor import compress_chunks
+from src.rag.risk_engine import (
+    apply_risk_engine,
+    iter_classified_issues,
+    parse_llm_output,
+    merge_issues,
+    render_risk_report,
+)
 
 # -------------------------------------------------
 # Environment setup
 # -------------------------------------------------
 load_dotenv()
 
-client = Groq(
-    api_key=os.environ.get("GROQ_API_KEY"),
-)
+# Built on first use: importing the groq SDK alone costs ~0.3 s of
+# cold start, and a missing key should not stop the app from booting.
+_groq_client = None
+_groq_client_lock = threading.Lock()
 
 MAX_CHUNK_CHARS = 800  # ✅ Prevent token explosion from long TMEP chunks
+GROQ_MODEL = "llama-3.1-8b-instant"
+MAX_COMPLETION_TOKENS = 500
+
+# Per-attempt timeout enforced by the SDK's HTTP client, so a stalled
+# call really releases its worker; retries multiply the worst case.
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+GROQ_MAX_RETRIES = int(os.getenv("GROQ_MAX_RETRIES", "1"))
+
+# Concurrent per-class units for multi-class applications
+PER_CLASS_MAX_CONCURRENCY = int(os.getenv("PER_CLASS_MAX_CONCURRENCY", "8"))
+
+# Prefix of the retrieval-only report served while the LLM is down
+DEGRADED_NOTICE = "LLM analysis temporarily unavailable."
+DEGRADED_EXCERPT_CHARS = 300
+
+# Prefix of a per-class report that is missing some classes
+PARTIAL_NOTICE = "Partial analysis:"
+
+# Whole analysis returned when the LLM call failed (status "error")
+LLM_TIMEOUT_MESSAGE = "LLM request timed out. Please retry."
+LLM_ERROR_MESSAGE = "Error generating analysis. Please review logs."
+
+
+def get_groq_client():
+    """
+    Return the shared Groq client, creating it on first call.
+    """
+    global _groq_client
+
+    if _groq_client is None:
+        with _groq_client_lock:
+            if _groq_client is None:
+                from groq import Groq
+
+                _groq_client = Groq(
+                    api_key=os.environ.get("GROQ_API_KEY"),
+                    timeout=LLM_TIMEOUT_SECONDS,
+                    max_retries=GROQ_MAX_RETRIES,
+                )
+
+    return _groq_client
+
+
 # -------------------------------------------------
 # Helper: Build grounded context
 # -------------------------------------------------
@@ -31,9 +90,16 @@ def _build_context(chunks: List[Dict]) -> str:
 
     for i, c in enumerate(chunks, start=1):
         truncated_text = c["text"][:MAX_CHUNK_CHARS]
+        section = c["section_path"]
+        if c.get("relation"):
+            # Expanded context, not a retrieval hit
+            section += f" ({c['relation']} of §{c['expanded_from']})"
+        elif c.get("facet"):
+            # Precomputed for one of the application's facets
+            section += f" (for {c['facet']})"
         block = (
             f"[Source {i}]\n"
-            f"Section: {c['section_path']}\n"
+            f"Section: {section}\n"
             f"Text: {truncated_text}\n"
         )
         context_blocks.append(block)
@@ -42,24 +108,22 @@ def _build_context(chunks: List[Dict]) -> str:
 
 
 # -------------------------------------------------
-# Main RAG Answer Generator
+# Helper: Build system + user prompts
 # -------------------------------------------------
-def generate_rag_answer(query: str, doc_version: str, top_k: int = 3) -> str:
+def _build_prompts(
+    query: str,
+    retrieved_chunks: List[Dict],
+    focus: Optional[str] = None,
+) -> Tuple[str, str]:
     """
-    Generate a grounded RAG answer using TMEP content
-    via Groq's llama-3.3-70b-versatile reasoning model.
+    Build the grounded system and user prompts for one analysis.
+    Context sentences are chosen by their overlap with `focus`
+    (application_focus_text), falling back to the query.
     """
-
-    # Step 1: Retrieve relevant TMEP chunks (Step 6)
-    retrieved_chunks = similarity_search(query, top_k=top_k,doc_version=doc_version,)
-
-    if not retrieved_chunks:
-        return "No applicable TMEP provision found."
-       # ✅ Compute retrieval confidence (future extensibility)
-    avg_similarity = sum(
-        c["similarity"] for c in retrieved_chunks
-    ) / len(retrieved_chunks)
-    context = _build_context(retrieved_chunks)
+    context_chunks = expand_context(retrieved_chunks, max_chunk_chars=MAX_CHUNK_CHARS)
+    context = _build_context(
+        compress_chunks(context_chunks, focus or query, max_chars=MAX_CHUNK_CHARS)
+    )
 
     # Step 2: System prompt (strict legal grounding)
     system_prompt = (
@@ -197,38 +261,120 @@ Instructions:
   NO APPLICABLE TMEP PROVISION FOUND.
 """
 
+    return system_prompt, user_prompt
 
 
+# -------------------------------------------------
+# Helper: Groq call with hard timeout
+# -------------------------------------------------
+def _call_llm(system_prompt: str, user_prompt: str) -> str:
+    """
+    Run one Groq completion and return its raw text.
+    Raises concurrent.futures.TimeoutError after LLM_TIMEOUT_SECONDS
+    (per attempt), CircuitOpenError while the LLM breaker is open.
+    """
 
-    def call_groq(system_prompt, user_prompt):
-        return client.chat.completions.create(
-            model="llama-3.1-8b-instant",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            temperature=0.15,
-            max_tokens=500,
-            top_p=0.95,
-        )
+    from groq import APITimeoutError
+
+    try:
+        with LLM_BREAKER.guard(), STAGE_LATENCY.time(stage="llm_call"):
+            response = get_groq_client().chat.completions.create(
+                model=GROQ_MODEL,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+                temperature=0.15,
+                max_tokens=MAX_COMPLETION_TOKENS,
+                top_p=0.95,
+            )
+
+    except CircuitOpenError:
+        raise
+
+    except APITimeoutError as e:
+        LLM_FAILURES.inc(reason="timeout")
+        raise concurrent.futures.TimeoutError() from e
 
+    except Exception:
+        LLM_FAILURES.inc(reason="provider_error")
+        raise
+
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        LLM_TOKENS.inc(usage.prompt_tokens or 0, kind="prompt")
+        LLM_TOKENS.inc(usage.completion_tokens or 0, kind="completion")
+
+    return response.choices[0].message.content
+
+
+# -------------------------------------------------
+# Main RAG Answer Generator
+# -------------------------------------------------
+def generate_rag_answer(
+    query: str,
+    doc_version: str,
+    top_k: int = 3,
+    retrieval_query: Optional[str] = None,
+    focus: Optional[str] = None,
+) -> str:
+    """
+    Generate a grounded RAG answer using TMEP content
+    via Groq's llama-3.3-70b-versatile reasoning model.
+
+    retrieval_query, when given, is embedded for search instead of
+    the full application text (see structured_object_to_retrieval_query).
+    """
+
+    # Step 1: Retrieve relevant TMEP chunks (Step 6)
+    retrieved_chunks = similarity_search(retrieval_query or query, top_k=top_k,doc_version=doc_version,)
+
+    return generate_answer_from_chunks(query, retrieved_chunks, focus=focus)
+
+
+# -------------------------------------------------
+# Generation over already-retrieved chunks
+# -------------------------------------------------
+def generate_answer_from_chunks(
+    query: str,
+    retrieved_chunks: List[Dict],
+    focus: Optional[str] = None,
+) -> str:
+    """
+    Run prompt construction, the Groq call and the risk engine
+    over chunks retrieved elsewhere (e.g. a shared batch retrieval).
+    """
+
+    if not retrieved_chunks:
+        return "No applicable TMEP provision found."
+       # ✅ Compute retrieval confidence (future extensibility)
+    avg_similarity = sum(
+        c["similarity"] for c in retrieved_chunks
+    ) / len(retrieved_chunks)
+
+    system_prompt, user_prompt = _build_prompts(query, retrieved_chunks, focus)
 
     try:
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            future = executor.submit(call_groq, system_prompt, user_prompt)
-            response = future.result(timeout=60)  # 🔥 60-second hard timeout
+        raw_output = _call_llm(system_prompt, user_prompt)
+
+        with STAGE_LATENCY.time(stage="risk_engine"):
+            final_output = apply_risk_engine(raw_output)
 
-        raw_output = response.choices[0].message.content
-        final_output = apply_risk_engine(raw_output)
         return final_output
 
+    except CircuitOpenError:
+        logging.warning("LLM circuit open, serving retrieval-only report")
+        return render_retrieval_only(retrieved_chunks)
+
     except concurrent.futures.TimeoutError:
         logging.error("Groq request timed out")
-        return "LLM request timed out. Please retry."
+        ERRORS.inc(stage="generation", type="TimeoutError")
+        return LLM_TIMEOUT_MESSAGE
 
     except Exception as e:
         logging.error(f"Groq failure: {str(e)}", exc_info=True)
-        return "Error generating analysis. Please review logs."
+        ERRORS.inc(stage="generation", type=type(e).__name__)
+        return LLM_ERROR_MESSAGE
 
     # Step 3: Groq API call (Llama 3.3 70B)
     # try:
@@ -254,6 +400,238 @@ Instructions:
     #     return "Error generating analysis. Please review logs."
 
 
+# -------------------------------------------------
+# Degraded mode: retrieval-only report
+# -------------------------------------------------
+def render_retrieval_only(retrieved_chunks: List[Dict]) -> str:
+    """
+    List the retrieved TMEP sections without LLM analysis, for when
+    retrieval works but the LLM breaker is open.
+    """
+
+    lines = [
+        f"{DEGRADED_NOTICE} Most relevant TMEP sections (no issue analysis):",
+        "",
+    ]
+
+    seen = set()
+    for c in retrieved_chunks:
+        if c["section_id"] in seen:
+            continue
+        seen.add(c["section_id"])
+
+        excerpt = " ".join(c["text"].split())[:DEGRADED_EXCERPT_CHARS]
+        similarity = c.get("similarity")
+        score = f" (similarity {similarity:.2f})" if similarity is not None else ""
+
+        lines.append(f"- §{c['section_path']}{score}")
+        lines.append(f"  {excerpt}")
+
+    return "\n".join(lines)
+
+
+def is_degraded(analysis: str) -> bool:
+    return analysis.startswith(DEGRADED_NOTICE)
+
+
+def is_failed(analysis: str) -> bool:
+    return analysis in (LLM_TIMEOUT_MESSAGE, LLM_ERROR_MESSAGE)
+
+
+def analysis_status(analysis: str, failed_classes: Sequence[str] = ()) -> str:
+    """
+    "success", "degraded" (retrieval-only), "partial" (some classes
+    missing from a per-class report) or "error" (the LLM call failed,
+    or no class analyzed).
+    """
+
+    if is_degraded(analysis):
+        return "degraded"
+    if is_failed(analysis):
+        return "error"
+    if failed_classes:
+        return "partial" if analysis.startswith(PARTIAL_NOTICE) else "error"
+    return "success"
+
+
+# -------------------------------------------------
+# Per-class RAG for multi-class applications
+# -------------------------------------------------
+def generate_per_class_answer(
+    class_queries: Dict[str, str],
+    doc_version: str,
+    top_k: int = 2,
+    class_focus: Optional[Dict[str, str]] = None,
+    class_retrieval_queries: Optional[Dict[str, str]] = None,
+) -> Tuple[str, List[str]]:
+    """
+    Analyze each goods/services class as its own unit, concurrently,
+    then merge the issues (deduplicated by citation) into one report.
+    Returns (report, ids of the classes that could not be analyzed);
+    a report missing some classes starts with PARTIAL_NOTICE.
+    class_focus: per-class focus text for context compression.
+    class_retrieval_queries: per-class compact search queries
+    (structured_object_to_class_retrieval_queries); the full class
+    query is only used for the prompt.
+
+    Wall-clock time tracks the slowest class instead of growing
+    with the number of classes.
+    """
+
+    if not class_queries:
+        return "No applicable TMEP provision found.", []
+
+    max_workers = max(1, min(PER_CLASS_MAX_CONCURRENCY, len(class_queries)))
+
+    issues_by_class: Dict[str, List[Dict]] = {}
+    degraded_chunks: List[Dict] = []
+    circuit_open: Optional[CircuitOpenError] = None
+    timed_out = 0
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                _analyze_class_unit,
+                query,
+                doc_version,
+                top_k,
+                (class_focus or {}).get(cls),
+                (class_retrieval_queries or {}).get(cls),
+            ): cls
+            for cls, query in class_queries.items()
+        }
+
+        for future in concurrent.futures.as_completed(futures):
+            cls = futures[future]
+            try:
+                chunks, issues = future.result()
+                if issues is None:
+                    degraded_chunks.extend(chunks)
+                else:
+                    issues_by_class[cls] = issues
+            except CircuitOpenError as e:
+                # Retrieval rejected by the Weaviate breaker
+                circuit_open = e
+            except concurrent.futures.TimeoutError:
+                logging.error(f"Groq request timed out for class {cls}")
+                ERRORS.inc(stage="generation", type="TimeoutError")
+                timed_out += 1
+            except ValueError as e:
+                # No sufficiently relevant sections for this class
+                logging.info(f"Class {cls}: {str(e)}")
+                issues_by_class[cls] = []
+            except Exception as e:
+                logging.error(f"Class {cls} analysis failed: {str(e)}", exc_info=True)
+                ERRORS.inc(stage="generation", type=type(e).__name__)
+
+    failed = sorted(cls for cls in class_queries if cls not in issues_by_class)
+
+    if not issues_by_class:
+        if degraded_chunks:
+            return render_retrieval_only(
+                sorted(degraded_chunks, key=lambda c: c["similarity"] or 0.0, reverse=True)
+            ), failed
+        if circuit_open is not None:
+            raise circuit_open
+        if timed_out:
+            return LLM_TIMEOUT_MESSAGE, failed
+        return LLM_ERROR_MESSAGE, failed
+
+    merged = merge_issues(
+        issues_by_class[cls] for cls in sorted(issues_by_class)
+    )
+
+    with STAGE_LATENCY.time(stage="risk_engine"):
+        report = render_risk_report(merged)
+
+    if failed:
+        logging.warning(f"Per-class analysis incomplete, failed classes: {', '.join(failed)}")
+        report = (
+            f"{PARTIAL_NOTICE} {'Classes' if len(failed) > 1 else 'Class'} "
+            f"{', '.join(failed)} could not be analyzed; "
+            f"the issues below cover the other classes only. Please retry.\n\n{report}"
+        )
+
+    return report, failed
+
+
+def _analyze_class_unit(
+    query: str,
+    doc_version: str,
+    top_k: int,
+    focus: Optional[str] = None,
+    retrieval_query: Optional[str] = None,
+) -> Tuple[List[Dict], Optional[List[Dict]]]:
+    """
+    Return (retrieved chunks, parsed issues); issues is None when the
+    LLM breaker is open so the caller can fall back to retrieval-only.
+    """
+
+    retrieved_chunks = similarity_search(retrieval_query or query, top_k=top_k, doc_version=doc_version)
+
+    system_prompt, user_prompt = _build_prompts(query, retrieved_chunks, focus)
+
+    try:
+        raw_output = _call_llm(system_prompt, user_prompt)
+    except CircuitOpenError:
+        return retrieved_chunks, None
+
+    with STAGE_LATENCY.time(stage="risk_engine"):
+        return retrieved_chunks, parse_llm_output(raw_output)
+
+
+# -------------------------------------------------
+# Streaming RAG: risk-classified issues as they arrive
+# -------------------------------------------------
+def stream_rag_issues(
+    query: str,
+    doc_version: str,
+    top_k: int = 3,
+    retrieval_query: Optional[str] = None,
+    focus: Optional[str] = None,
+    retrieved_chunks: Optional[List[Dict]] = None,
+) -> Iterator[Dict]:
+    """
+    Stream the Groq completion and yield each risk-classified issue
+    as soon as its block closes, instead of waiting for the full text.
+    retrieved_chunks, when given, replaces the search.
+    """
+
+    if retrieved_chunks is None:
+        retrieved_chunks = similarity_search(retrieval_query or query, top_k=top_k, doc_version=doc_version)
+
+    system_prompt, user_prompt = _build_prompts(query, retrieved_chunks, focus)
+
+    try:
+        # The breaker sees whether the stream could be opened; errors
+        # mid-stream surface to the caller as before.
+        with LLM_BREAKER.guard():
+            stream = get_groq_client().chat.completions.create(
+                model=GROQ_MODEL,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+                temperature=0.15,
+                max_tokens=MAX_COMPLETION_TOKENS,
+                top_p=0.95,
+                stream=True,
+            )
+    except CircuitOpenError:
+        raise
+    except Exception:
+        LLM_FAILURES.inc(reason="provider_error")
+        raise
+
+    fragments = (
+        chunk.choices[0].delta.content or ""
+        for chunk in stream
+        if chunk.choices
+    )
+
+    yield from iter_classified_issues(fragments)
+
+
 # -------------------------------------------------
 # Local test (optional)
 # -------------------------------------------------
@@ -28,6 +28,11 @@
 
 # src/rag/input_adapter.py
 
+import dataclasses
+import hashlib
+import json
+
+
 def _safe(val):
     """
     Normalize empty / None fields to prevent embedding noise.
@@ -35,11 +40,15 @@ def _safe(val):
     return val if val not in (None, "", []) else "Not Provided"
 
 
-def structured_object_to_query(app) -> str:
+def structured_object_to_query(app, include_identifiers: bool = True) -> str:
     """
     Convert structured trademark application object
     into deterministic natural-language query text
     for semantic retrieval.
+
+    include_identifiers=False leaves out owner name, serial and
+    registration number, so one generated analysis can be shared by
+    applications with the same fingerprint.
     """
 
     # ✅ Deterministic ordering + safe fallback
@@ -53,6 +62,12 @@ def structured_object_to_query(app) -> str:
     if not goods_section:
         goods_section = "\nNot Provided"
 
+    owner_name = f"Owner Name: {_safe(app.owner_name)}\n" if include_identifiers else ""
+    identifiers = (
+        f"Serial Number: {_safe(app.serial_number)}\n"
+        f"Registration Number: {_safe(app.registration_number)}\n\n"
+    ) if include_identifiers else ""
+
     query = (
         f"Trademark Application Analysis Request:\n\n"
         f"Mark: {_safe(app.mark)}\n"
@@ -60,14 +75,240 @@ def structured_object_to_query(app) -> str:
         f"Register: {_safe(app.register)}\n\n"
         f"Filing Basis: {_safe(app.filing_basis)}\n"
         f"Use in Commerce: {_safe(app.use_in_commerce)}\n\n"
-        f"Owner Name: {_safe(app.owner_name)}\n"
+        f"{owner_name}"
         f"Entity Type: {_safe(app.owner_entity)}\n"
         f"Citizenship: {_safe(app.owner_citizenship)}\n\n"
-        f"Serial Number: {_safe(app.serial_number)}\n"
-        f"Registration Number: {_safe(app.registration_number)}\n\n"
+        f"{identifiers}"
         f"Goods and Services:{goods_section}\n\n"
         f"Analyze the application strictly under TMEP guidelines "
         f"for potential examination issues."
     )
 
     return query
+
+
+def structured_object_to_class_queries(app, include_identifiers: bool = True) -> dict[str, str]:
+    """
+    Split a multi-class application into one query per class.
+
+    Every query carries the same mark-level context and only
+    its own goods/services entry, so each class can be
+    retrieved and analyzed independently.
+    """
+
+    goods_map = getattr(app, "goods_map", {}) or {}
+    owner_name = f"Owner Name: {_safe(app.owner_name)}\n" if include_identifiers else ""
+
+    mark_context = (
+        f"Trademark Application Analysis Request:\n\n"
+        f"Mark: {_safe(app.mark)}\n"
+        f"Mark Type: {_safe(app.mark_type)}\n"
+        f"Register: {_safe(app.register)}\n\n"
+        f"Filing Basis: {_safe(app.filing_basis)}\n"
+        f"Use in Commerce: {_safe(app.use_in_commerce)}\n\n"
+        f"{owner_name}"
+        f"Entity Type: {_safe(app.owner_entity)}\n"
+        f"Citizenship: {_safe(app.owner_citizenship)}\n\n"
+    )
+
+    return {
+        cls: (
+            f"{mark_context}"
+            f"Goods and Services:\nClass {cls}: {_safe(goods_map[cls])}\n\n"
+            f"Analyze the application strictly under TMEP guidelines "
+            f"for potential examination issues in Class {cls}."
+        )
+        for cls in sorted(goods_map.keys())
+    }
+
+
+# -------------------------------------------------
+# Compact retrieval query + canonical fingerprint
+# -------------------------------------------------
+# Identifiers (serial / registration number, owner name) carry no
+# legal substance for retrieval: they only add embedding noise and
+# stop identical applications from sharing cache entries.
+
+FINGERPRINT_VERSION = "v1"
+
+
+def norm_text(val) -> str:
+    return " ".join(str(val).split()) if val not in (None, "", []) else ""
+
+
+def _model_facets(obj) -> dict:
+    """
+    Flatten an optional schema sub-model (mark_features, disclaimer,
+    specimen) into a dict of its non-empty values.
+    """
+
+    if obj is None:
+        return {}
+
+    if dataclasses.is_dataclass(obj):
+        values = dataclasses.asdict(obj)
+    else:
+        values = obj.model_dump() if hasattr(obj, "model_dump") else dict(obj)
+
+    return {
+        key: (norm_text(val) if isinstance(val, str) else val)
+        for key, val in sorted(values.items())
+        if val not in (None, "", [])
+    }
+
+
+def application_substance(app) -> dict:
+    """
+    Canonical, identifier-free view of the application's substance.
+    Ordering and whitespace are normalized so equivalent
+    applications produce identical dicts.
+    """
+
+    goods_map = getattr(app, "goods_map", {}) or {}
+
+    return {
+        "mark": norm_text(app.mark),
+        "mark_type": norm_text(app.mark_type).lower(),
+        "register": norm_text(app.register).lower(),
+        "filing_basis": norm_text(app.filing_basis).lower(),
+        "use_in_commerce": bool(app.use_in_commerce),
+        "owner_entity": norm_text(app.owner_entity).lower(),
+        "owner_citizenship": norm_text(app.owner_citizenship).lower(),
+        "goods": [
+            [norm_text(cls), norm_text(goods_map[cls])]
+            for cls in sorted(goods_map.keys())
+        ],
+        "mark_features": _model_facets(getattr(app, "mark_features", None)),
+        "disclaimer": _model_facets(getattr(app, "disclaimer", None)),
+        "specimen": _model_facets(getattr(app, "specimen", None)),
+        "claimed_prior_registrations": sorted(
+            norm_text(r) for r in (getattr(app, "claimed_prior_registrations", None) or ())
+        ),
+    }
+
+
+def application_identifiers(app) -> dict:
+    """
+    The per-application identifiers left out of the fingerprint.
+    """
+
+    return {
+        "owner_name": app.owner_name,
+        "serial_number": app.serial_number,
+        "registration_number": app.registration_number,
+    }
+
+
+def application_fingerprint(app) -> str:
+    """
+    Stable hash of the application's substance, for caches,
+    deduplication and request coalescing.
+    """
+
+    canonical = json.dumps(
+        application_substance(app),
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+
+    digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    return f"{FINGERPRINT_VERSION}:{digest}"
+
+
+def safe_compact(val) -> str:
+    return norm_text(val) or "Not Provided"
+
+
+def structured_object_to_retrieval_query(app) -> str:
+    """
+    Compact retrieval query limited to legally relevant facets.
+    """
+
+    return "\n".join(_facet_lines(app) + free_text_lines(app))
+
+
+def structured_object_to_class_retrieval_queries(app) -> dict[str, str]:
+    """
+    Compact retrieval query per class: the same facets with only
+    that class's goods, for the per-class analysis (whose prompts
+    still use structured_object_to_class_queries).
+    """
+
+    goods_map = getattr(app, "goods_map", {}) or {}
+    facets = _facet_lines(app)
+
+    return {
+        cls: "\n".join(facets + free_text_lines(app, classes=(cls,)))
+        for cls in sorted(goods_map.keys())
+    }
+
+
+def _facet_lines(app) -> list[str]:
+    return [
+        f"Mark: {safe_compact(app.mark)}",
+        f"Mark Type: {safe_compact(app.mark_type)}",
+        f"Register: {safe_compact(app.register)}",
+        f"Filing Basis: {safe_compact(app.filing_basis)}",
+        f"Use in Commerce: {safe_compact(app.use_in_commerce)}",
+        f"Entity Type: {safe_compact(app.owner_entity)}",
+        f"Citizenship: {safe_compact(app.owner_citizenship)}",
+    ]
+
+
+def free_text_lines(app, classes=None) -> list[str]:
+    """
+    The open-text retrieval lines: goods per class, disclaimer and
+    mark features (shared with facet_table.free_text_query).
+    `classes` limits the goods to those classes.
+    """
+
+    goods_map = getattr(app, "goods_map", {}) or {}
+    lines = []
+
+    for cls in sorted(goods_map.keys()):
+        if classes is None or cls in classes:
+            lines.append(f"Class {cls}: {safe_compact(goods_map[cls])}")
+
+    disclaimer = getattr(app, "disclaimer", None)
+    if disclaimer is not None and disclaimer.present:
+        lines.append(f"Disclaimer: {safe_compact(disclaimer.text)}")
+
+    features = getattr(app, "mark_features", None)
+    if features is not None:
+        if features.contains_color_claim:
+            lines.append("Color claimed as a feature of the mark")
+        if features.translation_statement:
+            lines.append(f"Translation: {norm_text(features.translation_statement)}")
+        if features.transliteration_statement:
+            lines.append(f"Transliteration: {norm_text(features.transliteration_statement)}")
+
+    return lines
+
+
+def application_focus_text(app, classes=None) -> str:
+    """
+    The application's substance values without any field labels, for
+    scoring context sentences (context_compressor). Labels such as
+    "Register" or "Goods and Services", and the owner's name, match
+    generic TMEP sentences and would crowd out the relevant ones.
+    `classes` limits the goods to those classes (per-class analysis).
+    """
+
+    goods_map = getattr(app, "goods_map", {}) or {}
+    values = [app.mark, app.mark_type]
+
+    values.extend(goods_map[cls] for cls in sorted(goods_map.keys()) if classes is None or cls in classes)
+
+    disclaimer = getattr(app, "disclaimer", None)
+    if disclaimer is not None and disclaimer.present:
+        values.append(disclaimer.text)
+
+    features = getattr(app, "mark_features", None)
+    if features is not None:
+        if features.contains_color_claim:
+            values.append("color")
+        values.extend((features.translation_statement, features.transliteration_statement))
+
+    return "\n".join(norm_text(v) for v in values if norm_text(v))
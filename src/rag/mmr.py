@@ -0,0 +1,92 @@
+# src/rag/mmr.py
+
+import os
+from typing import TYPE_CHECKING, Dict, List
+
+from src.observability.metrics import STAGE_LATENCY
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+MMR_ENABLED = os.getenv("MMR_ENABLED", "0") == "1"
+
+# Candidates fetched per requested result when MMR is on
+MMR_FETCH_FACTOR = int(os.getenv("MMR_FETCH_FACTOR", "4"))
+
+# 1.0 = pure relevance (plain top-k), 0.0 = pure diversity
+MMR_LAMBDA = float(os.getenv("MMR_LAMBDA", "0.7"))
+
+
+# -------------------------------------------------
+# Maximal Marginal Relevance
+# -------------------------------------------------
+# Greedy: pick the most relevant candidate, then repeatedly the one
+# maximising  lambda * relevance - (1 - lambda) * max similarity to
+# anything already picked. Candidate-candidate similarities are one
+# matrix product; each step is an O(n) vector update. numpy is
+# imported on first use, keeping it off the app's import path.
+
+
+def mmr_select(
+    relevance: "np.ndarray",
+    vectors: "np.ndarray",
+    top_k: int,
+    lambda_mult: float = MMR_LAMBDA,
+) -> List[int]:
+    """
+    Indices of the selected candidates, in selection order.
+    relevance: [n] query similarity; vectors: [n, D].
+    """
+    import numpy as np
+
+    relevance = np.asarray(relevance, dtype=np.float32)
+    n = len(relevance)
+    if n == 0 or top_k <= 0:
+        return []
+
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    vectors = vectors / norms
+    similarity = vectors @ vectors.T
+
+    first = int(np.argmax(relevance))
+    selected = [first]
+    max_similarity = similarity[first].copy()
+    available = np.ones(n, dtype=bool)
+    available[first] = False
+
+    while len(selected) < min(top_k, n):
+        scores = lambda_mult * relevance - (1.0 - lambda_mult) * max_similarity
+        scores[~available] = -np.inf
+
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        np.maximum(max_similarity, similarity[best], out=max_similarity)
+
+    return selected
+
+
+def diversify(results: List[Dict], top_k: int, lambda_mult: float = MMR_LAMBDA) -> List[Dict]:
+    """
+    MMR over ranked retrieval results carrying a "_vector" and a
+    "similarity" (their relevance to the query). Falls back to the
+    first top_k when any vector is missing.
+    """
+
+    if len(results) <= top_k or any(r.get("_vector") is None for r in results):
+        return results[:top_k]
+
+    import numpy as np
+
+    with STAGE_LATENCY.time(stage="mmr"):
+        order = mmr_select(
+            np.asarray([r["similarity"] for r in results], dtype=np.float32),
+            np.asarray([r["_vector"] for r in results], dtype=np.float32),
+            top_k,
+            lambda_mult,
+        )
+
+    return [results[i] for i in order]
@@ -0,0 +1,98 @@
+# src/rag/pipeline.py
+
+import logging
+from typing import Any, Dict
+
+from src.models.schema import TrademarkApplicationData
+from src.models.trademark import TrademarkApplication
+from src.rag.input_adapter import (
+    structured_object_to_query,
+    structured_object_to_retrieval_query,
+    structured_object_to_class_queries,
+    structured_object_to_class_retrieval_queries,
+    application_fingerprint,
+    application_focus_text,
+)
+from src.rag.facet_table import retrieve_with_facets
+from src.rag.generate_answer import (
+    generate_rag_answer,
+    generate_answer_from_chunks,
+    generate_per_class_answer,
+    analysis_status,
+)
+from src.observability.metrics import STAGE_LATENCY
+
+
+ANALYZE_TOP_K = 2
+
+
+# -------------------------------------------------
+# Full Analysis: application -> risk report
+# -------------------------------------------------
+# Shared by the synchronous /analyze endpoint and the job workers.
+
+def analyze_application(
+    data: TrademarkApplicationData,
+    doc_version: str,
+    per_class: bool = False,
+) -> Dict[str, Any]:
+    """
+    Build the application, retrieve and generate.
+    Returns {"status", "fingerprint", "analysis"}, plus
+    "failed_classes" when a per-class analysis is incomplete.
+    """
+
+    with STAGE_LATENCY.time(stage="model_build"):
+        app_obj = TrademarkApplication.from_schema(data)
+    logging.info("Step 2: Structured object built")
+
+    if per_class and len(app_obj.goods_map) > 1:
+        with STAGE_LATENCY.time(stage="query_build"):
+            class_queries = structured_object_to_class_queries(app_obj)
+            class_retrieval_queries = structured_object_to_class_retrieval_queries(app_obj)
+            class_focus = {cls: application_focus_text(app_obj, classes=(cls,)) for cls in class_queries}
+        logging.info(f"Step 3: {len(class_queries)} per-class queries constructed")
+
+        result, failed_classes = generate_per_class_answer(
+            class_queries=class_queries,
+            doc_version=doc_version,
+            top_k=ANALYZE_TOP_K,
+            class_focus=class_focus,
+            class_retrieval_queries=class_retrieval_queries,
+        )
+    else:
+        failed_classes = []
+
+        with STAGE_LATENCY.time(stage="query_build"):
+            query = structured_object_to_query(app_obj)
+            retrieval_query = structured_object_to_retrieval_query(app_obj)
+            focus = application_focus_text(app_obj)
+        logging.info("Step 3: Query constructed")
+
+        # Closed-set facets resolved from the precomputed table when
+        # FACET_TABLE_ENABLED and one exists for doc_version; only the
+        # free text is searched (same in /analyze/stream and /batch)
+        chunks = retrieve_with_facets(app_obj, doc_version, ANALYZE_TOP_K)
+
+        if chunks is None:
+            result = generate_rag_answer(
+                query=query,
+                doc_version=doc_version,
+                top_k=ANALYZE_TOP_K,
+                retrieval_query=retrieval_query,
+                focus=focus,
+            )
+        else:
+            result = generate_answer_from_chunks(query, chunks, focus=focus)
+
+    logging.info("Step 4: RAG completed")
+
+    response = {
+        "status": analysis_status(result, failed_classes),
+        "fingerprint": application_fingerprint(app_obj),
+        "analysis": result
+    }
+    if failed_classes:
+        response["failed_classes"] = failed_classes
+
+    return response
@@ -1,68 +1,96 @@
 # src/rag/risk_engine.py
 
+import os
 import re
-from typing import List, Dict, Optional
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import List, Dict, Optional, Iterable, Iterator
+
+from src.rag.risk_rules import RiskRuleTable, load_risk_rules, DEFAULT_RULES_PATH
 
 
 # -------------------------------------------------
-# Risk Mapping Configuration (UNCHANGED)
+# Risk Rule Table (loaded from a versioned data file)
 # -------------------------------------------------
 
-RISK_MAPPING = {
-    "HIGH": [
-        "1207",
-        "1203",
-        "1210",
-        "1211",
-        "1206",
-        "1204",
-        "1209.01(c)",  # specific override
-    ],
-    "MEDIUM-HIGH": [
-        "1209",
-        "1202",
-        "1202.04",
-        "1301",
-        "1302",
-        "1303",
-        "1304",
-        "1212",
-    ],
-    "MEDIUM": [
-        "904",
-        "807",
-        "1213",
-        "1402",
-    ],
-    "MEDIUM-LOW": [
-        "300",
-        "400",
-        "600",
-        "700",
-    ],
-    "LOW": [
-        "100",
-        "200",
-        "304",
-        "500",
-    ]
-}
+RISK_RULES_PATH = Path(os.getenv("RISK_RULES_PATH", str(DEFAULT_RULES_PATH)))
 
+# Every process (each uvicorn worker, each job worker) re-reads the
+# file on its own once its mtime/size changes, checked at most this
+# often; 0 disables the check (reload only via reload_risk_rules()).
+RISK_RULES_CHECK_SECONDS = float(os.getenv("RISK_RULES_CHECK_SECONDS", "5"))
 
-# -------------------------------------------------
-# 🔹 Strongly Recommended Improvement:
-# Precompute sorted prefix rules once (longest prefix first)
-# -------------------------------------------------
 
-_SORTED_RULES = sorted(
-    [
-        (risk, prefix.lower())
-        for risk, prefixes in RISK_MAPPING.items()
-        for prefix in prefixes
-    ],
-    key=lambda x: len(x[1]),
-    reverse=True,
-)
+def _file_stamp(path: Path) -> tuple:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+# Swapped as a single reference on reload, so readers always
+# see either the old or the new table, never a partial one.
+# _active_path is the file the table came from, the one watched.
+_active_path = RISK_RULES_PATH
+_active_stamp = _file_stamp(RISK_RULES_PATH)
+_active_rules: RiskRuleTable = load_risk_rules(RISK_RULES_PATH)
+
+_next_check = time.monotonic() + RISK_RULES_CHECK_SECONDS
+_check_lock = threading.Lock()
+
+
+def get_risk_rules() -> RiskRuleTable:
+    _reload_if_changed()
+    return _active_rules
+
+
+def reload_risk_rules(path: Optional[Path] = None) -> RiskRuleTable:
+    """
+    Recompile the rule file (default: the one in use) and atomically
+    swap it in, in this process. The file loaded is the one watched
+    from then on. On any error the currently active table is kept.
+    """
+
+    global _active_rules, _active_stamp, _active_path
+
+    path = Path(path) if path else _active_path
+    stamp = _file_stamp(path)
+    table = load_risk_rules(path)
+    _active_rules = table
+    _active_stamp = stamp
+    _active_path = path
+
+    logging.info(
+        f"Risk rules reloaded: version {table.version}, {len(table)} rules"
+    )
+
+    return table
+
+
+def _reload_if_changed() -> None:
+    """
+    Pick up an edited rule file without an admin call to this process.
+    """
+    global _next_check, _active_stamp
+
+    if RISK_RULES_CHECK_SECONDS <= 0 or time.monotonic() < _next_check:
+        return
+    if not _check_lock.acquire(blocking=False):
+        return
+
+    try:
+        _next_check = time.monotonic() + RISK_RULES_CHECK_SECONDS
+        stamp = _file_stamp(_active_path)
+        if stamp == _active_stamp:
+            return
+
+        # Recorded first so a broken file is reported once, not per check
+        _active_stamp = stamp
+        reload_risk_rules()
+    except Exception as e:
+        logging.error(f"Risk rules auto-reload failed, keeping version {_active_rules.version}: {str(e)}", exc_info=True)
+    finally:
+        _check_lock.release()
 
 
 # -------------------------------------------------
@@ -72,25 +100,137 @@ _SORTED_RULES = sorted(
 def classify_section(section_id: str) -> str:
     """
     Determine risk level based on TMEP section prefix.
-    Longest prefix match wins.
+    Longest prefix match wins (matched on whole citation components).
     """
 
-    # 🔹 Required Improvement: normalize case
-    section_id = section_id.strip().lower()
+    return get_risk_rules().classify(section_id)
+
+
+def classify_sections(section_ids: Iterable[str]) -> List[str]:
+    """
+    Classify many citations against one consistent rule table.
+    """
 
-    for risk, prefix in _SORTED_RULES:
-        # 🔹 Required Improvement: normalized prefix comparison
-        if section_id.startswith(prefix):
-            return risk
+    rules = get_risk_rules()
 
-    # 🔹 Strongly Recommended: safer fallback
-    return "MEDIUM"
+    return [rules.classify(section_id) for section_id in section_ids]
 
 
 # -------------------------------------------------
 # LLM Output Parsing
 # -------------------------------------------------
 
+# A new block starts at every "ISSUE:" that begins a line
+_ISSUE_BOUNDARY_RE = re.compile(r"\nISSUE:", re.IGNORECASE)
+
+_ISSUE_BLOCK_RE = re.compile(
+    r"ISSUE:\s*(.*?)\s*"
+    r"TMEP\s*CITATION:\s*§?\s*([\d\.\(\)a-zA-Z]+)\s*"
+    r"TMEP-BASED\s*EXPLANATION:\s*(.*)",
+    re.DOTALL | re.IGNORECASE,
+)
+
+# Longest text that can straddle two fragments and still be a boundary
+_BOUNDARY_OVERLAP = len("\nISSUE:") - 1
+
+
+class IncrementalIssueParser:
+    """
+    Parse LLM output fragment by fragment as it streams in.
+
+    A block is complete once the next line-initial "ISSUE:" arrives
+    (or the stream is closed), so feed() returns each issue as soon
+    as it closes. Fragments are only scanned together with the few
+    characters before them and only joined when a block closes, so
+    every character is scanned and copied a bounded number of times
+    and the full parse is linear in the output length.
+    """
+
+    def __init__(self, classify: bool = True):
+        self.classify = classify
+        # Fragments of the still-open block, joined only once a
+        # boundary shows up; _tail is the text a boundary can straddle
+        self._pending: List[str] = []
+        self._tail = ""
+
+    def feed(self, fragment: str) -> List[Dict]:
+        """
+        Add a text fragment and return the issues it completed.
+        """
+
+        if not fragment:
+            return []
+
+        window = self._tail + fragment
+        self._pending.append(fragment)
+
+        if not _ISSUE_BOUNDARY_RE.search(window):
+            self._tail = window[-_BOUNDARY_OVERLAP:]
+            return []
+
+        buffer = "".join(self._pending)
+        completed: List[Dict] = []
+
+        # Offsets only: each closed block is cut out once, and the
+        # buffer is trimmed once per call, not once per issue
+        start = 0
+        for match in _ISSUE_BOUNDARY_RE.finditer(buffer, len(buffer) - len(window)):
+            item = self._parse_block(buffer[start:match.start()])
+            if item:
+                completed.append(item)
+
+            # Keep "ISSUE:" at the head of the next block
+            start = match.start() + 1
+
+        buffer = buffer[start:]
+        self._pending = [buffer]
+        self._tail = buffer[-_BOUNDARY_OVERLAP:]
+
+        return completed
+
+    def close(self) -> List[Dict]:
+        """
+        Flush the final block once the stream has ended.
+        """
+
+        item = self._parse_block("".join(self._pending))
+        self._pending = []
+        self._tail = ""
+
+        return [item] if item else []
+
+    def _parse_block(self, block: str) -> Optional[Dict]:
+        match = _ISSUE_BLOCK_RE.search(block)
+        if not match:
+            return None
+
+        issue, citation, explanation = match.groups()
+
+        item = {
+            "issue": issue.strip(),
+            "citation": citation.strip(),
+            "explanation": explanation.strip(),
+        }
+
+        if self.classify:
+            item["risk"] = classify_section(item["citation"])
+
+        return item
+
+
+def iter_classified_issues(fragments: Iterable[str]) -> Iterator[Dict]:
+    """
+    Yield risk-classified issues while LLM output is still streaming.
+    """
+
+    parser = IncrementalIssueParser(classify=True)
+
+    for fragment in fragments:
+        yield from parser.feed(fragment)
+
+    yield from parser.close()
+
+
 def parse_llm_output(text: str) -> List[Dict]:
     """
     Extract structured issues from LLM output.
@@ -102,22 +242,10 @@ def parse_llm_output(text: str) -> List[Dict]:
     - Optional § symbol tolerance
     """
 
-    pattern = (
-        r"ISSUE:\s*(.*?)\s*"
-        r"TMEP\s*CITATION:\s*§?\s*([\d\.\(\)a-zA-Z]+)\s*"
-        r"TMEP-BASED\s*EXPLANATION:\s*(.*?)(?=\nISSUE:|\Z)"
-    )
-
-    matches = re.findall(pattern, text, re.DOTALL | re.IGNORECASE)
+    parser = IncrementalIssueParser(classify=False)
 
-    issues = []
-
-    for issue, citation, explanation in matches:
-        issues.append({
-            "issue": issue.strip(),
-            "citation": citation.strip(),
-            "explanation": explanation.strip(),
-        })
+    issues = parser.feed(text)
+    issues.extend(parser.close())
 
     return issues
 
@@ -158,6 +286,17 @@ def apply_risk_engine(
         if not issues:
             return "NO APPLICABLE TMEP PROVISION FOUND."
 
+    return render_risk_report(issues)
+
+
+def render_risk_report(issues: List[Dict]) -> str:
+    """
+    Render parsed issues as the final risk-assigned report.
+    """
+
+    if not issues:
+        return "NO APPLICABLE TMEP PROVISION FOUND."
+
     final_blocks = []
 
     for item in issues:
@@ -180,6 +319,30 @@ def apply_risk_engine(
     return "\n".join(final_blocks)
 
 
+# -------------------------------------------------
+# Multi-unit Merge
+# -------------------------------------------------
+
+def merge_issues(issue_lists: Iterable[List[Dict]]) -> List[Dict]:
+    """
+    Merge issues from independent analyses (e.g. one per class),
+    keeping the first issue seen for each citation.
+    """
+
+    merged: List[Dict] = []
+    seen_citations: set[str] = set()
+
+    for issues in issue_lists:
+        for item in issues:
+            key = item["citation"].strip().lower()
+            if key in seen_citations:
+                continue
+            seen_citations.add(key)
+            merged.append(item)
+
+    return merged
+
+
 
 
 
@@ -0,0 +1,148 @@
+# src/rag/risk_rules.py
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+DEFAULT_RULES_PATH = Path(__file__).with_name("risk_rules.json")
+
+# One TMEP citation component: "1207", ".01", "(a)", "(iii)"
+_COMPONENT_RE = re.compile(r"\d+|\.\d+|\([a-z0-9]+\)")
+
+
+# -------------------------------------------------
+# Citation Tokenization
+# -------------------------------------------------
+
+def split_section_components(section_id: str) -> List[str]:
+    """
+    Split a TMEP citation into its components.
+
+    "1209.01(c)(i)" -> ["1209", ".01", "(c)", "(i)"]
+
+    Tokenization stops at the first character that is not
+    part of a component, so trailing noise is ignored.
+    """
+
+    section_id = section_id.strip().lower()
+
+    components: List[str] = []
+    pos = 0
+
+    while pos < len(section_id):
+        match = _COMPONENT_RE.match(section_id, pos)
+        if not match:
+            break
+        components.append(match.group())
+        pos = match.end()
+
+    return components
+
+
+# -------------------------------------------------
+# Compiled Rule Table (prefix trie)
+# -------------------------------------------------
+
+class _TrieNode:
+    __slots__ = ("children", "risk")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.risk: Optional[str] = None
+
+
+class RiskRuleTable:
+    """
+    Immutable, compiled risk rule table.
+
+    Rules are stored in a trie keyed on citation components, so
+    classification is a single longest-match walk whose cost is
+    bounded by the length of the citation, not the rule count.
+    """
+
+    def __init__(self, version: str, default_risk: str, rules: Dict[str, List[str]]):
+        self.version = version
+        self.default_risk = default_risk
+        self.rules = {risk: list(prefixes) for risk, prefixes in rules.items()}
+        self._root = _TrieNode()
+
+        owners: Dict[tuple, str] = {}
+
+        for risk, prefixes in rules.items():
+            for prefix in prefixes:
+                components = split_section_components(prefix)
+
+                if "".join(components) != prefix.strip().lower():
+                    raise ValueError(f"Invalid risk rule prefix: {prefix!r}")
+
+                key = tuple(components)
+                if key in owners:
+                    raise ValueError(
+                        f"Risk rule {prefix!r} assigned to both "
+                        f"{owners[key]} and {risk}"
+                    )
+                owners[key] = risk
+
+                node = self._root
+                for component in components:
+                    node = node.children.setdefault(component, _TrieNode())
+                node.risk = risk
+
+    def classify(self, section_id: str) -> str:
+        """
+        Longest-prefix match over citation components.
+        """
+
+        risk = self.default_risk
+        node = self._root
+
+        for component in split_section_components(section_id):
+            node = node.children.get(component)
+            if node is None:
+                break
+            if node.risk is not None:
+                risk = node.risk
+
+        return risk
+
+    def __len__(self) -> int:
+        return sum(len(prefixes) for prefixes in self.rules.values())
+
+
+# -------------------------------------------------
+# Loading
+# -------------------------------------------------
+
+def load_risk_rules(path: Path = DEFAULT_RULES_PATH) -> RiskRuleTable:
+    """
+    Load and compile a versioned risk rule file.
+
+    Expected format:
+    {
+      "version": "2025-11.1",
+      "default_risk": "MEDIUM",
+      "rules": {"HIGH": ["1207", ...], ...}
+    }
+    """
+
+    path = Path(path)
+
+    if not path.exists():
+        raise FileNotFoundError(f"Risk rules file not found: {path}")
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+
+    for key in ("version", "default_risk", "rules"):
+        if key not in data:
+            raise ValueError(f"Risk rules file missing '{key}': {path}")
+
+    if not isinstance(data["rules"], dict):
+        raise ValueError(f"Risk rules 'rules' must be an object: {path}")
+
+    return RiskRuleTable(
+        version=str(data["version"]),
+        default_risk=data["default_risk"],
+        rules=data["rules"],
+    )
@@ -0,0 +1,169 @@
+# src/resilience/admission.py
+
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+from src.observability.metrics import (
+    ADMISSION_QUEUE_DEPTH,
+    ADMISSION_REJECTIONS,
+    ADMISSION_WAIT,
+)
+
+
+# -------------------------------------------------
+# Admission Control
+# -------------------------------------------------
+# At most `max_in_flight` requests run at once; up to `max_queue`
+# more wait in FIFO order. Everything beyond that is rejected at once,
+# and a queued request whose deadline passes while waiting leaves the
+# queue without ever starting work. Runs on the event loop, so waiting
+# requests do not occupy threadpool threads.
+#
+# A request may take several permits (a batch running several LLM
+# generations at once); it waits, in order, until all of them are free.
+
+class AdmissionRejected(Exception):
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(f"Request not admitted ({reason})")
+        self.reason = reason
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        name: str,
+        max_in_flight: int,
+        max_queue: int,
+        default_timeout: float,
+    ):
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.default_timeout = default_timeout
+
+        self._in_flight = 0
+        # (permits, future) in arrival order
+        self._waiters: Deque[Tuple[int, asyncio.Future]] = deque()
+        # Smoothed service time, for Retry-After estimates
+        self._service_seconds = 1.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_in_flight > 0
+
+    async def acquire(self, deadline: float, permits: int = 1) -> int:
+        """
+        Wait for `permits` slots until `deadline` (time.monotonic()).
+        Returns the number taken (capped at max_in_flight), to be
+        passed back to release().
+        Raises AdmissionRejected if the queue is full or the deadline
+        passes first.
+        """
+
+        permits = max(1, min(permits, self.max_in_flight))
+
+        if self._in_flight + permits <= self.max_in_flight and not self._waiters:
+            self._in_flight += permits
+            return permits
+
+        if len(self._waiters) >= self.max_queue:
+            self._reject("queue_full")
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            self._reject("deadline")
+
+        waiter = asyncio.get_running_loop().create_future()
+        entry = (permits, waiter)
+        self._waiters.append(entry)
+        ADMISSION_QUEUE_DEPTH.set(len(self._waiters), endpoint=self.name)
+        queued_at = time.monotonic()
+
+        try:
+            await asyncio.wait_for(waiter, timeout=remaining)
+
+        except asyncio.TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                # Slots handed over as the timeout fired: give them back
+                self.release(0.0, permits)
+            self._reject("deadline")
+
+        except asyncio.CancelledError:
+            # Client went away while queued
+            if waiter.done() and not waiter.cancelled():
+                self.release(0.0, permits)
+            raise
+
+        finally:
+            if entry in self._waiters:
+                self._waiters.remove(entry)
+                # A large request leaving the head may unblock others
+                self._admit_waiters()
+            ADMISSION_QUEUE_DEPTH.set(len(self._waiters), endpoint=self.name)
+
+        ADMISSION_WAIT.observe(time.monotonic() - queued_at, endpoint=self.name)
+        return permits
+
+    def release(self, service_seconds: Optional[float] = None, permits: int = 1) -> None:
+        """
+        Free `permits` slots and admit the oldest waiters that now fit.
+        """
+
+        if service_seconds:
+            self._service_seconds = 0.8 * self._service_seconds + 0.2 * service_seconds
+
+        self._in_flight -= permits
+        self._admit_waiters()
+
+    def _admit_waiters(self) -> None:
+        # Strict FIFO: a waiter that does not fit yet blocks the ones
+        # behind it, so a batch is not starved by single requests
+        while self._waiters:
+            permits, waiter = self._waiters[0]
+            if waiter.done():
+                self._waiters.popleft()
+                continue
+            if self._in_flight + permits > self.max_in_flight:
+                return
+
+            self._waiters.popleft()
+            self._in_flight += permits
+            waiter.set_result(None)
+
+    def retry_after(self) -> float:
+        """
+        Rough time until a newly queued request would be admitted.
+        """
+
+        slots = max(1, self.max_in_flight)
+        return self._service_seconds * (len(self._waiters) + 1) / slots
+
+    def status(self) -> dict:
+        return {
+            "in_flight": self._in_flight,
+            "queued": len(self._waiters),
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+        }
+
+    def _reject(self, reason: str) -> None:
+        ADMISSION_REJECTIONS.inc(endpoint=self.name, reason=reason)
+        raise AdmissionRejected(reason, self.retry_after())
+
+
+# max_in_flight=0 disables admission control for the endpoint
+ANALYZE_ADMISSION = AdmissionController(
+    "analyze",
+    max_in_flight=int(os.getenv("ANALYZE_MAX_IN_FLIGHT", "16")),
+    max_queue=int(os.getenv("ANALYZE_MAX_QUEUE", "32")),
+    default_timeout=float(os.getenv("ANALYZE_QUEUE_TIMEOUT_MS", "10000")) / 1000,
+)
@@ -0,0 +1,259 @@
+# src/resilience/circuit_breaker.py
+
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Tuple, Type
+
+from src.observability.metrics import CIRCUIT_STATE, CIRCUIT_REJECTIONS
+
+
+# -------------------------------------------------
+# Circuit Breaker
+# -------------------------------------------------
+# CLOSED: calls go through; outcomes are kept for a sliding time
+#   window and the breaker opens once the failure rate over at least
+#   `minimum_calls` calls reaches `failure_rate_threshold`.
+# OPEN: calls are rejected immediately with CircuitOpenError until
+#   `open_seconds` have passed.
+# HALF_OPEN: up to `half_open_max_calls` probe calls go through; a
+#   successful probe closes the breaker, a failed one re-opens it.
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(RuntimeError):
+    """
+    Raised instead of calling a dependency whose breaker is open.
+    """
+
+    def __init__(self, breaker: str, retry_after: float):
+        super().__init__(f"{breaker} unavailable (circuit open)")
+        self.breaker = breaker
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        minimum_calls: int = 5,
+        window_seconds: float = 30.0,
+        open_seconds: float = 30.0,
+        half_open_max_calls: int = 1,
+        ignore: Tuple[Type[BaseException], ...] = (),
+    ):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        # Exceptions that are a valid answer, not a dependency failure
+        self.ignore = ignore
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+
+        CIRCUIT_STATE.set(0, breaker=name)
+
+    # -------------------------------------------------
+    # Call Accounting
+    # -------------------------------------------------
+
+    @contextmanager
+    def guard(self):
+        """
+        Wrap one call to the dependency:
+
+            with BREAKER.guard():
+                response = dependency()
+        """
+
+        probe = self._acquire()
+        try:
+            yield
+        except self.ignore:
+            self._record(True, probe)
+            raise
+        except Exception:
+            self._record(False, probe)
+            raise
+        except BaseException:
+            # KeyboardInterrupt, SystemExit, CancelledError: shutdown or
+            # cancellation says nothing about the dependency
+            self._release(probe)
+            raise
+        else:
+            self._record(True, probe)
+
+    def check(self) -> None:
+        """
+        Raise CircuitOpenError if a call would be rejected right now,
+        without consuming a half-open probe slot.
+        """
+
+        with self._lock:
+            self._maybe_half_open(time.monotonic())
+            if self._state == OPEN:
+                raise self._rejection(time.monotonic())
+
+    def _acquire(self) -> bool:
+        now = time.monotonic()
+
+        with self._lock:
+            self._maybe_half_open(now)
+
+            if self._state == CLOSED:
+                return False
+
+            if self._state == HALF_OPEN and self._probes_in_flight < self.half_open_max_calls:
+                self._probes_in_flight += 1
+                return True
+
+            error = self._rejection(now)
+
+        CIRCUIT_REJECTIONS.inc(breaker=self.name)
+        raise error
+
+    def _release(self, probe: bool) -> None:
+        """
+        Give back a half-open probe slot without recording an outcome.
+        """
+
+        if probe:
+            with self._lock:
+                self._probes_in_flight -= 1
+
+    def _record(self, success: bool, probe: bool) -> None:
+        now = time.monotonic()
+
+        with self._lock:
+            if probe:
+                self._probes_in_flight -= 1
+                if success:
+                    self._transition(CLOSED)
+                else:
+                    self._open(now)
+                return
+
+            if self._state != CLOSED:
+                # Late result of a call admitted before the breaker opened
+                return
+
+            self._outcomes.append((now, success))
+            if not success:
+                self._failures += 1
+            self._evict(now)
+
+            calls = len(self._outcomes)
+            if (
+                calls >= self.minimum_calls
+                and self._failures / calls >= self.failure_rate_threshold
+            ):
+                self._open(now)
+
+    # -------------------------------------------------
+    # State Transitions (lock held)
+    # -------------------------------------------------
+
+    def _evict(self, now: float) -> None:
+        horizon = now - self.window_seconds
+        while self._outcomes and self._outcomes[0][0] < horizon:
+            _, success = self._outcomes.popleft()
+            if not success:
+                self._failures -= 1
+
+    def _maybe_half_open(self, now: float) -> None:
+        if self._state == OPEN and now - self._opened_at >= self.open_seconds:
+            self._transition(HALF_OPEN)
+
+    def _open(self, now: float) -> None:
+        self._opened_at = now
+        self._transition(OPEN)
+
+    def _transition(self, state: str) -> None:
+        self._state = state
+        self._outcomes.clear()
+        self._failures = 0
+        if state != HALF_OPEN:
+            self._probes_in_flight = 0
+        CIRCUIT_STATE.set(_STATE_VALUES[state], breaker=self.name)
+
+    def _rejection(self, now: float) -> CircuitOpenError:
+        if self._state == OPEN:
+            retry_after = self.open_seconds - (now - self._opened_at)
+        else:
+            # Half-open with every probe slot taken
+            retry_after = 1.0
+        return CircuitOpenError(self.name, max(retry_after, 0.0))
+
+    # -------------------------------------------------
+    # Introspection
+    # -------------------------------------------------
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open(time.monotonic())
+            return self._state
+
+    def status(self) -> Dict:
+        now = time.monotonic()
+
+        with self._lock:
+            self._maybe_half_open(now)
+            self._evict(now)
+            calls = len(self._outcomes)
+
+            status = {
+                "state": self._state,
+                "calls_in_window": calls,
+                "failure_rate": self._failures / calls if calls else 0.0,
+            }
+            if self._state == OPEN:
+                status["retry_after_seconds"] = round(
+                    max(0.0, self.open_seconds - (now - self._opened_at)), 1
+                )
+
+        return status
+
+
+# -------------------------------------------------
+# Dependency Breakers
+# -------------------------------------------------
+
+def _breaker_from_env(name: str, prefix: str, **kwargs) -> CircuitBreaker:
+    return CircuitBreaker(
+        name,
+        failure_rate_threshold=float(os.getenv(f"{prefix}_FAILURE_RATE", "0.5")),
+        minimum_calls=int(os.getenv(f"{prefix}_MIN_CALLS", "5")),
+        window_seconds=float(os.getenv(f"{prefix}_WINDOW_SECONDS", "30")),
+        open_seconds=float(os.getenv(f"{prefix}_OPEN_SECONDS", "30")),
+        half_open_max_calls=int(os.getenv(f"{prefix}_HALF_OPEN_CALLS", "1")),
+        **kwargs,
+    )
+
+
+# "No sufficiently relevant TMEP sections" is a ValueError and means
+# Weaviate answered; it must not count towards opening the breaker.
+WEAVIATE_BREAKER = _breaker_from_env("weaviate", "WEAVIATE_BREAKER", ignore=(ValueError,))
+LLM_BREAKER = _breaker_from_env("llm", "LLM_BREAKER")
+
+BREAKERS = (WEAVIATE_BREAKER, LLM_BREAKER)
@@ -0,0 +1,152 @@
+# src/serialization.py
+
+import json
+import mmap
+from pathlib import Path
+from typing import Any, Iterable
+
+try:
+    import orjson
+except ImportError:  # stdlib fallback keeps the pipeline usable
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+MSGPACK_SUFFIXES = {".msgpack", ".mpk"}
+
+
+# -------------------------------------------------
+# JSON (orjson when available, stdlib otherwise)
+# -------------------------------------------------
+
+def dumps_json(obj: Any, pretty: bool = False) -> bytes:
+    """
+    Encode to UTF-8 JSON bytes. Non-ASCII text is kept as-is,
+    matching json.dumps(..., ensure_ascii=False).
+    """
+
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+
+    return json.dumps(
+        obj,
+        indent=2 if pretty else None,
+        ensure_ascii=False,
+        separators=None if pretty else (",", ":"),
+    ).encode("utf-8")
+
+
+def loads_json(data: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# -------------------------------------------------
+# MessagePack (compact binary for intermediate artifacts)
+# -------------------------------------------------
+
+def dumps_msgpack(obj: Any) -> bytes:
+    if msgpack is None:
+        raise RuntimeError("msgpack is not installed; use a .json artifact path.")
+    return msgpack.packb(obj, use_bin_type=True)
+
+
+def loads_msgpack(data: bytes) -> Any:
+    if msgpack is None:
+        raise RuntimeError("msgpack is not installed; cannot read .msgpack artifact.")
+    return msgpack.unpackb(data, raw=False)
+
+
+# -------------------------------------------------
+# Artifact files (format chosen by file suffix)
+# -------------------------------------------------
+
+def write_artifact(obj: Any, output_path: Path, pretty: bool = True) -> None:
+    """
+    Write a pipeline artifact. ".msgpack"/".mpk" paths are written
+    as MessagePack, everything else as JSON.
+    """
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    if output_path.suffix in MSGPACK_SUFFIXES:
+        output_path.write_bytes(dumps_msgpack(obj))
+    else:
+        output_path.write_bytes(dumps_json(obj, pretty=pretty))
+
+
+def read_artifact(input_path: Path) -> Any:
+    input_path = Path(input_path)
+
+    if input_path.suffix in MSGPACK_SUFFIXES:
+        return loads_msgpack(input_path.read_bytes())
+
+    return loads_json(input_path.read_bytes())
+
+
+# -------------------------------------------------
+# String Arena (memory-mapped, shared across processes)
+# -------------------------------------------------
+# <prefix>.bin holds every string back to back as UTF-8;
+# <prefix>.offsets.npy holds N+1 int64 offsets. Readers mmap both
+# read-only, so every process maps the same page-cache pages and a
+# string is only decoded when it is accessed.
+
+def write_string_arena(strings: Iterable[str], prefix: Path) -> int:
+    import numpy as np
+
+    prefix = Path(prefix)
+    prefix.parent.mkdir(parents=True, exist_ok=True)
+
+    offsets = [0]
+    with open(Path(f"{prefix}.bin"), "wb") as f:
+        for value in strings:
+            encoded = value.encode("utf-8")
+            f.write(encoded)
+            offsets.append(offsets[-1] + len(encoded))
+
+    np.save(Path(f"{prefix}.offsets.npy"), np.asarray(offsets, dtype=np.int64))
+    return len(offsets) - 1
+
+
+class StringArena:
+    __slots__ = ("_buffer", "_offsets", "_file")
+
+    def __init__(self, prefix: Path):
+        import numpy as np
+
+        prefix = Path(prefix)
+        self._offsets = np.load(Path(f"{prefix}.offsets.npy"), mmap_mode="r")
+        self._file = open(Path(f"{prefix}.bin"), "rb")
+
+        # mmap of an empty file is an error
+        if self._offsets[-1] > 0:
+            self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._buffer = b""
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return self.get_bytes(i).decode("utf-8")
+
+    def get_bytes(self, i: int) -> bytes:
+        if i < 0:
+            i += len(self)
+        start, end = int(self._offsets[i]), int(self._offsets[i + 1])
+        return self._buffer[start:end]
+
+    def close(self) -> None:
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        self._file.close()
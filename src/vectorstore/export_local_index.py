@@ -0,0 +1,119 @@
+# src/vectorstore/export_local_index.py
+
+import argparse
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from src.processing.chunk_store import read_chunks
+from src.vectorstore.local_index import (
+    LOCAL_INDEX_DIR,
+    LOCAL_INDEX_IVF_LISTS,
+    RECORD_FIELDS,
+    build_local_index,
+)
+
+
+# -------------------------------------------------
+# Build the memory-mapped retrieval index
+# -------------------------------------------------
+# --from-weaviate reuses the vectors Weaviate already computed (no
+# re-embedding of the corpus); --from-chunks embeds the chunk
+# artifact (or chunk store directory) locally with the same model
+# used for queries.
+
+def export_from_weaviate() -> tuple:
+    from src.embeddings.query_embedding import EMBEDDING_MODEL
+    from .weaviate_client import get_client, CLASS_NAME, collection_embedding_model
+
+    client = get_client()
+    records: List[Dict] = []
+    vectors: List[List[float]] = []
+
+    try:
+        collection = client.collections.get(CLASS_NAME)
+
+        # The manifest records EMBEDDING_MODEL; only true if Weaviate
+        # embedded with it
+        model = collection_embedding_model(collection)
+        if model != EMBEDDING_MODEL:
+            raise ValueError(
+                f"'{CLASS_NAME}' vectors come from {model or 'an unpinned server default model'}, "
+                f"not EMBEDDING_MODEL={EMBEDDING_MODEL}; use --from-chunks instead"
+            )
+
+        for obj in collection.iterator(include_vector=True):
+            vector = obj.vector
+            if isinstance(vector, dict):
+                vector = vector.get("default") or next(iter(vector.values()), None)
+            if not vector:
+                continue
+
+            records.append({f: obj.properties.get(f) for f in RECORD_FIELDS})
+            vectors.append(vector)
+
+    finally:
+        client.close()
+
+    return records, np.asarray(vectors, dtype=np.float32)
+
+
+def export_from_chunks(chunks_path: Path, batch_size: int) -> tuple:
+    from src.embeddings.query_embedding import embed_texts
+
+    chunks = read_chunks(chunks_path)
+
+    records = [
+        {
+            "chunk_id": c["chunk_id"],
+            "text": c["chunk_text"],
+            "section_id": c["section_id"],
+            "section_path": c["section_path"],
+            "source_file": c.get("source_file"),
+            "doc_version": c["doc_version"],
+            "source": c["source"],
+        }
+        for c in chunks
+    ]
+
+    vectors = embed_texts([r["text"] for r in records], batch_size=batch_size)
+    return records, vectors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the local memory-mapped retrieval index.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--from-weaviate", action="store_true")
+    source.add_argument("--from-chunks", type=Path, metavar="CHUNKS_PATH")
+    parser.add_argument("--output", type=Path, default=LOCAL_INDEX_DIR)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--ivf-lists", default=LOCAL_INDEX_IVF_LISTS, help='IVF cells: 0 = none, "auto" = 4 * sqrt(N)')
+    args = parser.parse_args()
+
+    from src.embeddings.query_embedding import EMBEDDING_MODEL
+
+    start = time.perf_counter()
+
+    if args.from_weaviate:
+        records, vectors = export_from_weaviate()
+    else:
+        records, vectors = export_from_chunks(args.from_chunks, args.batch_size)
+
+    if not records:
+        raise ValueError("No chunks to index.")
+
+    build_local_index(
+        records, vectors, args.output,
+        embedding_model=EMBEDDING_MODEL, ivf_lists=args.ivf_lists,
+    )
+
+    print(
+        f"✅ Local index written to {args.output}: {len(records)} chunks, "
+        f"dim {vectors.shape[1]} ({time.perf_counter() - start:.1f}s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
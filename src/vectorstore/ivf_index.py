@@ -0,0 +1,336 @@
+# src/vectorstore/ivf_index.py
+
+import math
+import os
+import shutil
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.serialization import read_artifact, write_artifact
+
+
+IVF_FORMAT = 1
+IVF_NPROBE = int(os.getenv("LOCAL_INDEX_NPROBE", "8"))
+
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLES_PER_LIST = 64
+ASSIGN_BLOCK_ROWS = 16384
+
+
+# -------------------------------------------------
+# Inverted File (IVF) Index
+# -------------------------------------------------
+# Spherical k-means splits the (L2-normalised) vectors into n_lists
+# cells; a query scans only the nprobe cells whose centroids are
+# closest, so cost grows with N * nprobe / n_lists instead of N.
+# nprobe is the recall/latency knob (nprobe = n_lists is exact).
+#
+#   manifest.json        count, dim, n_lists, doc_versions
+#   centroids.npy        float32 [L, D]
+#   vectors.npy          float32 [N, D], grouped by list
+#   ids.npy              int64 [N], caller's id for each vector
+#   version_codes.npy    uint16 [N], index into doc_versions
+#   offsets.npy          int64 [L+1], list ranges into the above
+#
+# Loaded with mmap; vectors added after loading are kept in a small
+# in-memory delta (scanned on every query) until the next save().
+
+
+def default_n_lists(n: int) -> int:
+    return max(1, int(4 * math.sqrt(n)))
+
+
+def train_kmeans(
+    vectors: np.ndarray,
+    n_lists: int,
+    iterations: int = KMEANS_ITERATIONS,
+    seed: int = 0,
+) -> np.ndarray:
+    """
+    Spherical k-means on a sample of the vectors; returns unit-norm
+    centroids.
+    """
+
+    rng = np.random.default_rng(seed)
+    n = len(vectors)
+    n_lists = min(n_lists, n)
+
+    sample_size = min(n, n_lists * KMEANS_SAMPLES_PER_LIST)
+    sample = np.asarray(vectors[np.sort(rng.choice(n, sample_size, replace=False))], dtype=np.float32)
+
+    centroids = sample[rng.choice(sample_size, n_lists, replace=False)].copy()
+
+    for _ in range(iterations):
+        assign = _assign(sample, centroids)
+        counts = np.bincount(assign, minlength=n_lists)
+
+        # Per-cell sums in one pass over the sample sorted by cell
+        order = np.argsort(assign, kind="stable")
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        filled = counts > 0
+        sums = np.zeros_like(centroids)
+        sums[filled] = np.add.reduceat(sample[order], starts[filled], axis=0)
+
+        # Re-seed empty cells with random sample points
+        empty = np.flatnonzero(counts == 0)
+        if len(empty):
+            sums[empty] = sample[rng.choice(sample_size, len(empty), replace=False)]
+
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        centroids = sums / norms
+
+    return centroids.astype(np.float32)
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    assign = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), ASSIGN_BLOCK_ROWS):
+        block = np.asarray(vectors[start:start + ASSIGN_BLOCK_ROWS], dtype=np.float32)
+        assign[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return assign
+
+
+class IVFIndex:
+    def __init__(
+        self,
+        centroids: np.ndarray,
+        vectors: np.ndarray,
+        ids: np.ndarray,
+        version_codes: np.ndarray,
+        offsets: np.ndarray,
+        doc_versions: List[str],
+    ):
+        self.centroids = centroids
+        self._vectors = vectors
+        self._ids = ids
+        self._version_codes = version_codes
+        self._offsets = offsets
+        self.doc_versions = list(doc_versions)
+        self._version_index = {v: i for i, v in enumerate(self.doc_versions)}
+
+        # Incremental additions since the last save
+        self._delta_vectors: List[np.ndarray] = []
+        self._delta_ids: List[np.ndarray] = []
+        self._delta_codes: List[np.ndarray] = []
+
+    @property
+    def n_lists(self) -> int:
+        return len(self.centroids)
+
+    def __len__(self) -> int:
+        return len(self._ids) + sum(len(i) for i in self._delta_ids)
+
+    # -------------------------------------------------
+    # Build / Add
+    # -------------------------------------------------
+
+    @classmethod
+    def build(
+        cls,
+        vectors: np.ndarray,
+        doc_versions: Sequence[str],
+        ids: Optional[np.ndarray] = None,
+        n_lists: Optional[int] = None,
+        seed: int = 0,
+    ) -> "IVFIndex":
+        """
+        vectors must be L2-normalised; doc_versions has one label per
+        vector; ids default to row numbers.
+        """
+
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if len(doc_versions) != len(vectors):
+            raise ValueError("vectors and doc_versions must have the same length.")
+        if len(vectors) == 0:
+            raise ValueError("Cannot build an IVF index from no vectors.")
+
+        ids = np.arange(len(vectors), dtype=np.int64) if ids is None else np.asarray(ids, dtype=np.int64)
+        versions = sorted(set(doc_versions))
+        version_index = {v: i for i, v in enumerate(versions)}
+        codes = np.asarray([version_index[v] for v in doc_versions], dtype=np.uint16)
+
+        centroids = train_kmeans(vectors, n_lists or default_n_lists(len(vectors)), seed=seed)
+        assign = _assign(vectors, centroids)
+
+        order = np.argsort(assign, kind="stable")
+        offsets = np.zeros(len(centroids) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(np.bincount(assign, minlength=len(centroids)))
+
+        return cls(centroids, vectors[order], ids[order], codes[order], offsets, versions)
+
+    def add(self, vectors: np.ndarray, doc_versions: Sequence[str], ids: np.ndarray) -> None:
+        """
+        Add vectors without retraining; searched from an in-memory
+        delta until save() folds them into their lists.
+        """
+
+        vectors = np.asarray(vectors, dtype=np.float32)
+        for v in doc_versions:
+            if v not in self._version_index:
+                self._version_index[v] = len(self.doc_versions)
+                self.doc_versions.append(v)
+
+        self._delta_vectors.append(vectors)
+        self._delta_ids.append(np.asarray(ids, dtype=np.int64))
+        self._delta_codes.append(
+            np.asarray([self._version_index[v] for v in doc_versions], dtype=np.uint16)
+        )
+
+    # -------------------------------------------------
+    # Search
+    # -------------------------------------------------
+
+    def search(
+        self,
+        query: np.ndarray,
+        top_k: int,
+        nprobe: int = IVF_NPROBE,
+        doc_version: Optional[str] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns (ids, cosine scores), best first. With a doc_version
+        filter, probing widens until top_k matches are found (or every
+        list has been scanned).
+        """
+
+        query = np.asarray(query, dtype=np.float32)
+
+        code = None
+        if doc_version is not None:
+            code = self._version_index.get(doc_version)
+            if code is None:
+                return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        ranked_lists = np.argsort(-(self.centroids @ query))
+        nprobe = max(1, min(nprobe, self.n_lists))
+        scanned = 0
+
+        ids: List[np.ndarray] = []
+        scores: List[np.ndarray] = []
+        found = 0
+
+        for part_ids, part_scores in self._scan_delta(query, code):
+            ids.append(part_ids)
+            scores.append(part_scores)
+            found += len(part_ids)
+
+        while scanned < self.n_lists:
+            for cell in ranked_lists[scanned:nprobe]:
+                start, end = int(self._offsets[cell]), int(self._offsets[cell + 1])
+                if start == end:
+                    continue
+
+                list_scores = np.asarray(self._vectors[start:end]) @ query
+                list_ids = np.asarray(self._ids[start:end])
+
+                if code is not None:
+                    keep = np.asarray(self._version_codes[start:end]) == code
+                    list_scores, list_ids = list_scores[keep], list_ids[keep]
+
+                ids.append(list_ids)
+                scores.append(list_scores)
+                found += len(list_ids)
+
+            scanned = nprobe
+            if found >= top_k:
+                break
+            nprobe = min(nprobe * 2, self.n_lists)
+
+        if not ids:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        all_ids = np.concatenate(ids)
+        all_scores = np.concatenate(scores)
+
+        k = min(top_k, len(all_scores))
+        if k == 0:
+            return all_ids[:0], all_scores[:0]
+
+        top = np.argpartition(-all_scores, k - 1)[:k]
+        top = top[np.argsort(-all_scores[top])]
+        return all_ids[top], all_scores[top]
+
+    def _scan_delta(self, query: np.ndarray, code: Optional[int]):
+        for vectors, ids, codes in zip(self._delta_vectors, self._delta_ids, self._delta_codes):
+            scores = vectors @ query
+            if code is not None:
+                keep = codes == code
+                scores, ids = scores[keep], ids[keep]
+            yield ids, scores
+
+    # -------------------------------------------------
+    # Persistence
+    # -------------------------------------------------
+
+    def save(self, output_dir: Path) -> Path:
+        """
+        Fold the delta into its lists and write the index, swapping
+        the directory into place atomically.
+        """
+
+        vectors, ids, codes, offsets = self._vectors, self._ids, self._version_codes, self._offsets
+
+        if self._delta_ids:
+            new_vectors = np.concatenate(self._delta_vectors)
+            assign = np.concatenate([
+                np.repeat(np.arange(self.n_lists), np.diff(offsets)),
+                _assign(new_vectors, self.centroids),
+            ])
+            order = np.argsort(assign, kind="stable")
+
+            vectors = np.concatenate([np.asarray(vectors), new_vectors])[order]
+            ids = np.concatenate([np.asarray(ids)] + self._delta_ids)[order]
+            codes = np.concatenate([np.asarray(codes)] + self._delta_codes)[order]
+            offsets = np.zeros(self.n_lists + 1, dtype=np.int64)
+            offsets[1:] = np.cumsum(np.bincount(assign, minlength=self.n_lists))
+
+        output_dir = Path(output_dir)
+        staging = output_dir.with_name(output_dir.name + ".tmp")
+        if staging.exists():
+            shutil.rmtree(staging)
+        staging.mkdir(parents=True)
+
+        np.save(staging / "centroids.npy", self.centroids)
+        np.save(staging / "vectors.npy", np.asarray(vectors, dtype=np.float32))
+        np.save(staging / "ids.npy", np.asarray(ids, dtype=np.int64))
+        np.save(staging / "version_codes.npy", np.asarray(codes, dtype=np.uint16))
+        np.save(staging / "offsets.npy", np.asarray(offsets, dtype=np.int64))
+
+        write_artifact({
+            "format": IVF_FORMAT,
+            "count": int(len(ids)),
+            "dim": int(self.centroids.shape[1]),
+            "n_lists": self.n_lists,
+            "doc_versions": self.doc_versions,
+        }, staging / "manifest.json")
+
+        previous = output_dir.with_name(output_dir.name + ".old")
+        if output_dir.exists():
+            if previous.exists():
+                shutil.rmtree(previous)
+            output_dir.rename(previous)
+        staging.rename(output_dir)
+        if previous.exists():
+            shutil.rmtree(previous)
+
+        return output_dir
+
+    @classmethod
+    def load(cls, index_dir: Path) -> "IVFIndex":
+        index_dir = Path(index_dir)
+        manifest = read_artifact(index_dir / "manifest.json")
+
+        if manifest.get("format") != IVF_FORMAT:
+            raise RuntimeError(f"Unsupported IVF index format in {index_dir}")
+
+        return cls(
+            centroids=np.load(index_dir / "centroids.npy"),
+            vectors=np.load(index_dir / "vectors.npy", mmap_mode="r"),
+            ids=np.load(index_dir / "ids.npy", mmap_mode="r"),
+            version_codes=np.load(index_dir / "version_codes.npy", mmap_mode="r"),
+            offsets=np.load(index_dir / "offsets.npy"),
+            doc_versions=manifest["doc_versions"],
+        )
@@ -0,0 +1,373 @@
+# src/vectorstore/local_index.py
+
+import logging
+import os
+import shutil
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.serialization import (
+    StringArena,
+    dumps_json,
+    loads_json,
+    read_artifact,
+    write_artifact,
+    write_string_arena,
+)
+from src.vectorstore.ivf_index import IVF_NPROBE, IVFIndex, default_n_lists
+from src.vectorstore.quantization import QUANTIZATION_MODES, QuantizedSearch, write_quantized
+
+
+LOCAL_INDEX_DIR = Path(os.getenv("LOCAL_INDEX_DIR", "data/index"))
+INDEX_FORMAT = 1
+
+# exact | int8 | binary | ivf: quantized modes scan compact codes and
+# rescore the best top_k * LOCAL_INDEX_RESCORE_FACTOR rows exactly;
+# ivf scans LOCAL_INDEX_NPROBE k-means cells (see ivf_index.py)
+LOCAL_INDEX_SEARCH = os.getenv("LOCAL_INDEX_SEARCH", "exact").lower()
+LOCAL_INDEX_RESCORE_FACTOR = int(os.getenv("LOCAL_INDEX_RESCORE_FACTOR", "10"))
+
+# IVF cells built with the index: 0 = none, "auto" = 4 * sqrt(N)
+LOCAL_INDEX_IVF_LISTS = os.getenv("LOCAL_INDEX_IVF_LISTS", "0")
+
+RECORD_FIELDS = (
+    "chunk_id", "text", "section_id", "section_path",
+    "source_file", "doc_version", "source",
+)
+
+
+# -------------------------------------------------
+# Memory-mapped Retrieval Index
+# -------------------------------------------------
+# Built once, offline; every uvicorn worker maps the same files
+# read-only, so vectors and chunk records live in the shared page
+# cache instead of in each worker's heap. LOCAL_INDEX_DIR is a
+# symlink to the current build (<name>.v<ns>/), replaced atomically:
+#
+#   manifest.json            count, dim, doc_versions, embedding model
+#   vectors.npy              float32 [N, D], L2-normalised
+#   vectors.int8.npy (+ _scales) / vectors.binary.npy  quantized codes
+#   doc_version_codes.npy    uint16 [N], index into doc_versions
+#   ivf/                     optional IVF index over the same rows
+#   records.bin/.offsets.npy one JSON record per chunk (string arena);
+#                            a copy, not chunk store rows: the index
+#                            spans several editions (upgrade_edition,
+#                            --from-weaviate), the chunk store one
+#   sections.bin/.offsets.npy sorted unique section_ids
+#   section_starts.npy       int64 [S+1] ranges into section_rows.npy
+#   section_rows.npy         int64 [N] chunk rows grouped by section
+
+
+def build_local_index(
+    records: Sequence[Dict],
+    vectors: np.ndarray,
+    output_dir: Path = LOCAL_INDEX_DIR,
+    embedding_model: Optional[str] = None,
+    ivf_lists: str = LOCAL_INDEX_IVF_LISTS,
+) -> Path:
+    """
+    Write the index files into a new versioned directory, then point
+    the `output_dir` symlink at it in one os.replace(), so a worker
+    opening the index always finds a complete one. The previous build
+    is kept (a worker may be opening it right now); older ones go.
+    """
+
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if len(records) != len(vectors):
+        raise ValueError("records and vectors must have the same length.")
+
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    vectors = vectors / norms
+
+    output_dir = Path(output_dir)
+    staging = output_dir.with_name(f"{output_dir.name}.v{time.time_ns()}")
+    staging.mkdir(parents=True)
+
+    doc_versions = sorted({r["doc_version"] for r in records})
+    version_code = {v: i for i, v in enumerate(doc_versions)}
+
+    np.save(staging / "vectors.npy", vectors)
+    write_quantized(vectors, staging)
+    np.save(
+        staging / "doc_version_codes.npy",
+        np.asarray([version_code[r["doc_version"]] for r in records], dtype=np.uint16),
+    )
+
+    write_string_arena(
+        (dumps_json({f: r.get(f) for f in RECORD_FIELDS}).decode("utf-8") for r in records),
+        staging / "records",
+    )
+
+    by_section: Dict[str, List[int]] = {}
+    for row, r in enumerate(records):
+        by_section.setdefault(r["section_id"], []).append(row)
+
+    section_ids = sorted(by_section)
+    starts = [0]
+    rows: List[int] = []
+    for sid in section_ids:
+        rows.extend(by_section[sid])
+        starts.append(len(rows))
+
+    n_lists = 0
+    if len(records) and str(ivf_lists) != "0":
+        n_lists = default_n_lists(len(records)) if ivf_lists == "auto" else int(ivf_lists)
+        ivf = IVFIndex.build(vectors, [r["doc_version"] for r in records], n_lists=n_lists)
+        ivf.save(staging / "ivf")
+        n_lists = ivf.n_lists
+
+    write_string_arena(section_ids, staging / "sections")
+    np.save(staging / "section_starts.npy", np.asarray(starts, dtype=np.int64))
+    np.save(staging / "section_rows.npy", np.asarray(rows, dtype=np.int64))
+
+    write_artifact({
+        "format": INDEX_FORMAT,
+        "count": len(records),
+        "dim": int(vectors.shape[1]) if vectors.ndim == 2 else 0,
+        "doc_versions": doc_versions,
+        "embedding_model": embedding_model,
+        "quantization": list(QUANTIZATION_MODES),
+        "ivf_lists": n_lists,
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }, staging / "manifest.json")
+
+    _point_link(output_dir, staging)
+
+    return output_dir
+
+
+def _point_link(link: Path, target: Path) -> None:
+    """
+    Atomically repoint `link` at `target` (a sibling directory) and
+    delete the builds older than the one it replaced.
+    """
+
+    previous = None
+    if link.is_symlink():
+        previous = link.with_name(os.readlink(link)).name
+    elif link.exists():
+        # Plain directory from before versioned builds: moved aside
+        # once, the only time the path is briefly missing
+        previous = f"{link.name}.v0"
+        logging.warning(f"Replacing plain index directory {link} with a symlink")
+        link.rename(link.with_name(previous))
+
+    tmp_link = link.with_name(link.name + ".link.tmp")
+    if tmp_link.is_symlink() or tmp_link.exists():
+        tmp_link.unlink()
+    os.symlink(target.name, tmp_link)
+    os.replace(tmp_link, link)
+
+    for old in link.parent.glob(f"{link.name}.v*"):
+        if old.name not in (target.name, previous) and old.is_dir():
+            shutil.rmtree(old, ignore_errors=True)
+
+
+class LocalIndex:
+    def __init__(
+        self,
+        index_dir: Path = LOCAL_INDEX_DIR,
+        search_mode: str = LOCAL_INDEX_SEARCH,
+        embedding_model: Optional[str] = None,
+        dim: Optional[int] = None,
+    ):
+        """
+        `embedding_model` / `dim`, when given, must match the manifest:
+        vectors from another model are not comparable (a different
+        dim fails every search, the same dim returns noise).
+        """
+
+        # Resolved once: every file comes from the same build even if
+        # the symlink is repointed while they are opened
+        index_dir = Path(index_dir).resolve()
+        self.manifest = read_artifact(index_dir / "manifest.json")
+
+        if self.manifest.get("format") != INDEX_FORMAT:
+            raise RuntimeError(f"Unsupported local index format in {index_dir}")
+        if embedding_model is not None and self.manifest.get("embedding_model") != embedding_model:
+            raise RuntimeError(
+                f"Local index in {index_dir} was built with embedding model "
+                f"{self.manifest.get('embedding_model')!r}, but queries are embedded with "
+                f"{embedding_model!r}; rebuild it with src.vectorstore.export_local_index"
+            )
+        if dim is not None and self.manifest.get("dim") != dim:
+            raise RuntimeError(
+                f"Local index in {index_dir} has {self.manifest.get('dim')}-dim vectors, "
+                f"but {embedding_model or 'the query model'} produces {dim}"
+            )
+
+        self._vectors = np.load(index_dir / "vectors.npy", mmap_mode="r")
+        self._codes = np.load(index_dir / "doc_version_codes.npy", mmap_mode="r")
+        self._records = StringArena(index_dir / "records")
+        self._sections = StringArena(index_dir / "sections")
+        self._section_starts = np.load(index_dir / "section_starts.npy", mmap_mode="r")
+        self._section_rows = np.load(index_dir / "section_rows.npy", mmap_mode="r")
+        self._version_codes = {
+            v: i for i, v in enumerate(self.manifest["doc_versions"])
+        }
+
+        self._quantized: Optional[QuantizedSearch] = None
+        self._ivf: Optional[IVFIndex] = None
+        if search_mode == "ivf" and self.manifest.get("ivf_lists"):
+            self._ivf = IVFIndex.load(index_dir / "ivf")
+        elif search_mode != "exact":
+            if search_mode in self.manifest.get("quantization", []):
+                self._quantized = QuantizedSearch(index_dir, search_mode, self._vectors)
+            else:
+                logging.warning(
+                    f"Local index in {index_dir} has no {search_mode} codes; using exact search"
+                )
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def record(self, row: int) -> Dict:
+        return loads_json(self._records.get_bytes(row))
+
+    def vectors(self, rows: Sequence[int]) -> np.ndarray:
+        return np.asarray(self._vectors[np.asarray(rows, dtype=np.int64)], dtype=np.float32)
+
+    def version_rows(self, doc_version: str) -> List[int]:
+        code = self._version_codes.get(doc_version)
+        if code is None:
+            return []
+        return [int(r) for r in np.flatnonzero(self._codes == code)]
+
+    def search(
+        self,
+        query_vector: np.ndarray,
+        top_k: int,
+        doc_version: Optional[str] = None,
+    ) -> List[Tuple[Dict, float]]:
+        """
+        Cosine search. Returns (record, cosine distance) pairs,
+        best first, in the shape weaviate_search post-processes.
+        """
+
+        rows, scores = self.search_rows(query_vector, top_k, doc_version)
+        return [
+            (self.record(int(row)), 1.0 - float(score))
+            for row, score in zip(rows, scores)
+        ]
+
+    def search_rows(
+        self,
+        query_vector: np.ndarray,
+        top_k: int,
+        doc_version: Optional[str] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (rows, cosine scores), best first, using the configured mode.
+        """
+
+        empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32))
+        if len(self) == 0 or top_k <= 0:
+            return empty
+
+        mask = None
+        if doc_version is not None:
+            code = self._version_codes.get(doc_version)
+            if code is None:
+                return empty
+            mask = self._codes == code
+
+        if self._quantized is not None:
+            return self._quantized.search(
+                query_vector, top_k, LOCAL_INDEX_RESCORE_FACTOR, mask
+            )
+
+        if self._ivf is not None:
+            return self._ivf.search(query_vector, top_k, IVF_NPROBE, doc_version)
+
+        scores = self._vectors @ np.asarray(query_vector, dtype=np.float32)
+        if mask is not None:
+            scores = np.where(mask, scores, -np.inf)
+
+        k = min(top_k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        top = top[np.isfinite(scores[top])]
+
+        return top, scores[top]
+
+    def section_rows(self, section_id: str) -> List[int]:
+        """
+        Chunk rows of one section, in document order.
+        """
+
+        keys = _ArenaKeys(self._sections)
+        i = bisect_left(keys, section_id)
+        if i == len(keys) or keys[i] != section_id:
+            return []
+        start, end = int(self._section_starts[i]), int(self._section_starts[i + 1])
+        return [int(r) for r in self._section_rows[start:end]]
+
+
+class _ArenaKeys:
+    """
+    Sequence view for bisect; decodes only the probed keys.
+    """
+
+    __slots__ = ("_arena",)
+
+    def __init__(self, arena: StringArena):
+        self._arena = arena
+
+    def __len__(self) -> int:
+        return len(self._arena)
+
+    def __getitem__(self, i: int) -> str:
+        return self._arena[i]
+
+
+# -------------------------------------------------
+# Process-wide Instance
+# -------------------------------------------------
+
+_index: Optional[LocalIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_local_index() -> LocalIndex:
+    """
+    The index, checked against the query embedding model on first use
+    (which loads that model, or asks the embedding service).
+    """
+    global _index
+
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                from src.embeddings.query_embedding import embedding_info
+
+                model, dim = embedding_info()
+                _index = LocalIndex(LOCAL_INDEX_DIR, embedding_model=model, dim=dim)
+
+    return _index
+
+
+def local_search(
+    query: str,
+    top_k: int,
+    doc_version: str,
+    include_vectors: bool = False,
+) -> List[Tuple[Dict, float, Optional[np.ndarray]]]:
+    """
+    (record, cosine distance, vector or None) triples, best first.
+    """
+    from src.embeddings.query_embedding import embed_query
+
+    index = get_local_index()
+    rows, scores = index.search_rows(embed_query(query), top_k, doc_version)
+    vectors = index.vectors(rows) if include_vectors else [None] * len(rows)
+
+    return [
+        (index.record(int(row)), 1.0 - float(score), vector)
+        for row, score, vector in zip(rows, scores, vectors)
+    ]
@@ -0,0 +1,138 @@
+# src/vectorstore/quantization.py
+
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+QUANTIZATION_MODES = ("int8", "binary")
+
+# Rows scanned per block: bounds the float32 / popcount temporaries
+# to a few MiB regardless of corpus size
+SCAN_BLOCK_ROWS = 8192
+
+# Popcount for numpy < 2.0 (no np.bitwise_count)
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+# -------------------------------------------------
+# Quantized Codes
+# -------------------------------------------------
+# Coarse first pass over compact codes, exact rescoring of a short
+# list against the float32 vectors (memory-mapped, so only the
+# shortlisted rows are paged in):
+#
+#   int8    per-vector symmetric scale, 4x smaller than float32;
+#           score ~ scale_i * (codes_i . q)
+#   binary  sign bits packed 8 per byte, 32x smaller; Hamming
+#           distance to the query's sign bits
+
+
+def quantize_int8(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.rint(vectors / scales[:, None]).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def quantize_binary(vectors: np.ndarray) -> np.ndarray:
+    return np.packbits(np.asarray(vectors) > 0, axis=1)
+
+
+def write_quantized(vectors: np.ndarray, output_dir: Path) -> None:
+    """
+    Write int8 and binary codes next to vectors.npy.
+    """
+
+    codes, scales = quantize_int8(vectors)
+    np.save(Path(output_dir) / "vectors.int8.npy", codes)
+    np.save(Path(output_dir) / "vectors.int8_scales.npy", scales)
+    np.save(Path(output_dir) / "vectors.binary.npy", quantize_binary(vectors))
+
+
+def _hamming(codes: np.ndarray, query_bits: np.ndarray) -> np.ndarray:
+    xor = np.bitwise_xor(codes, query_bits)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(xor).sum(axis=1, dtype=np.int32)
+    return _POPCOUNT[xor].sum(axis=1, dtype=np.int32)
+
+
+class QuantizedSearch:
+    """
+    Shortlist by quantized codes, rescore with full-precision vectors.
+    """
+
+    def __init__(self, index_dir: Path, mode: str, vectors: np.ndarray):
+        if mode not in QUANTIZATION_MODES:
+            raise ValueError(f"Unknown quantization mode: {mode}")
+
+        index_dir = Path(index_dir)
+        self.mode = mode
+        self._vectors = vectors
+
+        if mode == "int8":
+            self._codes = np.load(index_dir / "vectors.int8.npy", mmap_mode="r")
+            self._scales = np.load(index_dir / "vectors.int8_scales.npy", mmap_mode="r")
+        else:
+            self._codes = np.load(index_dir / "vectors.binary.npy", mmap_mode="r")
+
+    @property
+    def nbytes(self) -> int:
+        extra = self._scales.nbytes if self.mode == "int8" else 0
+        return self._codes.nbytes + extra
+
+    def coarse_scores(self, query: np.ndarray) -> np.ndarray:
+        """
+        Higher is better, for every row.
+        """
+
+        n = len(self._codes)
+        scores = np.empty(n, dtype=np.float32)
+
+        if self.mode == "int8":
+            q = np.asarray(query, dtype=np.float32)
+            for start in range(0, n, SCAN_BLOCK_ROWS):
+                block = self._codes[start:start + SCAN_BLOCK_ROWS]
+                scores[start:start + len(block)] = (
+                    (block.astype(np.float32) @ q) * self._scales[start:start + len(block)]
+                )
+        else:
+            q = quantize_binary(np.asarray(query, dtype=np.float32)[None, :])[0]
+            for start in range(0, n, SCAN_BLOCK_ROWS):
+                block = self._codes[start:start + SCAN_BLOCK_ROWS]
+                scores[start:start + len(block)] = -_hamming(block, q)
+
+        return scores
+
+    def search(
+        self,
+        query: np.ndarray,
+        top_k: int,
+        rescore_factor: int,
+        mask: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns (rows, exact cosine scores), best first. `mask`
+        (bool [N]) restricts the candidates, e.g. to one doc_version.
+        """
+
+        query = np.asarray(query, dtype=np.float32)
+        coarse = self.coarse_scores(query)
+        if mask is not None:
+            coarse = np.where(mask, coarse, -np.inf)
+
+        n_candidates = int(np.isfinite(coarse).sum()) if mask is not None else len(coarse)
+        shortlist_size = min(max(top_k * rescore_factor, top_k), n_candidates)
+        if shortlist_size <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        shortlist = np.argpartition(-coarse, shortlist_size - 1)[:shortlist_size]
+        shortlist.sort()  # sequential reads from the mmap
+
+        exact = np.asarray(self._vectors[shortlist], dtype=np.float32) @ query
+
+        k = min(top_k, len(shortlist))
+        best = np.argsort(-exact)[:k]
+        return shortlist[best], exact[best]
@@ -0,0 +1,305 @@
+# src/vectorstore/upgrade_edition.py
+
+import argparse
+import hashlib
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.processing.chunk_store import read_chunks
+from src.serialization import write_artifact
+from src.vectorstore.local_index import LOCAL_INDEX_DIR, RECORD_FIELDS, LocalIndex, build_local_index
+
+
+REPORT_PATH = Path("data/reports/edition_upgrade.json")
+
+
+# -------------------------------------------------
+# Edition Upgrade: reuse vectors of unchanged sections
+# -------------------------------------------------
+# Most TMEP sections are identical between editions. The new
+# edition's chunks (built with TMEP_DOC_VERSION set to the new label)
+# are diffed against the previous edition by section key and a hash
+# of the normalized text; unchanged chunks copy the previous vector,
+# only new or modified chunks are embedded.
+#
+#   python -m src.vectorstore.upgrade_edition \
+#       --chunks data/chunks/tmep_chunk_store \
+#       --previous-version "TMEP Nov 2025" --target weaviate
+
+
+def section_key(chunk_id: str, section_id: str) -> str:
+    """
+    Edition-independent identity: section_id + ordinal within the
+    section (chunk_ids also carry the HTML file name, which can change).
+    """
+    return f"{section_id}::{chunk_id.rsplit('::', 1)[-1]}"
+
+
+def content_hash(section_path: Optional[str], text: str) -> str:
+    return hashlib.sha256(f"{section_path or ''}\n{text}".encode("utf-8")).hexdigest()
+
+
+def diff_editions(previous: Dict[str, Dict], chunks: Sequence) -> Dict[str, List[str]]:
+    """
+    previous: section key -> {"hash", ...}. Returns section keys
+    grouped as unchanged / modified / added / removed.
+    """
+
+    diff: Dict[str, List[str]] = {"unchanged": [], "modified": [], "added": [], "removed": []}
+    seen = set()
+
+    for chunk in chunks:
+        key = section_key(chunk["chunk_id"], chunk["section_id"])
+        seen.add(key)
+
+        old = previous.get(key)
+        if old is None:
+            diff["added"].append(key)
+        elif old["hash"] == content_hash(chunk["section_path"], chunk["chunk_text"]):
+            diff["unchanged"].append(key)
+        else:
+            diff["modified"].append(key)
+
+    diff["removed"] = sorted(k for k in previous if k not in seen)
+    return diff
+
+
+# -------------------------------------------------
+# Previous Edition Vectors
+# -------------------------------------------------
+
+def previous_from_weaviate(doc_version: str) -> Dict[str, Dict]:
+    from .weaviate_client import get_client, CLASS_NAME
+    from .weaviate_loader import iter_edition
+
+    client = get_client()
+    previous: Dict[str, Dict] = {}
+
+    try:
+        collection = client.collections.get(CLASS_NAME)
+
+        # Only this edition's vectors leave the server
+        for obj in iter_edition(collection, doc_version, include_vector=True):
+            props = obj.properties
+
+            vector = obj.vector
+            if isinstance(vector, dict):
+                vector = vector.get("default") or next(iter(vector.values()), None)
+
+            previous[section_key(props["chunk_id"], props["section_id"])] = {
+                "hash": content_hash(props.get("section_path"), props.get("text") or ""),
+                "vector": vector,
+            }
+
+    finally:
+        client.close()
+
+    return previous
+
+
+def previous_from_local(index: LocalIndex, doc_version: str) -> Dict[str, Dict]:
+    rows = index.version_rows(doc_version)
+    vectors = index.vectors(rows)
+    previous: Dict[str, Dict] = {}
+
+    for row, vector in zip(rows, vectors):
+        record = index.record(row)
+        previous[section_key(record["chunk_id"], record["section_id"])] = {
+            "hash": content_hash(record.get("section_path"), record.get("text") or ""),
+            "vector": vector,
+        }
+
+    return previous
+
+
+# -------------------------------------------------
+# Write the New Edition
+# -------------------------------------------------
+
+def upgrade_weaviate(chunks: Sequence, previous: Dict[str, Dict], unchanged: set) -> int:
+    """
+    Unchanged chunks are inserted with the previous vector (the
+    vectorizer is skipped); the rest are vectorized by Weaviate.
+    Returns the number of objects Weaviate had to embed.
+    """
+
+    from .weaviate_client import get_client, create_schema, CLASS_NAME
+    from .weaviate_loader import delete_stale_objects, object_uuid
+
+    client = get_client()
+    embedded = 0
+
+    try:
+        create_schema(client)
+        collection = client.collections.get(CLASS_NAME)
+
+        with collection.batch.dynamic() as batch:
+            for chunk in chunks:
+                key = section_key(chunk["chunk_id"], chunk["section_id"])
+                vector = previous[key]["vector"] if key in unchanged else None
+                if vector is None:
+                    embedded += 1
+
+                batch.add_object(
+                    uuid=object_uuid(chunk["chunk_id"], chunk["doc_version"]),
+                    properties={
+                        "chunk_id": chunk["chunk_id"],
+                        "text": chunk["chunk_text"],
+                        "section_id": chunk["section_id"],
+                        "section_path": chunk["section_path"],
+                        "source_file": chunk.get("source_file"),
+                        "doc_version": chunk["doc_version"],
+                        "source": chunk["source"],
+                    },
+                    vector=vector,
+                )
+
+            if batch.number_errors > 0:
+                raise RuntimeError(
+                    f"Batch ingestion failed for "
+                    f"{batch.number_errors} objects."
+                )
+
+        # A re-run over an edition first loaded with the old UUIDs
+        new_version = chunks[0]["doc_version"]
+        delete_stale_objects(
+            collection, new_version,
+            {object_uuid(c["chunk_id"], new_version) for c in chunks},
+        )
+
+    finally:
+        client.close()
+
+    return embedded
+
+
+def upgrade_local(
+    chunks: Sequence,
+    previous: Dict[str, Dict],
+    unchanged: set,
+    index: LocalIndex,
+    index_dir: Path,
+    batch_size: int,
+) -> int:
+    """
+    Rebuild the local index with every other edition kept as-is and
+    the new edition appended. Returns the number of chunks embedded.
+    """
+
+    new_version = chunks[0]["doc_version"]
+    keep = [r for r in range(len(index)) if index.record(r)["doc_version"] != new_version]
+
+    records = [index.record(r) for r in keep]
+    vectors = [index.vectors(keep)] if keep else []
+
+    new_records = [
+        {
+            "chunk_id": c["chunk_id"],
+            "text": c["chunk_text"],
+            "section_id": c["section_id"],
+            "section_path": c["section_path"],
+            "source_file": c.get("source_file"),
+            "doc_version": c["doc_version"],
+            "source": c["source"],
+        }
+        for c in chunks
+    ]
+    keys = [section_key(r["chunk_id"], r["section_id"]) for r in new_records]
+    to_embed = [i for i, key in enumerate(keys) if key not in unchanged]
+
+    new_vectors = np.zeros((len(new_records), index.manifest["dim"]), dtype=np.float32)
+    for i, key in enumerate(keys):
+        if key in unchanged:
+            new_vectors[i] = previous[key]["vector"]
+
+    if to_embed:
+        from src.embeddings.query_embedding import embed_texts
+
+        new_vectors[to_embed] = embed_texts(
+            [new_records[i]["text"] for i in to_embed], batch_size=batch_size
+        )
+
+    build_local_index(
+        records + [{f: r.get(f) for f in RECORD_FIELDS} for r in new_records],
+        np.concatenate(vectors + [new_vectors]),
+        index_dir,
+        embedding_model=index.manifest.get("embedding_model"),
+    )
+    return len(to_embed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest a new TMEP edition, reusing vectors of unchanged sections.")
+    parser.add_argument("--chunks", type=Path, required=True, help="New edition chunk artifact or chunk store")
+    parser.add_argument("--previous-version", required=True)
+    parser.add_argument("--target", choices=("weaviate", "local"), default="weaviate")
+    parser.add_argument("--index-dir", type=Path, default=LOCAL_INDEX_DIR)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--report", type=Path, default=REPORT_PATH)
+    parser.add_argument("--dry-run", action="store_true", help="Only write the changed-sections report")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+
+    chunks = read_chunks(args.chunks)
+    if not chunks:
+        raise ValueError("No chunks in the new edition.")
+
+    new_version = chunks[0]["doc_version"]
+    if new_version == args.previous_version:
+        raise ValueError(
+            f"New chunks are labelled {new_version!r}; rebuild them with "
+            f"TMEP_DOC_VERSION set to the new edition."
+        )
+
+    index = None
+    if args.target == "local":
+        from src.embeddings.query_embedding import embedding_info
+
+        # Changed sections are embedded with the current model
+        model, dim = embedding_info()
+        index = LocalIndex(args.index_dir, embedding_model=model, dim=dim)
+        previous = previous_from_local(index, args.previous_version)
+    else:
+        previous = previous_from_weaviate(args.previous_version)
+
+    if not previous:
+        raise ValueError(f"No chunks found for previous edition {args.previous_version!r}")
+
+    diff = diff_editions(previous, chunks)
+    print(
+        f"🔍 {new_version} vs {args.previous_version}: "
+        f"{len(diff['unchanged'])} unchanged, {len(diff['modified'])} modified, "
+        f"{len(diff['added'])} added, {len(diff['removed'])} removed"
+    )
+
+    embedded = 0
+    if not args.dry_run:
+        unchanged = set(diff["unchanged"])
+        if args.target == "local":
+            embedded = upgrade_local(chunks, previous, unchanged, index, args.index_dir, args.batch_size)
+        else:
+            embedded = upgrade_weaviate(chunks, previous, unchanged)
+
+    write_artifact({
+        "previous_version": args.previous_version,
+        "new_version": new_version,
+        "target": args.target,
+        "dry_run": args.dry_run,
+        "counts": {k: len(v) for k, v in diff.items()},
+        "vectors_reused": 0 if args.dry_run else len(chunks) - embedded,
+        "chunks_embedded": embedded,
+        "elapsed_seconds": round(time.perf_counter() - start, 2),
+        "modified": diff["modified"],
+        "added": diff["added"],
+        "removed": diff["removed"],
+    }, args.report)
+
+    print(f"✅ Upgrade {'report' if args.dry_run else 'done'}: {embedded} chunks embedded, report at {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -81,45 +81,84 @@
 #     print(f"✅ Schema '{CLASS_NAME}' created")
 
 import os
-import weaviate
-from weaviate.auth import AuthApiKey
+from typing import TYPE_CHECKING, Optional
+
+# The weaviate SDK is imported on first connect: it is the single
+# largest contributor to api.py import time.
+if TYPE_CHECKING:
+    import weaviate
 
 
 WEAVIATE_URL = os.getenv("WEAVIATE_URL")
 WEAVIATE_API_KEY = os.getenv("WEAVIATE_API_KEY")
 
-if not WEAVIATE_URL or not WEAVIATE_API_KEY:
-    raise RuntimeError(
-        "WEAVIATE_URL and WEAVIATE_API_KEY must be set in environment variables."
-    )
-
 CLASS_NAME = "TmepChunk"
 
 
-def get_client() -> weaviate.WeaviateClient:
+def check_config() -> None:
+    """
+    Raise if the Weaviate connection settings are missing.
+    """
+    if not WEAVIATE_URL or not WEAVIATE_API_KEY:
+        raise RuntimeError(
+            "WEAVIATE_URL and WEAVIATE_API_KEY must be set in environment variables."
+        )
+
+
+def get_client() -> "weaviate.WeaviateClient":
     """
     Connect to Weaviate Cloud using Python client v4.
     """
+    check_config()
+
+    import weaviate
+    from weaviate.auth import AuthApiKey
+
     return weaviate.connect_to_weaviate_cloud(
         cluster_url=WEAVIATE_URL,
         auth_credentials=AuthApiKey(WEAVIATE_API_KEY),
     )
 
 
-def create_schema(client: weaviate.WeaviateClient) -> None:
+def collection_embedding_model(collection) -> Optional[str]:
+    """
+    The text2vec model configured on a collection, or None when it
+    was created without one (the server default, which can change).
+    """
+
+    config = collection.config.get()
+    vectorizer = config.vectorizer_config
+    if vectorizer is None and config.vector_config:
+        vectorizer = next(iter(config.vector_config.values())).vectorizer
+
+    return (getattr(vectorizer, "model", None) or {}).get("model")
+
+
+def create_schema(client: "weaviate.WeaviateClient") -> None:
     """
-    Create collection with Weaviate auto-embedding enabled.
-    (Uses Weaviate Cloud Arctic model)
+    Create collection with Weaviate auto-embedding enabled, pinned to
+    EMBEDDING_MODEL (Snowflake Arctic) so the local index's query
+    embeddings stay comparable with the stored vectors.
     """
+    import weaviate
+    from src.embeddings.query_embedding import EMBEDDING_MODEL
 
     if client.collections.exists(CLASS_NAME):
+        model = collection_embedding_model(client.collections.get(CLASS_NAME))
+        if model != EMBEDDING_MODEL:
+            print(
+                f"⚠️ Schema '{CLASS_NAME}' embeds with {model or 'the server default model'}, "
+                f"not {EMBEDDING_MODEL}; --from-weaviate local indexes will be refused"
+            )
         return
 
     client.collections.create(
         name=CLASS_NAME,
 
-        # 🔥 Enable Weaviate-managed embeddings
-        vectorizer_config=weaviate.classes.config.Configure.Vectorizer.text2vec_weaviate(),
+        # 🔥 Enable Weaviate-managed embeddings, with an explicit model
+        vectorizer_config=weaviate.classes.config.Configure.Vectorizer.text2vec_weaviate(
+            model=EMBEDDING_MODEL,
+        ),
 
         properties=[
             weaviate.classes.config.Property(
@@ -55,9 +55,12 @@
 
 # if __name__ == "__main__":
 #     main()
-import json
+import os
 import uuid
 from pathlib import Path
+from typing import Iterator, Set
+
+from src.processing.chunk_store import read_chunks
 
 from .weaviate_client import (
     get_client,
@@ -65,12 +68,77 @@ from .weaviate_client import (
     CLASS_NAME,
 )
 
-CHUNKS_PATH = Path("data/chunks/tmep_chunks.json")
+CHUNKS_PATH = Path(
+    os.getenv("TMEP_CHUNKS_PATH", "data/chunks/tmep_chunks.json")
+)
+
+
+def object_uuid(chunk_id: str, doc_version: str) -> str:
+    """
+    Deterministic object id per (edition, chunk): re-ingesting is
+    idempotent and editions sharing chunk_ids don't overwrite each other.
+    """
+    return str(uuid.uuid5(uuid.NAMESPACE_DNS, f"{doc_version}::{chunk_id}"))
+
+
+# Objects per page / per delete request (below QUERY_MAXIMUM_RESULTS)
+EDITION_PAGE_SIZE = 500
+
+
+def iter_edition(collection, doc_version: str, include_vector: bool = False) -> Iterator:
+    """
+    Every object of one edition. collection.iterator() cannot filter,
+    so this pages a doc_version-filtered query by chunk_id instead.
+    A chunk_id has at most two objects per edition (old and new UUID),
+    so pages restart at the last chunk_id and skip what was yielded.
+    """
+    from weaviate.classes.query import Filter, Sort
+
+    last = None
+    seen: Set[str] = set()
+    while True:
+        filters = Filter.by_property("doc_version").equal(doc_version)
+        if last is not None:
+            filters = filters & Filter.by_property("chunk_id").greater_or_equal(last)
+
+        page = collection.query.fetch_objects(
+            filters=filters,
+            sort=Sort.by_property("chunk_id"),
+            limit=EDITION_PAGE_SIZE,
+            include_vector=include_vector,
+        ).objects
+
+        fresh = [obj for obj in page if str(obj.uuid) not in seen]
+        yield from fresh
+        if len(page) < EDITION_PAGE_SIZE or not fresh:
+            return
+
+        last = page[-1].properties["chunk_id"]
+        seen = {str(obj.uuid) for obj in page if obj.properties["chunk_id"] == last}
+
+
+def delete_stale_objects(collection, doc_version: str, keep: Set[str]) -> int:
+    """
+    Delete the edition's objects whose id is not in `keep`: objects
+    stored under the old chunk_id-only UUIDs (which would otherwise
+    sit next to their re-ingested copies) and chunks no longer in the
+    edition. Returns the number deleted.
+    """
+    from weaviate.classes.query import Filter
+
+    stale = [str(obj.uuid) for obj in iter_edition(collection, doc_version) if str(obj.uuid) not in keep]
+
+    for start in range(0, len(stale), EDITION_PAGE_SIZE):
+        collection.data.delete_many(
+            where=Filter.by_id().contains_any(stale[start:start + EDITION_PAGE_SIZE])
+        )
+
+    return len(stale)
 
 
 def load_chunks(chunks_path: Path) -> None:
     if not chunks_path.exists():
-        raise FileNotFoundError(f"Chunks file not found: {chunks_path}")
+        raise FileNotFoundError(f"Chunks file or store not found: {chunks_path}")
 
     client = get_client()
 
@@ -78,9 +146,7 @@ def load_chunks(chunks_path: Path) -> None:
         create_schema(client)
         collection = client.collections.get(CLASS_NAME)
 
-        data = json.loads(
-            chunks_path.read_text(encoding="utf-8")
-        )
+        data = read_chunks(chunks_path)
 
         if not data:
             raise ValueError("Chunks file is empty.")
@@ -91,9 +157,7 @@ def load_chunks(chunks_path: Path) -> None:
             for item in data:
                 chunk_id = item["chunk_id"]
 
-                uuid_str = str(
-                    uuid.uuid5(uuid.NAMESPACE_DNS, chunk_id)
-                )
+                uuid_str = object_uuid(chunk_id, item["doc_version"])
 
                 batch.add_object(
                     uuid=uuid_str,
@@ -114,6 +178,16 @@ def load_chunks(chunks_path: Path) -> None:
                     f"{batch.number_errors} objects."
                 )
 
+        # After the insert, so the edition is never missing from search
+        for doc_version in sorted({item["doc_version"] for item in data}):
+            keep = {
+                object_uuid(item["chunk_id"], doc_version)
+                for item in data if item["doc_version"] == doc_version
+            }
+            deleted = delete_stale_objects(collection, doc_version, keep)
+            if deleted:
+                print(f"🧹 Deleted {deleted} stale objects of {doc_version}")
+
         print("✅ All chunks ingested successfully")
 
     finally:
@@ -126,7 +200,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
-
-if __name__ == "__main__":
-    main()
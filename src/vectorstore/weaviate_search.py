@@ -76,13 +76,22 @@
 #     finally:
 #         client.close()
 
-from weaviate.classes.query import Filter
-from typing import List, Dict
+import os
+from typing import Any, List, Dict, Tuple, Union
+
 from .weaviate_client import get_client, CLASS_NAME
+from src.observability.metrics import STAGE_LATENCY, RETRIEVAL_SIMILARITY
+from src.resilience.circuit_breaker import WEAVIATE_BREAKER
+from src.rag.mmr import MMR_ENABLED, MMR_FETCH_FACTOR, diversify
 
 
 MIN_SIMILARITY = 0.70
 
+# "weaviate" (default) queries the cluster; "local" searches the
+# memory-mapped index built by src.vectorstore.export_local_index,
+# shared read-only by every uvicorn worker.
+RETRIEVAL_BACKEND = os.getenv("RETRIEVAL_BACKEND", "weaviate").lower()
+
 
 def similarity_search(
     query: str,
@@ -94,60 +103,223 @@ def similarity_search(
     if not doc_version:
         raise ValueError("doc_version must be provided.")
 
-    client = get_client()
+    if RETRIEVAL_BACKEND == "local":
+        return _search_local(query, top_k, doc_version, debug=debug)
+
+    # Raises CircuitOpenError without touching Weaviate while it is down
+    with WEAVIATE_BREAKER.guard():
+
+        with STAGE_LATENCY.time(stage="weaviate_connect"):
+            client = get_client()
+
+        try:
+            collection = client.collections.get(CLASS_NAME)
+
+            return _search_collection(
+                collection,
+                query,
+                top_k=top_k,
+                doc_version=doc_version,
+                debug=debug,
+            )
+
+        finally:
+            client.close()
+
+
+def similarity_search_batch(
+    queries: List[str],
+    top_k: int = 5,
+    doc_version: str = None,
+) -> List[Union[List[Dict], Exception]]:
+    """
+    Run several retrievals over ONE Weaviate connection.
+
+    Returns one entry per query, in order: either the result list
+    or the exception raised for that query, so a single query
+    without relevant sections does not fail the whole batch.
+    """
+
+    if not doc_version:
+        raise ValueError("doc_version must be provided.")
+
+    if not queries:
+        return []
 
+    if RETRIEVAL_BACKEND == "local":
+        return _collect(lambda q: _search_local(q, top_k, doc_version), queries)
+
+    # The whole batch is one call for breaker accounting
+    with WEAVIATE_BREAKER.guard():
+
+        with STAGE_LATENCY.time(stage="weaviate_connect"):
+            client = get_client()
+
+        try:
+            collection = client.collections.get(CLASS_NAME)
+
+            return _collect(
+                lambda q: _search_collection(
+                    collection,
+                    q,
+                    top_k=top_k,
+                    doc_version=doc_version,
+                ),
+                queries,
+            )
+
+        finally:
+            client.close()
+
+
+def is_weaviate_ready() -> bool:
+    client = get_client()
     try:
-        collection = client.collections.get(CLASS_NAME)
+        return client.is_ready()
+    finally:
+        client.close()
+
+
+def preload() -> None:
+    """
+    Load the configured backend (SDK, or local index and embedding
+    model) ahead of the first search.
+    """
+
+    if RETRIEVAL_BACKEND == "local":
+        from src.vectorstore.local_index import get_local_index
+
+        # Also loads the embedding model (or reaches the service)
+        get_local_index()
+
+    else:
+        import weaviate.classes.query  # noqa: F401
+
+
+def _collect(search, queries: List[str]) -> List[Union[List[Dict], Exception]]:
+    outcomes: List[Union[List[Dict], Exception]] = []
 
-        filters = Filter.by_property("doc_version").equal(doc_version)
+    for query in queries:
+        try:
+            outcomes.append(search(query))
+        except ValueError as e:
+            outcomes.append(e)
 
-        # 🔥 Auto-embedding query search
+    return outcomes
+
+
+# -------------------------------------------------
+# Weaviate (v4 client)
+# -------------------------------------------------
+
+def _search_collection(
+    collection,
+    query: str,
+    top_k: int,
+    doc_version: str,
+    debug: bool = False,
+) -> List[Dict]:
+
+    from weaviate.classes.query import Filter
+
+    filters = Filter.by_property("doc_version").equal(doc_version)
+
+    # 🔥 Auto-embedding query search
+    with STAGE_LATENCY.time(stage="similarity_search"):
         response = collection.query.near_text(
             query=query,
-            limit=top_k,
+            limit=_fetch_k(top_k),
             filters=filters,
             return_metadata=["distance"],
+            include_vector=MMR_ENABLED,
         )
 
-        results: List[Dict] = []
-
-        for obj in response.objects:
-            distance = obj.metadata.distance
-            similarity = max(0.0, 1 - distance) if distance is not None else None
-
-            results.append({
-                "chunk_id": obj.properties["chunk_id"],
-                "text": obj.properties["text"],
-                "section_id": obj.properties["section_id"],
-                "section_path": obj.properties["section_path"],
-                "source_file": obj.properties.get("source_file"),
-                "doc_version": obj.properties["doc_version"],
-                "source": obj.properties["source"],
-                "distance": distance,
-                "similarity": similarity,
-            })
-
-        results.sort(key=lambda x: x["similarity"], reverse=True)
-
-        results = [
-            r for r in results
-            if r["similarity"] is not None and r["similarity"] >= MIN_SIMILARITY
-        ]
-
-        if not results:
-            raise ValueError("No sufficiently relevant TMEP sections found.")
-
-        if debug:
-            print("\n--- Retrieval Debug ---")
-            for r in results:
-                print(
-                    f"{r['section_id']} | "
-                    f"Similarity: {round(r['similarity'], 4)}"
-                )
-            print("-----------------------\n")
-
-        return results
+    hits = [
+        (obj.properties, obj.metadata.distance, _object_vector(obj.vector) if MMR_ENABLED else None)
+        for obj in response.objects
+    ]
 
-    finally:
-        client.close()
+    return _rank_hits(hits, top_k, debug=debug)
+
+
+def _object_vector(vector: Any) -> Any:
+    # Named-vector collections return {"default": [...]}
+    if isinstance(vector, dict):
+        return vector.get("default") or next(iter(vector.values()), None)
+    return vector
+
+
+# -------------------------------------------------
+# Local Backend (memory-mapped index)
+# -------------------------------------------------
+
+def _search_local(query: str, top_k: int, doc_version: str, debug: bool = False) -> List[Dict]:
+    from src.vectorstore.local_index import local_search
+
+    with STAGE_LATENCY.time(stage="similarity_search"):
+        hits = local_search(query, _fetch_k(top_k), doc_version, include_vectors=MMR_ENABLED)
+
+    return _rank_hits(hits, top_k, debug=debug)
+
+
+# -------------------------------------------------
+# Shared Post-processing
+# -------------------------------------------------
+
+def _fetch_k(top_k: int) -> int:
+    """
+    Candidates to request: MMR needs a pool to choose a diverse top_k from.
+    """
+    return top_k * MMR_FETCH_FACTOR if MMR_ENABLED else top_k
+
+
+def _rank_hits(hits: List[Tuple[Any, float, Any]], top_k: int, debug: bool = False) -> List[Dict]:
+
+    results: List[Dict] = []
+
+    for properties, distance, vector in hits:
+        similarity = max(0.0, 1 - distance) if distance is not None else None
+
+        results.append({
+            "chunk_id": properties["chunk_id"],
+            "text": properties["text"],
+            "section_id": properties["section_id"],
+            "section_path": properties["section_path"],
+            "source_file": properties.get("source_file"),
+            "doc_version": properties["doc_version"],
+            "source": properties["source"],
+            "distance": distance,
+            "similarity": similarity,
+            "_vector": vector,
+        })
+
+    for r in results:
+        if r["similarity"] is not None:
+            RETRIEVAL_SIMILARITY.observe(r["similarity"])
+
+    results.sort(key=lambda x: x["similarity"], reverse=True)
+
+    results = [
+        r for r in results
+        if r["similarity"] is not None and r["similarity"] >= MIN_SIMILARITY
+    ]
+
+    if not results:
+        raise ValueError("No sufficiently relevant TMEP sections found.")
+
+    if MMR_ENABLED:
+        results = diversify(results, top_k)
+
+    for r in results:
+        del r["_vector"]
+
+    if debug:
+        print("\n--- Retrieval Debug ---")
+        for r in results:
+            print(
+                f"{r['section_id']} | "
+                f"Similarity: {round(r['similarity'], 4)}"
+            )
+        print("-----------------------\n")
 
+    return results